@@ -1,8 +1,11 @@
 import os
 import numpy as np
 import librosa
-from tensorflow.keras.layers import Conv1D, MaxPooling1D, Flatten
+from tensorflow.keras.layers import Conv1D, MaxPooling1D, Flatten, GlobalAveragePooling1D, Dense, Input
 import tensorflow as tf
+from src.PoCs.MultiModalTraining.data_loader import load_audio_dataframe
+from src.utils.resampling import resample
+from src.utils.waveform_store import WaveformStore, window_dataset
 
 
 def run_audio_cnn_poc():
@@ -14,11 +17,12 @@ def run_audio_cnn_poc():
     base_dir = os.path.dirname(__file__)
     audio_path = os.path.join(base_dir, '..', 'data', 'example.wav')
 
-    # Load and normalize audio with librosa (resamples to 16kHz)
+    # Load and normalize audio with librosa; only resampled if not stored at 16kHz already
     try:
-        audio, sr = librosa.load(audio_path, sr=16000)  # sr=16000 forces resampling
+        audio, sr = librosa.load(audio_path, sr=None)
     except Exception as e:
         raise RuntimeError(f"Failed to load audio: {e}")
+    audio = resample(audio, sr, 16000)
     print("Processing:", audio_path)
 
     audio = audio.astype(np.float32)  # librosa already normalizes to [-1,1]
@@ -47,6 +51,37 @@ def run_audio_cnn_poc():
     print("First 10 values:", flat_out[0, :10].numpy())
 
 
+def build_audio_cnn(window, num_classes):
+    """Same convolutional stack as the PoC above, closed with a classifier."""
+    return tf.keras.Sequential([
+        Input(shape=(window, 1)),
+        Conv1D(64, 3, activation='relu'),
+        MaxPooling1D(2),
+        Conv1D(128, 3, activation='relu'),
+        MaxPooling1D(2),
+        GlobalAveragePooling1D(),
+        Dense(num_classes, activation='softmax'),
+    ])
+
+
+def run_store_training_poc(store_dir, window=16000, batch_size=32, steps_per_epoch=100, epochs=1):
+    """
+    Trains the 1D CNN on random windows drawn from a packed waveform store
+    (see src.utils.waveform_store.pack_waveforms), with no per-step decode or resample.
+    """
+    store = WaveformStore(store_dir)
+    # Unlabeled clips are dropped and corpus-specific emotion names merged, as for the multimodal model
+    df = load_audio_dataframe(store)
+    classes = sorted(df["emotion"].unique())
+    labels = df["emotion"].map({c: i for i, c in enumerate(classes)}).to_numpy()
+    print(f"Store: {len(df)}/{len(store)} labeled clips at {store.sample_rate} Hz, classes: {classes}")
+
+    model = build_audio_cnn(window, len(classes))
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    dataset = window_dataset(store, df["clip_id"].to_numpy(), labels, window=window, batch_size=batch_size)
+    return model.fit(dataset, steps_per_epoch=steps_per_epoch, epochs=epochs)
+
+
 if __name__ == "__main__":
     run_audio_cnn_poc()
 
@@ -0,0 +1,371 @@
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import tensorflow as tf  # type: ignore
+from PIL import Image  # type: ignore
+from src.PoCs.MultiModalTraining.data_loader import get_data_loaders
+from src.PoCs.MultiModalTraining.model import build_multimodal_model
+from src.PoCs.MultiModalTraining.model_zoo import MODEL_ZOO, build_model, profile_model
+from src.PoCs.MultiModalTraining.train import configure_precision, compile_model
+from src.utils.utils import load_config
+
+# Step compilation / precision combinations compared by benchmark_precision_settings.
+# The first entry is the float32 eager-dispatch baseline the others are measured against.
+PRECISION_SETTINGS = [
+    {"JIT_COMPILE": False, "MIXED_PRECISION": False},
+    {"JIT_COMPILE": True, "MIXED_PRECISION": False},
+    {"JIT_COMPILE": False, "MIXED_PRECISION": True},
+    {"JIT_COMPILE": True, "MIXED_PRECISION": True},
+]
+
+# Steps discarded from the step-time statistics (tracing and XLA compilation happen here)
+WARMUP_STEPS = 3
+
+SYNTHETIC_LANGUAGES = ["eng", "fra", "por"]
+SYNTHETIC_EMOTIONS = ["Anger", "Disgust", "Fear", "Joy", "Neutral", "Sadness", "Surprise"]
+# save_spec_as_image renders 4x4 inch figures at 100 dpi
+SYNTHETIC_IMAGE_SIZE = 400
+
+
+class StepTimer(tf.keras.callbacks.Callback):
+    """Records the wall-clock duration of every training step."""
+
+    def __init__(self):
+        super().__init__()
+        self.step_times = []
+        self._start = None
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step_times.append(time.perf_counter() - self._start)
+
+
+def describe_setting(setting):
+    """Returns a short label such as 'xla+bf16' for a precision setting."""
+    jit = "xla" if setting.get("JIT_COMPILE") else "eager"
+    precision = "bf16" if setting.get("MIXED_PRECISION") else "fp32"
+    return f"{jit}+{precision}"
+
+
+def run_precision_setting(config, setting, datasets, label_encoder, zcr_scaler, rms_scaler, epochs):
+    """
+    Trains a fresh model with one precision setting and measures its step time and test accuracy.
+    Returns a dict with the setting, median/mean step time in seconds and final test accuracy.
+    """
+    train_ds, val_ds, test_ds = datasets
+    run_config = {**config, **setting}
+
+    tf.keras.backend.clear_session()
+    configure_precision(run_config)
+
+    model = build_multimodal_model(
+        img_shape=(config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"]),
+        numerical_shape=(config["FIXED_1D_LENGTH"] * 2,),
+        num_classes=len(label_encoder.classes_),
+        zcr_scaler=zcr_scaler,
+        rms_scaler=rms_scaler
+    )
+    compile_model(model, run_config)
+
+    timer = StepTimer()
+    model.fit(train_ds, validation_data=val_ds, epochs=epochs, callbacks=[timer], verbose=0)
+    _, test_accuracy = model.evaluate(test_ds, verbose=0)
+
+    # Drop the warm-up steps so tracing and XLA compilation don't skew the numbers
+    step_times = np.array(timer.step_times[WARMUP_STEPS:] or timer.step_times)
+
+    # Leave the global policy as we found it for the next run
+    tf.keras.mixed_precision.set_global_policy("float32")
+
+    return {
+        "setting": describe_setting(setting),
+        "JIT_COMPILE": bool(setting.get("JIT_COMPILE")),
+        "MIXED_PRECISION": bool(setting.get("MIXED_PRECISION")),
+        "median_step_s": float(np.median(step_times)),
+        "mean_step_s": float(np.mean(step_times)),
+        "test_accuracy": float(test_accuracy),
+    }
+
+
+def select_fastest_setting(results, tolerance):
+    """
+    Picks the fastest result whose accuracy is within `tolerance` of the first (baseline) result.
+    """
+    baseline_accuracy = results[0]["test_accuracy"]
+    eligible = [r for r in results if r["test_accuracy"] >= baseline_accuracy - tolerance]
+    return min(eligible, key=lambda r: r["median_step_s"])
+
+
+def benchmark_precision_settings(config, settings=PRECISION_SETTINGS):
+    """
+    Trains the multimodal model once per setting on the same data splits and prints
+    step time and final accuracy for each, followed by the recommended configuration.
+
+    BENCHMARK_EPOCHS (default 3) controls how long each run trains, and
+    BENCHMARK_ACCURACY_TOLERANCE (default 0.01) how much accuracy a faster
+    setting may lose against the float32 baseline and still be recommended.
+    """
+    epochs = config.get("BENCHMARK_EPOCHS", 3)
+    tolerance = config.get("BENCHMARK_ACCURACY_TOLERANCE", 0.01)
+
+    train_ds, val_ds, test_ds, label_encoder, zcr_scaler, rms_scaler = get_data_loaders(
+        features_dir=config["FEATURES_DIR"],
+        batch_size=config["BATCH_SIZE"]
+    )
+
+    results = []
+    for setting in settings:
+        print(f"Benchmarking {describe_setting(setting)} for {epochs} epochs...")
+        result = run_precision_setting(
+            config, setting, (train_ds, val_ds, test_ds), label_encoder, zcr_scaler, rms_scaler, epochs
+        )
+        results.append(result)
+
+    baseline_step = results[0]["median_step_s"]
+    print("\n--- Precision Benchmark ---")
+    print(f"{'setting':<12}{'median step (ms)':>18}{'speedup':>10}{'test acc':>10}")
+    for r in results:
+        speedup = baseline_step / r["median_step_s"]
+        print(f"{r['setting']:<12}{r['median_step_s'] * 1000:>18.1f}{speedup:>9.2f}x{r['test_accuracy']:>10.4f}")
+
+    best = select_fastest_setting(results, tolerance)
+    print(
+        f"\nFastest setting within {tolerance:.3f} accuracy of baseline: {best['setting']} "
+        f"(JIT_COMPILE={best['JIT_COMPILE']}, MIXED_PRECISION={best['MIXED_PRECISION']})"
+    )
+    print("---------------------------\n")
+    return results
+
+
+def generate_synthetic_features(output_dir, num_samples, seed=42):
+    """
+    Writes a small feature tree in the layout parse_filepaths expects
+    ({lang}_{gender}_{emotion}_{index}/ with dd_mfcc.jpeg, chromagram.jpeg, zcr.npy, rms.npy),
+    using random images of the real rendered size and random-length 1D features.
+    """
+    rng = np.random.default_rng(seed)
+    for i in range(num_samples):
+        language = SYNTHETIC_LANGUAGES[i % len(SYNTHETIC_LANGUAGES)]
+        gender = "F" if i % 2 == 0 else "M"
+        emotion = SYNTHETIC_EMOTIONS[i % len(SYNTHETIC_EMOTIONS)]
+        sample_dir = os.path.join(output_dir, f"{language}_{gender}_{emotion}_{i}")
+        os.makedirs(sample_dir, exist_ok=True)
+
+        for name in ("dd_mfcc.jpeg", "chromagram.jpeg"):
+            pixels = rng.integers(0, 256, (SYNTHETIC_IMAGE_SIZE, SYNTHETIC_IMAGE_SIZE, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(os.path.join(sample_dir, name), "jpeg", quality=90)
+
+        frames = int(rng.integers(100, 1000))
+        np.save(os.path.join(sample_dir, "zcr.npy"), rng.random(frames).astype(np.float32))
+        np.save(os.path.join(sample_dir, "rms.npy"), rng.random(frames).astype(np.float32))
+    print(f"Generated {num_samples} synthetic samples in {output_dir}")
+
+
+def measure_input_pipeline(dataset, num_batches):
+    """
+    Iterates the dataset alone (no model) and returns its throughput in batches per second.
+    """
+    iterator = iter(dataset.repeat())
+    next(iterator)  # Warm-up: fills the shuffle and prefetch buffers
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        next(iterator)
+    return num_batches / (time.perf_counter() - start)
+
+
+def measure_train_step(model, dataset, num_steps):
+    """
+    Times the train step alone on one batch kept in memory, so no input pipeline is involved.
+    Returns the compute-only throughput in steps per second.
+    """
+    inputs, labels = next(iter(dataset))
+    synthetic = tf.data.Dataset.from_tensors((inputs, labels)).repeat()
+    model.fit(synthetic, steps_per_epoch=WARMUP_STEPS, epochs=1, verbose=0)
+
+    start = time.perf_counter()
+    model.fit(synthetic, steps_per_epoch=num_steps, epochs=1, verbose=0)
+    return num_steps / (time.perf_counter() - start)
+
+
+def measure_full_loop(model, dataset, num_steps, logdir=None):
+    """
+    Times model.fit on the real input pipeline and returns steps per second.
+    When logdir is set, the timed steps are captured in a TensorBoard profiler trace,
+    which includes the tf.data stages (open the Profile tab, "trace_viewer" / "input_pipeline_analyzer").
+    """
+    repeated = dataset.repeat()
+    model.fit(repeated, steps_per_epoch=WARMUP_STEPS, epochs=1, verbose=0)
+
+    if logdir:
+        tf.profiler.experimental.start(logdir)
+    start = time.perf_counter()
+    model.fit(repeated, steps_per_epoch=num_steps, epochs=1, verbose=0)
+    elapsed = time.perf_counter() - start
+    if logdir:
+        tf.profiler.experimental.stop()
+    return num_steps / elapsed
+
+
+def diagnose_bottleneck(input_rate, compute_rate, full_rate):
+    """
+    Compares the isolated input and compute rates and names the side that limits throughput.
+    """
+    bound = "input-bound" if input_rate < compute_rate else "compute-bound"
+    limit = min(input_rate, compute_rate)
+    return {
+        "bound": bound,
+        "input_batches_per_s": input_rate,
+        "train_steps_per_s": compute_rate,
+        "full_loop_steps_per_s": full_rate,
+        # How close the real loop gets to the slower of the two sides in isolation
+        "overlap_efficiency": full_rate / limit if limit > 0 else 0.0,
+    }
+
+
+def benchmark_training_throughput(config, num_steps=None):
+    """
+    Measures the input pipeline alone, the train step alone and the full training loop,
+    then reports whether train.main is input-bound or compute-bound.
+
+    BENCHMARK_STEPS (default 20) sets how many batches/steps each measurement runs and
+    BENCHMARK_LOGDIR (default "logs/benchmark") where the profiler trace is written.
+    """
+    num_steps = num_steps or config.get("BENCHMARK_STEPS", 20)
+    logdir = config.get("BENCHMARK_LOGDIR", os.path.join("logs", "benchmark"))
+
+    train_ds, _, _, label_encoder, zcr_scaler, rms_scaler = get_data_loaders(
+        features_dir=config["FEATURES_DIR"],
+        batch_size=config["BATCH_SIZE"]
+    )
+
+    print(f"Measuring input pipeline alone ({num_steps} batches)...")
+    input_rate = measure_input_pipeline(train_ds, num_steps)
+
+    configure_precision(config)
+    model = build_multimodal_model(
+        img_shape=(config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"]),
+        numerical_shape=(config["FIXED_1D_LENGTH"] * 2,),
+        num_classes=len(label_encoder.classes_),
+        zcr_scaler=zcr_scaler,
+        rms_scaler=rms_scaler
+    )
+    compile_model(model, config)
+
+    print(f"Measuring train step alone on in-memory tensors ({num_steps} steps)...")
+    compute_rate = measure_train_step(model, train_ds, num_steps)
+
+    print(f"Measuring full training loop ({num_steps} steps, profiler trace in {logdir})...")
+    full_rate = measure_full_loop(model, train_ds, num_steps, logdir=logdir)
+
+    report = diagnose_bottleneck(input_rate, compute_rate, full_rate)
+    print("\n--- Training Throughput Report ---")
+    print(f"Input pipeline alone : {report['input_batches_per_s']:8.2f} batches/s")
+    print(f"Train step alone     : {report['train_steps_per_s']:8.2f} steps/s")
+    print(f"Full training loop   : {report['full_loop_steps_per_s']:8.2f} steps/s")
+    print(f"Overlap efficiency   : {report['overlap_efficiency']:8.2%}")
+    print(f"Verdict: {report['bound']}")
+    print(f"Profiler trace: tensorboard --logdir {logdir}")
+    print("----------------------------------\n")
+    return report
+
+
+def benchmark_model_zoo(config, cost_only=False):
+    """
+    Builds every architecture in ZOO_MODELS (default: the whole registry) and reports its
+    parameters, FLOPs per sample, CPU latency per batch size (BENCHMARK_BATCH_SIZES,
+    default [1, 8, 32]) and train step time. Unless cost_only, each model is also trained
+    for BENCHMARK_EPOCHS on the same splits and its test accuracy reported next to its cost.
+    """
+    names = config.get("ZOO_MODELS") or sorted(MODEL_ZOO)
+    batch_sizes = config.get("BENCHMARK_BATCH_SIZES", [1, 8, 32])
+    epochs = config.get("BENCHMARK_EPOCHS", 3)
+
+    train_ds, val_ds, test_ds, label_encoder, zcr_scaler, rms_scaler = get_data_loaders(
+        features_dir=config["FEATURES_DIR"],
+        batch_size=config["BATCH_SIZE"]
+    )
+    num_classes = len(label_encoder.classes_)
+    configure_precision(config)
+
+    results = []
+    for name in names:
+        print(f"Profiling {name}...")
+        tf.keras.backend.clear_session()
+        model = build_model(
+            name,
+            img_shape=(config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"]),
+            numerical_shape=(config["FIXED_1D_LENGTH"] * 2,),
+            num_classes=num_classes,
+            zcr_scaler=zcr_scaler,
+            rms_scaler=rms_scaler
+        )
+        compile_model(model, config)
+        result = {"model": name, **profile_model(model, num_classes, batch_sizes, config["BATCH_SIZE"])}
+
+        if not cost_only:
+            print(f"Training {name} for {epochs} epochs...")
+            # Profiling ran train steps on random data, so start from fresh weights
+            tf.keras.backend.clear_session()
+            model = build_model(
+                name,
+                img_shape=(config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"]),
+                numerical_shape=(config["FIXED_1D_LENGTH"] * 2,),
+                num_classes=num_classes,
+                zcr_scaler=zcr_scaler,
+                rms_scaler=rms_scaler
+            )
+            compile_model(model, config)
+            model.fit(train_ds, validation_data=val_ds, epochs=epochs, verbose=0)
+            result["test_accuracy"] = float(model.evaluate(test_ds, verbose=0)[1])
+        results.append(result)
+
+    latency_headers = "".join(f"{f'lat@{b} (ms)':>14}" for b in batch_sizes)
+    print("\n--- Model Zoo Benchmark ---")
+    print(f"{'model':<10}{'params':>12}{'trainable':>12}{'MFLOPs':>10}{latency_headers}{'step (ms)':>11}{'test acc':>10}")
+    for r in results:
+        latencies = "".join(f"{r['latency_s'][b] * 1000:>14.1f}" for b in batch_sizes)
+        accuracy = f"{r['test_accuracy']:>10.4f}" if "test_accuracy" in r else f"{'-':>10}"
+        print(
+            f"{r['model']:<10}{r['params']:>12,}{r['trainable_params']:>12,}{r['flops'] / 1e6:>10.1f}"
+            f"{latencies}{r['train_step_s'] * 1000:>11.1f}{accuracy}"
+        )
+    print("---------------------------\n")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Training benchmarks for the multimodal model and the model zoo.")
+    parser.add_argument("mode", choices=["precision", "throughput", "zoo"], help="Benchmark to run.")
+    parser.add_argument(
+        "--synthetic", type=int, default=0, metavar="N",
+        help="Generate N synthetic feature samples in a temporary directory and benchmark on them."
+    )
+    parser.add_argument(
+        "--cost-only", action="store_true", help="zoo: only profile the models, skip training for accuracy."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config()
+
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        if args.synthetic:
+            generate_synthetic_features(synthetic_dir, args.synthetic)
+            config = {**config, "FEATURES_DIR": synthetic_dir}
+
+        if args.mode == "precision":
+            benchmark_precision_settings(config)
+        elif args.mode == "zoo":
+            benchmark_model_zoo(config, cost_only=args.cost_only)
+        else:
+            benchmark_training_throughput(config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+import csv
+import time
+import numpy as np
+import tensorflow as tf  # type: ignore
+from tensorflow.keras.callbacks import EarlyStopping  # type: ignore
+from sklearn.preprocessing import LabelEncoder  # type: ignore
+from src.PoCs.MultiModalTraining.checkpoint import load_lean_checkpoint, load_trained_model, save_lean_model
+from src.PoCs.MultiModalTraining.data_loader import (
+    fit_numerical_scalers,
+    labeled_path_slices,
+    load_and_preprocess,
+    load_labeled_dataframe,
+    load_numerical_matrix,
+    split_dataframe,
+)
+from src.PoCs.MultiModalTraining.export_tflite import measure_latency
+from src.PoCs.MultiModalTraining.model import build_numerical_model
+from src.utils.utils import load_config
+
+# Confidence thresholds swept for the accuracy/latency curve. 0 never escalates
+# (numerical model only) and anything above 1 always does (full model only).
+DEFAULT_THRESHOLDS = (0.0, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99, 1.01)
+
+
+class CascadeClassifier:
+    """
+    Two-stage classifier: the numerical model scores every sample and only samples whose
+    top probability is below `threshold` are sent to the full multimodal model.
+
+    predict takes the usual input dict (mfcc_input, chroma_input, numerical_input); the
+    images of samples that are not escalated are never read by a model.
+    """
+
+    def __init__(self, numerical_model, full_model, threshold=0.9):
+        self.numerical_model = numerical_model
+        self.full_model = full_model
+        self.threshold = threshold
+        self.samples = 0
+        self.escalated = 0
+
+    def predict(self, inputs):
+        probabilities = self.numerical_model(inputs["numerical_input"], training=False).numpy()
+        escalate = probabilities.max(axis=1) < self.threshold
+        if escalate.any():
+            subset = {name: np.asarray(tensor)[escalate] for name, tensor in inputs.items()}
+            probabilities[escalate] = self.full_model(subset, training=False).numpy()
+        self.samples += len(probabilities)
+        self.escalated += int(escalate.sum())
+        return probabilities
+
+
+def cascade_curve(numerical_probs, full_probs, labels, numerical_ms, full_ms, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Accuracy and expected per-sample latency of the cascade at each threshold, from the
+    predictions of both stages on the same samples and their single-sample latencies.
+
+    Returns:
+        A list of dicts with threshold, escalated (fraction), accuracy and latency_ms.
+    """
+    escalate_scores = numerical_probs.max(axis=1)
+    numerical_correct = numerical_probs.argmax(axis=1) == labels
+    full_correct = full_probs.argmax(axis=1) == labels
+    curve = []
+    for threshold in thresholds:
+        escalate = escalate_scores < threshold
+        curve.append({
+            "threshold": float(threshold),
+            "escalated": float(escalate.mean()),
+            "accuracy": float(np.where(escalate, full_correct, numerical_correct).mean()),
+            "latency_ms": float(numerical_ms + escalate.mean() * full_ms),
+        })
+    return curve
+
+
+def train_numerical_model(config, train_df, val_df, label_encoder):
+    """
+    Trains the numerical classifier on the padded ZCR/RMS matrices of the training rows
+    (no image is read) and saves it as a lean checkpoint in CASCADE_DIR.
+    """
+    length = config["FIXED_1D_LENGTH"]
+    num_classes = len(label_encoder.classes_)
+    zcr_scaler, rms_scaler = fit_numerical_scalers(train_df, length)
+
+    def _arrays(df):
+        numerical = np.hstack([load_numerical_matrix(df["zcr_path"], length), load_numerical_matrix(df["rms_path"], length)])
+        labels = tf.keras.utils.to_categorical(label_encoder.transform(df["emotion"]), num_classes=num_classes)
+        return numerical, labels
+
+    model = build_numerical_model((length * 2,), num_classes, zcr_scaler, rms_scaler)
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=config["LEARNING_RATE"]),
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    model.fit(
+        *_arrays(train_df),
+        validation_data=_arrays(val_df),
+        batch_size=config["BATCH_SIZE"],
+        epochs=config.get("CASCADE_EPOCHS", 50),
+        callbacks=[EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)],
+        verbose=2
+    )
+    save_lean_model(
+        model, config.get("CASCADE_DIR", "cascade_numerical"),
+        {"builder": "numerical", "numerical_shape": [length * 2]},
+        {"zcr": zcr_scaler, "rms": rms_scaler}, label_encoder
+    )
+    return model
+
+
+def evaluate_cascade(config):
+    """
+    Trains the numerical first stage, loads the full model (MODEL_PATH), and reports the
+    cascade's accuracy versus average single-sample CPU latency on the test split for
+    CASCADE_THRESHOLDS. The curve is also written to CASCADE_REPORT (cascade_curve.csv),
+    and CASCADE_THRESHOLD is checked by running the actual cascade sample by sample.
+    """
+    df = load_labeled_dataframe(config["FEATURES_DIR"])
+    label_encoder = LabelEncoder()
+    df["emotion_encoded"] = label_encoder.fit_transform(df["emotion"])
+    train_df, val_df, test_df = split_dataframe(df)
+
+    if config.get("CASCADE_RETRAIN", True):
+        numerical_model = train_numerical_model(config, train_df, val_df, label_encoder)
+    else:
+        numerical_model, _ = load_lean_checkpoint(config.get("CASCADE_DIR", "cascade_numerical"))
+    full_model, _ = load_trained_model(config.get("MODEL_PATH", "best_model.keras"))
+
+    # Unshuffled test pipeline, so both stages see the samples in the same order
+    test_ds = labeled_path_slices(test_df, label_encoder).map(load_and_preprocess).batch(config["BATCH_SIZE"])
+    numerical_probs, full_probs, labels = [], [], []
+    for inputs, batch_labels in test_ds:
+        numerical_probs.append(numerical_model(inputs["numerical_input"], training=False).numpy())
+        full_probs.append(full_model(inputs, training=False).numpy())
+        labels.append(batch_labels.numpy().argmax(axis=1))
+    numerical_probs, full_probs, labels = map(np.concatenate, (numerical_probs, full_probs, labels))
+
+    sample, _ = next(iter(test_ds.unbatch().batch(1)))
+    sample = {name: tensor.numpy() for name, tensor in sample.items()}
+    numerical_ms = measure_latency(lambda x: numerical_model(x["numerical_input"], training=False), sample)["median_ms"]
+    full_ms = measure_latency(lambda x: full_model(x, training=False), sample)["median_ms"]
+
+    curve = cascade_curve(
+        numerical_probs, full_probs, labels, numerical_ms, full_ms, config.get("CASCADE_THRESHOLDS", DEFAULT_THRESHOLDS)
+    )
+    with open(config.get("CASCADE_REPORT", "cascade_curve.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(curve[0]))
+        writer.writeheader()
+        writer.writerows(curve)
+
+    # Run the real cascade one sample at a time at the configured threshold
+    cascade = CascadeClassifier(numerical_model, full_model, config.get("CASCADE_THRESHOLD", 0.9))
+    timings = []
+    for inputs, _ in test_ds.unbatch().batch(1).take(config.get("CASCADE_MEASURE_SAMPLES", 200)):
+        inputs = {name: tensor.numpy() for name, tensor in inputs.items()}
+        start = time.perf_counter()
+        cascade.predict(inputs)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"\n--- Cascade Inference ({len(labels)} test samples, batch size 1, CPU) ---")
+    print(f"Numerical model: {numerical_ms:.2f} ms | full model: {full_ms:.2f} ms")
+    print(f"{'threshold':>10}{'escalated':>11}{'accuracy':>10}{'avg latency (ms)':>18}")
+    for point in curve:
+        print(
+            f"{point['threshold']:>10.2f}{point['escalated']:>11.1%}{point['accuracy']:>10.4f}{point['latency_ms']:>18.2f}"
+        )
+    print(
+        f"Measured at threshold {cascade.threshold}: {np.mean(timings):.2f} ms per sample, "
+        f"{cascade.escalated}/{cascade.samples} escalated"
+    )
+    print("-----------------------------------------------------------\n")
+    return curve
+
+
+if __name__ == '__main__':
+    evaluate_cascade(load_config())
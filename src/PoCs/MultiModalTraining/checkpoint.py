@@ -0,0 +1,205 @@
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import tensorflow as tf  # type: ignore
+from sklearn.preprocessing import LabelEncoder, StandardScaler  # type: ignore
+
+STATE_FILE = "state.json"
+WEIGHTS_FILE = "weights.npz"
+TMP_SUFFIX = ".tmp"
+
+
+def _frozen_variable_ids(model):
+    """Ids of the variables owned by frozen layers (the pretrained backbones)."""
+    return {
+        id(variable)
+        for layer in model._flatten_layers(include_self=False)
+        if not layer.trainable
+        for variable in layer.weights
+    }
+
+
+def checkpoint_variables(model):
+    """
+    The variables a lean checkpoint stores: every variable outside frozen layers, in model order.
+    This includes non-trainable state that still changes during training, such as the
+    moving statistics of BatchNormalization layers in trainable branches.
+    """
+    frozen = _frozen_variable_ids(model)
+    return [variable for variable in model.variables if id(variable) not in frozen]
+
+
+def scaler_state(scaler):
+    return {"mean": scaler.mean_.tolist(), "scale": scaler.scale_.tolist(), "var": scaler.var_.tolist()}
+
+
+def scaler_from_state(state):
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(state["mean"])
+    scaler.scale_ = np.asarray(state["scale"])
+    scaler.var_ = np.asarray(state["var"])
+    scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+
+def _atomic_write(path, data):
+    tmp_path = path + TMP_SUFFIX
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_checkpoint(directory, arrays, state):
+    buffer = io.BytesIO()
+    np.savez(buffer, *arrays)
+    # Weights first: a state.json always describes a complete weights file
+    _atomic_write(os.path.join(directory, WEIGHTS_FILE), buffer.getvalue())
+    _atomic_write(os.path.join(directory, STATE_FILE), json.dumps(state, indent=2).encode("utf-8"))
+
+
+def save_lean_model(model, directory, build, scalers, label_encoder):
+    """Writes `model` in the LeanCheckpoint format right away (no callback or background thread)."""
+    os.makedirs(directory, exist_ok=True)
+    variables = checkpoint_variables(model)
+    write_checkpoint(directory, [np.array(v) for v in variables], {
+        "build": build,
+        "scalers": {name: scaler_state(scaler) for name, scaler in scalers.items()},
+        "classes": label_encoder.classes_.tolist(),
+        "variables": [{"path": v.path, "shape": list(v.shape)} for v in variables],
+    })
+
+
+class LeanCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Saves the best model as its non-frozen variables plus the state needed to rebuild it.
+
+    The frozen backbones are not written: load_lean_checkpoint rebuilds the architecture
+    (which loads the pretrained backbone weights) and assigns the saved variables on top.
+    On improvement, the variables are copied to host memory on the training thread and
+    serialized and written by a background thread, so the next epoch starts right away.
+
+    Args:
+        directory (str): Checkpoint folder (state.json and weights.npz).
+        build (dict): Arguments for rebuilding the model, see load_lean_checkpoint.
+        scalers (dict): Name -> fitted StandardScaler baked into the model.
+        label_encoder (LabelEncoder): Fitted encoder of the output classes.
+        monitor (str): Metric deciding the best epoch; lower is better.
+    """
+
+    def __init__(self, directory, build, scalers, label_encoder, monitor="val_loss"):
+        super().__init__()
+        self.directory = directory
+        self.monitor = monitor
+        self.state = {
+            "build": build,
+            "scalers": {name: scaler_state(scaler) for name, scaler in scalers.items()},
+            "classes": label_encoder.classes_.tolist(),
+        }
+        self.best = np.inf
+        self.stalls = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+
+    def on_train_begin(self, logs=None):
+        os.makedirs(self.directory, exist_ok=True)
+        self._variables = checkpoint_variables(self.model)
+
+    def on_epoch_end(self, epoch, logs=None):
+        current = (logs or {}).get(self.monitor)
+        if current is None or current >= self.best:
+            return
+        self.best = current
+
+        start = time.perf_counter()
+        # Only the device-to-host copy happens here; a previous write still in flight
+        # is awaited first so saves land in order
+        arrays = [np.array(variable) for variable in self._variables]
+        if self._pending is not None:
+            self._pending.result()
+        state = {
+            **self.state,
+            "epoch": epoch + 1,
+            self.monitor: float(current),
+            "variables": [{"path": v.path, "shape": list(v.shape)} for v in self._variables],
+        }
+        self._pending = self._executor.submit(write_checkpoint, self.directory, arrays, state)
+        self.stalls.append(time.perf_counter() - start)
+
+    def on_train_end(self, logs=None):
+        if self._pending is not None:
+            self._pending.result()
+        self._executor.shutdown()
+        if self.stalls:
+            size = sum(os.path.getsize(os.path.join(self.directory, f)) for f in (WEIGHTS_FILE, STATE_FILE))
+            print(
+                f"Lean checkpoint: {len(self.stalls)} saves to {self.directory} "
+                f"({size / 2**20:.1f} MB), median stall {np.median(self.stalls) * 1000:.1f} ms per save"
+            )
+
+
+def is_lean_checkpoint(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, STATE_FILE))
+
+
+def load_lean_checkpoint(directory):
+    """
+    Rebuilds a model saved by LeanCheckpoint: the architecture is built again from the
+    saved build arguments and scaler state, which brings in the pretrained frozen
+    backbones, and the saved variables are assigned over it.
+
+    The build arguments are {"builder": "zoo", "model_name", "img_shape", "numerical_shape"}
+    with scalers "zcr" and "rms", {"builder": "sequence", "img_shape", "rnn_type"} with
+    scaler "frame", or {"builder": "numerical", "numerical_shape"} with scalers "zcr" and "rms".
+
+    Returns:
+        (model, label_encoder)
+    """
+    from src.PoCs.MultiModalTraining.model import build_numerical_model, build_sequence_multimodal_model
+    from src.PoCs.MultiModalTraining.model_zoo import build_model
+
+    with open(os.path.join(directory, STATE_FILE), "r", encoding="utf-8") as f:
+        state = json.load(f)
+    build = state["build"]
+    scalers = {name: scaler_from_state(s) for name, s in state["scalers"].items()}
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.asarray(state["classes"])
+    num_classes = len(label_encoder.classes_)
+
+    if build["builder"] == "numerical":
+        model = build_numerical_model(tuple(build["numerical_shape"]), num_classes, scalers["zcr"], scalers["rms"])
+    elif build["builder"] == "sequence":
+        model = build_sequence_multimodal_model(
+            tuple(build["img_shape"]), num_classes, scalers["frame"], build.get("rnn_type", "gru")
+        )
+    else:
+        model = build_model(
+            build["model_name"], tuple(build["img_shape"]), tuple(build["numerical_shape"]),
+            num_classes, scalers["zcr"], scalers["rms"]
+        )
+
+    variables = checkpoint_variables(model)
+    with np.load(os.path.join(directory, WEIGHTS_FILE)) as weights:
+        arrays = [weights[f"arr_{i}"] for i in range(len(weights.files))]
+    if len(arrays) != len(variables):
+        raise ValueError(f"Checkpoint has {len(arrays)} variables but the rebuilt model has {len(variables)}.")
+    for variable, array, saved in zip(variables, arrays, state["variables"]):
+        if tuple(variable.shape) != array.shape:
+            raise ValueError(f"Shape mismatch for {saved['path']}: saved {array.shape}, model {tuple(variable.shape)}.")
+        variable.assign(array)
+    return model, label_encoder
+
+
+def load_trained_model(path):
+    """
+    Loads a trained model from either a lean checkpoint folder or a full .keras file.
+
+    Returns:
+        (model, class names or None when the file does not record them)
+    """
+    if is_lean_checkpoint(path):
+        model, label_encoder = load_lean_checkpoint(path)
+        return model, [str(c) for c in label_encoder.classes_]
+    return tf.keras.models.load_model(path), None
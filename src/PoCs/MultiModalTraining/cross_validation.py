@@ -0,0 +1,241 @@
+import json
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import tensorflow as tf  # type: ignore
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from tensorflow.keras.callbacks import EarlyStopping  # type: ignore
+from src.PoCs.MultiModalTraining.data_loader import (
+    load_labeled_dataframe,
+    load_image,
+    load_numerical_matrix,
+    get_kfold_splits,
+)
+from src.PoCs.MultiModalTraining.model import build_visual_encoder, build_head_model
+from src.pipeline import fingerprint_paths
+from src.utils.utils import init_worker_threads, load_config
+
+# Size of the pooled ResNet50 embedding produced by each visual branch
+EMBEDDING_DIM = 2048
+
+FEATURE_NAMES = ("zcr", "rms", "mfcc_embeddings", "chroma_embeddings")
+INDEX_COLUMNS = ["mfcc_path", "chromagram_path", "zcr_path", "rms_path"]
+# Config keys that change the cached arrays, so a cache built with other values is rebuilt
+CACHE_SETTINGS = ("IMG_HEIGHT", "IMG_WIDTH", "NUM_CHANNELS", "FIXED_1D_LENGTH")
+METRICS = ("accuracy", "precision", "recall", "f1")
+
+
+def compute_embeddings(paths, name, config, batch_size=64):
+    """
+    Runs every image in `paths` through a frozen ResNet50 encoder once and returns the
+    pooled embeddings as a (len(paths), EMBEDDING_DIM) float32 array.
+    """
+    img_shape = (config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"])
+    encoder = build_visual_encoder(img_shape, name)
+
+    dataset = tf.data.Dataset.from_tensor_slices(list(paths))
+    dataset = dataset.map(lambda p: load_image(p, config), num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+    return encoder.predict(dataset, verbose=0).astype(np.float32)
+
+
+def prepare_shared_features(df, config, cache_dir):
+    """
+    Builds the read-only feature store shared by every fold.
+
+    The padded ZCR/RMS matrices and the MFCC/chromagram embeddings are computed once
+    and saved as .npy files in cache_dir, which fold workers open with mmap_mode='r'.
+    A cache is reused as-is only if it was built from the same feature files, unchanged
+    since (their sizes and modification times, see pipeline.fingerprint_paths), and with
+    the same CACHE_SETTINGS (image size and numerical length). Both are recorded in
+    settings.json, so re-extracting features to the same paths rebuilds the cache.
+
+    Returns:
+        A dict mapping each feature name to its .npy path.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    feature_paths = {name: os.path.join(cache_dir, f"{name}.npy") for name in FEATURE_NAMES}
+    index_path = os.path.join(cache_dir, "index.csv")
+    settings_path = os.path.join(cache_dir, "settings.json")
+    index = df[INDEX_COLUMNS].reset_index(drop=True)
+    settings = {key: config[key] for key in CACHE_SETTINGS}
+    settings["features_fingerprint"] = fingerprint_paths(index.values.ravel().tolist())
+
+    cached_files = [index_path, settings_path, *feature_paths.values()]
+    if all(os.path.exists(p) for p in cached_files):
+        cached = pd.read_csv(index_path)
+        with open(settings_path, "r", encoding="utf-8") as f:
+            cached_settings = json.load(f)
+        if cached_settings == settings and cached.astype(str).values.tolist() == index.astype(str).values.tolist():
+            print(f"Reusing cached features from {cache_dir}")
+            return feature_paths
+
+    length = config["FIXED_1D_LENGTH"]
+    print("Building shared numerical features...")
+    np.save(feature_paths["zcr"], load_numerical_matrix(df["zcr_path"], length))
+    np.save(feature_paths["rms"], load_numerical_matrix(df["rms_path"], length))
+
+    print("Computing frozen ResNet50 embeddings (one pass per branch)...")
+    np.save(feature_paths["mfcc_embeddings"], compute_embeddings(df["mfcc_path"], "mfcc", config))
+    np.save(feature_paths["chroma_embeddings"], compute_embeddings(df["chromagram_path"], "chroma", config))
+
+    # The index is written last so an interrupted build is never mistaken for a valid cache
+    with open(settings_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+    index.to_csv(index_path, index=False)
+    return feature_paths
+
+
+def fit_fold_scalers(feature_paths, splits):
+    """
+    Fits the ZCR and RMS scalers on the training rows of every fold.
+    Returns a list of (zcr_scaler, rms_scaler) pairs, one per fold.
+    """
+    zcr = np.load(feature_paths["zcr"], mmap_mode="r")
+    rms = np.load(feature_paths["rms"], mmap_mode="r")
+    return [
+        (StandardScaler().fit(zcr[train_idx]), StandardScaler().fit(rms[train_idx]))
+        for train_idx, _ in splits
+    ]
+
+
+def run_fold(fold, train_idx, test_idx, feature_paths, labels, num_classes, scalers, config):
+    """
+    Trains the classification head on one fold and scores it on the held-out rows.
+    Features are read from the shared memory-mapped store, never copied back to disk.
+    """
+    start = time.perf_counter()
+    tf.keras.utils.set_random_seed(42 + fold)
+    features = {name: np.load(path, mmap_mode="r") for name, path in feature_paths.items()}
+
+    def _inputs(idx):
+        numerical = np.concatenate([features["zcr"][idx], features["rms"][idx]], axis=1)
+        return [features["mfcc_embeddings"][idx], features["chroma_embeddings"][idx], numerical]
+
+    # StratifiedKFold returns sorted indices; shuffle so validation_split takes a random slice
+    train_idx = np.random.default_rng(fold).permutation(train_idx)
+    y_train = tf.keras.utils.to_categorical(labels[train_idx], num_classes=num_classes)
+
+    zcr_scaler, rms_scaler = scalers
+    model = build_head_model(
+        embedding_dim=EMBEDDING_DIM,
+        numerical_shape=(config["FIXED_1D_LENGTH"] * 2,),
+        num_classes=num_classes,
+        zcr_scaler=zcr_scaler,
+        rms_scaler=rms_scaler
+    )
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=config["LEARNING_RATE"]),
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    model.fit(
+        _inputs(train_idx),
+        y_train,
+        batch_size=config["BATCH_SIZE"],
+        epochs=config["EPOCHS"],
+        validation_split=config.get("CV_VAL_SPLIT", 0.1),
+        callbacks=[EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True)],
+        verbose=0
+    )
+
+    y_true = labels[test_idx]
+    y_pred = np.argmax(model.predict(_inputs(test_idx), batch_size=config["BATCH_SIZE"], verbose=0), axis=1)
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y_true, y_pred, average="macro", zero_division=0
+    )
+    return {
+        "fold": fold,
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(f1),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def summarize_folds(fold_results):
+    """
+    Aggregates per-fold metrics into their mean and standard deviation.
+    """
+    return {
+        metric: {
+            "mean": float(np.mean([r[metric] for r in fold_results])),
+            "std": float(np.std([r[metric] for r in fold_results])),
+        }
+        for metric in METRICS
+    }
+
+
+def run_cross_validation(config, parallel=True):
+    """
+    Runs stratified k-fold cross-validation of the multimodal model.
+
+    Folds are stratified by emotion and language and, when `parallel` is set, trained
+    concurrently in separate worker processes with capped intra-op threads. Config keys:
+    CV_FOLDS (default 5), CV_WORKERS (default one per fold, up to the core count),
+    CV_THREADS_PER_WORKER (default cores / workers) and CV_CACHE_DIR (default "cv_cache").
+
+    Returns:
+        A dict with the per-fold results, the aggregated metrics and the wall-clock time.
+    """
+    start = time.perf_counter()
+    n_splits = config.get("CV_FOLDS", 5)
+
+    df = load_labeled_dataframe(config["FEATURES_DIR"]).reset_index(drop=True)
+    label_encoder = LabelEncoder()
+    labels = label_encoder.fit_transform(df["emotion"])
+    num_classes = len(label_encoder.classes_)
+
+    feature_paths = prepare_shared_features(df, config, config.get("CV_CACHE_DIR", "cv_cache"))
+    splits = get_kfold_splits(df, n_splits=n_splits)
+    fold_scalers = fit_fold_scalers(feature_paths, splits)
+
+    jobs = [
+        (fold, train_idx, test_idx, feature_paths, labels, num_classes, fold_scalers[fold], config)
+        for fold, (train_idx, test_idx) in enumerate(splits)
+    ]
+
+    if parallel:
+        cpu_count = os.cpu_count() or 1
+        workers = config.get("CV_WORKERS") or min(n_splits, cpu_count)
+        threads = config.get("CV_THREADS_PER_WORKER") or max(1, cpu_count // workers)
+        print(f"Running {n_splits} folds on {workers} workers with {threads} intra-op threads each...")
+        # TensorFlow is not fork-safe, so workers are spawned fresh
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker_threads,
+            initargs=(threads,),
+        ) as executor:
+            futures = [executor.submit(run_fold, *job) for job in jobs]
+            fold_results = [future.result() for future in futures]
+    else:
+        print(f"Running {n_splits} folds serially...")
+        fold_results = [run_fold(*job) for job in jobs]
+
+    summary = summarize_folds(fold_results)
+    wall_clock = time.perf_counter() - start
+    fold_seconds = sum(r["seconds"] for r in fold_results)
+
+    print("\n--- Cross-Validation Results ---")
+    print(f"{'fold':<6}{'accuracy':>10}{'precision':>11}{'recall':>9}{'f1':>9}{'time (s)':>10}")
+    for r in fold_results:
+        print(
+            f"{r['fold']:<6}{r['accuracy']:>10.4f}{r['precision']:>11.4f}"
+            f"{r['recall']:>9.4f}{r['f1']:>9.4f}{r['seconds']:>10.1f}"
+        )
+    for metric in METRICS:
+        print(f"{metric.capitalize()}: {summary[metric]['mean']:.4f} +/- {summary[metric]['std']:.4f}")
+    print(f"Wall-clock: {wall_clock:.1f}s (sum of fold times: {fold_seconds:.1f}s)")
+    print("--------------------------------\n")
+
+    return {"folds": fold_results, "summary": summary, "wall_clock_s": wall_clock}
+
+
+if __name__ == '__main__':
+    run_cross_validation(load_config())
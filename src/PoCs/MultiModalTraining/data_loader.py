@@ -1,43 +1,28 @@
+# TensorFlow and scikit-learn are imported inside the functions that use them, so
+# lightweight helpers (parse_filepaths, convert_png_to_jpeg) don't pay for loading them.
 import os
 import pandas as pd
 import numpy as np
-import tensorflow as tf
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
 from src.utils.utils import load_config
-from PIL import Image  # Required for image conversion
+from src.utils.memory_profile import get_profiler
+from src.utils.image_codec import transcode_tree
 
 
-def convert_png_to_jpeg(directory):
+def convert_png_to_jpeg(directory, quality=90, workers=8):
     """
     Recursively finds all .png files in a directory, converts them to .jpeg,
     and removes the original .png file.
+
+    Files are converted in parallel threads and each JPEG is written atomically, so an
+    interrupted run can simply be started again: already converted files are skipped.
     """
     print("Starting PNG to JPEG conversion...")
-    converted_count = 0
-    for root, _, files in os.walk(directory):
-        for filename in files:
-            if filename.lower().endswith('.png'):
-                png_path = os.path.join(root, filename)
-                # Create the new jpeg path with the same name
-                jpeg_path = os.path.splitext(png_path)[0] + '.jpeg'
-
-                try:
-                    with Image.open(png_path) as img:
-                        # Convert to RGB if it has an alpha channel (like RGBA)
-                        if img.mode in ('RGBA', 'P'):
-                            img = img.convert('RGB')
-                        img.save(jpeg_path, 'jpeg', quality=90)  # quality can be adjusted
-
-                    # Remove the original PNG file after successful conversion
-                    os.remove(png_path)
-                    converted_count += 1
-                    print(f"Converted and removed: {png_path}")
-
-                except Exception as e:
-                    print(f"Could not convert {png_path}: {e}")
-
-    print(f"\nConversion complete. Total files converted: {converted_count}")
+    counts = transcode_tree(directory, ".png", "jpeg", quality=quality, workers=workers)
+    print(
+        f"\nConversion complete. Total files converted: {counts['converted']} "
+        f"(already converted: {counts['skipped']}, failed: {counts['failed']})"
+    )
+    return counts
 
 
 def parse_filepaths(features_dir):
@@ -99,30 +84,51 @@ def parse_filepaths(features_dir):
     return pd.DataFrame(filepaths)
 
 
+def pad_or_truncate(data, length):
+    """
+    Truncates or zero-pads a 1D array to exactly `length` values.
+    """
+    if len(data) > length:
+        return data[:length]
+    return np.pad(data, (0, length - len(data)), "constant")
+
+
+def load_image(path, config):
+    """
+    Reads a feature image and prepares it for the ResNet50 branches.
+    """
+    import tensorflow as tf  # type: ignore
+
+    return decode_image(tf.io.read_file(path), config)
+
+
+def decode_image(img_raw, config):
+    """
+    Decodes encoded JPEG bytes and prepares them for the ResNet50 branches.
+    """
+    import tensorflow as tf  # type: ignore
+
+    # --- MODIFIED TO DECODE .jpeg ---
+    img = tf.image.decode_jpeg(img_raw, channels=config["NUM_CHANNELS"])
+    img = tf.image.resize(img, [config["IMG_HEIGHT"], config["IMG_WIDTH"]])
+    img = tf.keras.applications.resnet50.preprocess_input(img)
+    return img
+
+
 def load_and_preprocess(mfcc_path, chromagram_path, zcr_path, rms_path, label):
     """
     Loads and preprocesses a single data sample for the multi-input model.
     """
-    config = load_config()
+    import tensorflow as tf  # type: ignore
 
-    def _load_image(path):
-        img_raw = tf.io.read_file(path)
-        # --- MODIFIED TO DECODE .jpeg ---
-        img = tf.image.decode_jpeg(img_raw, channels=config["NUM_CHANNELS"])
-        img = tf.image.resize(img, [config["IMG_HEIGHT"], config["IMG_WIDTH"]])
-        img = tf.keras.applications.resnet50.preprocess_input(img)
-        return img
+    config = load_config()
 
-    mfcc_img = _load_image(mfcc_path)
-    chroma_img = _load_image(chromagram_path)
+    mfcc_img = load_image(mfcc_path, config)
+    chroma_img = load_image(chromagram_path, config)
 
     def _load_npy(path):
         data = np.load(path.numpy().decode("utf-8"))
-        if len(data) > config["FIXED_1D_LENGTH"]:
-            data = data[:config["FIXED_1D_LENGTH"]]
-        else:
-            data = np.pad(data, (0, config["FIXED_1D_LENGTH"] - len(data)), "constant")
-        return data.astype(np.float32)
+        return pad_or_truncate(data, config["FIXED_1D_LENGTH"]).astype(np.float32)
 
     zcr_data = tf.py_function(_load_npy, [zcr_path], tf.float32)
     rms_data = tf.py_function(_load_npy, [rms_path], tf.float32)
@@ -138,16 +144,36 @@ def load_and_preprocess(mfcc_path, chromagram_path, zcr_path, rms_path, label):
     return inputs, label
 
 
-def create_dataset(df, label_encoder, zcr_scaler, rms_scaler, batch_size):
+def create_dataset(df, label_encoder, zcr_scaler, rms_scaler, batch_size, augment_fn=None):
     """
     Creates a tf.data.Dataset from a pandas DataFrame.
+    augment_fn, if given, is mapped over whole batches (see feature_augment.feature_augmenter).
     """
+    import tensorflow as tf  # type: ignore
+
     df["emotion_encoded"] = label_encoder.transform(df["emotion"])
+    dataset = labeled_path_slices(df, label_encoder)
+
+    dataset = dataset.map(load_and_preprocess, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.shuffle(buffer_size=len(df))
+    dataset = dataset.batch(batch_size)
+    if augment_fn is not None:
+        dataset = dataset.map(augment_fn, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
+    return dataset
+
+
+def labeled_path_slices(df, label_encoder):
+    """
+    Returns a tf.data.Dataset of (mfcc_path, chromagram_path, zcr_path, rms_path, one-hot label)
+    tuples, one per row, before any file is read.
+    """
+    import tensorflow as tf  # type: ignore
+
     labels_one_hot = tf.keras.utils.to_categorical(
-        df["emotion_encoded"], num_classes=len(label_encoder.classes_)
+        label_encoder.transform(df["emotion"]), num_classes=len(label_encoder.classes_)
     )
-
-    dataset = tf.data.Dataset.from_tensor_slices(
+    return tf.data.Dataset.from_tensor_slices(
         (
             df["mfcc_path"].values,
             df["chromagram_path"].values,
@@ -157,22 +183,189 @@ def create_dataset(df, label_encoder, zcr_scaler, rms_scaler, batch_size):
         )
     )
 
+
+def create_sharded_dataset(
+    df, label_encoder, batch_size, num_shards, shard_index, shuffle=True, seed=42, augment_fn=None
+):
+    """
+    Creates the endless input pipeline of one data-parallel worker.
+
+    The file list is sharded before any file is read, so each worker only decodes its own
+    1/num_shards of the data. The dataset repeats, so every worker can run the same number
+    of steps per epoch regardless of how evenly the rows split.
+    """
+    import tensorflow as tf  # type: ignore
+
+    dataset = labeled_path_slices(df, label_encoder).shard(num_shards, shard_index)
+    if shuffle:
+        dataset = dataset.shuffle(buffer_size=len(df), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.repeat()
     dataset = dataset.map(load_and_preprocess, num_parallel_calls=tf.data.AUTOTUNE)
-    dataset = dataset.shuffle(buffer_size=len(df))
-    dataset = dataset.batch(batch_size)
+    dataset = dataset.batch(batch_size, drop_remainder=True)
+    if augment_fn is not None:
+        dataset = dataset.map(augment_fn, num_parallel_calls=tf.data.AUTOTUNE)
     dataset = dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
     return dataset
 
 
-def get_data_loaders(features_dir, batch_size=32, test_size=0.2, val_size=0.2):
+def create_sharded_eval_dataset(df, label_encoder, batch_size, num_shards, shard_index):
     """
-    Main function to parse data, create splits, and return tf.data.Dataset objects.
+    Creates one data-parallel worker's share of a single, finite evaluation pass over df.
+
+    The rows are padded with copies of the last one up to a multiple of the global batch
+    (batch_size * num_shards), so every worker runs the same number of steps and every row
+    is scored exactly once. Elements are (inputs, label, weight), where padding rows have
+    weight 0 and must be left out of the metrics.
+
+    Returns:
+        (dataset, steps), with steps the number of batches in the pass.
+    """
+    import tensorflow as tf  # type: ignore
+
+    global_batch = batch_size * num_shards
+    padding = -len(df) % global_batch
+    padded_df = pd.concat([df, df.iloc[[-1] * padding]])
+    weights = np.concatenate([np.ones(len(df)), np.zeros(padding)]).astype(np.float32)
+
+    dataset = tf.data.Dataset.zip((labeled_path_slices(padded_df, label_encoder), tf.data.Dataset.from_tensor_slices(weights)))
+    dataset = dataset.shard(num_shards, shard_index)
+    dataset = dataset.map(
+        lambda paths, weight: (*load_and_preprocess(*paths), weight), num_parallel_calls=tf.data.AUTOTUNE
+    )
+    dataset = dataset.batch(batch_size, drop_remainder=True).prefetch(buffer_size=tf.data.AUTOTUNE)
+    return dataset, len(padded_df) // global_batch
+
+
+# Value of the frames added when padding a batch of sequences. ZCR and RMS are never
+# negative, so padding can't be confused with a real frame and is masked out in the model.
+SEQUENCE_PAD_VALUE = -1.0
+
+
+def load_sequence(zcr_path, rms_path, max_length=None):
+    """
+    Stacks a clip's ZCR and RMS into a (frames, 2) float32 sequence at its natural length,
+    truncated to max_length frames when given.
+    """
+    zcr, rms = np.load(zcr_path), np.load(rms_path)
+    frames = min(len(zcr), len(rms))
+    if max_length:
+        frames = min(frames, max_length)
+    return np.stack([zcr[:frames], rms[:frames]], axis=1).astype(np.float32)
+
+
+def read_sequence_lengths(zcr_paths, max_length=None):
+    """
+    Returns the frame count of every clip from its .npy header, without loading the arrays.
+    """
+    from src.utils.data_visualisers import read_npy_shape
+
+    lengths = np.array([read_npy_shape(p)[-1] for p in zcr_paths], dtype=np.int64)
+    return np.minimum(lengths, max_length) if max_length else lengths
+
+
+def compute_bucket_boundaries(lengths, num_buckets=8):
+    """
+    Picks bucket boundaries at the length quantiles, so each bucket gets about the same number of clips.
     """
+    quantiles = np.quantile(lengths, np.linspace(0, 1, num_buckets + 1)[1:-1])
+    return sorted({int(q) + 1 for q in quantiles})
+
+
+def padding_report(lengths, boundaries, batch_size, fixed_length, seed=42):
+    """
+    Estimates how many of the frames fed to the model are padding, with fixed-length
+    batches versus length-bucketed batches (simulated over one shuffled epoch).
+
+    Returns:
+        A dict with the padded fraction for both modes and the frames lost to truncation in fixed mode.
+    """
+    lengths = np.asarray(lengths)
+    fixed_real = np.minimum(lengths, fixed_length).sum()
+    fixed_total = fixed_length * len(lengths)
+
+    rng = np.random.default_rng(seed)
+    buckets = {}
+    bucket_total = 0
+    for length in lengths[rng.permutation(len(lengths))]:
+        batch = buckets.setdefault(int(np.searchsorted(boundaries, length, side="right")), [])
+        batch.append(length)
+        if len(batch) == batch_size:
+            bucket_total += max(batch) * len(batch)
+            batch.clear()
+    bucket_total += sum(max(batch) * len(batch) for batch in buckets.values() if batch)
+
+    return {
+        "fixed_padding": float(1 - fixed_real / fixed_total),
+        "fixed_truncated_frames": int(lengths.sum() - fixed_real),
+        "bucketed_padding": float(1 - lengths.sum() / bucket_total),
+    }
+
+
+def load_and_preprocess_sequence(mfcc_path, chromagram_path, zcr_path, rms_path, label):
+    """
+    Like load_and_preprocess, but keeps ZCR and RMS as a variable-length (frames, 2) sequence.
+    """
+    import tensorflow as tf  # type: ignore
+
     config = load_config()
+
+    def _load_sequence(zcr, rms):
+        return load_sequence(zcr.numpy().decode("utf-8"), rms.numpy().decode("utf-8"), config.get("MAX_SEQUENCE_LENGTH"))
+
+    sequence = tf.py_function(_load_sequence, [zcr_path, rms_path], tf.float32)
+    sequence.set_shape((None, 2))
+
+    inputs = {
+        "mfcc_input": load_image(mfcc_path, config),
+        "chroma_input": load_image(chromagram_path, config),
+        "sequence_input": sequence,
+    }
+    return inputs, label
+
+
+def create_bucketed_dataset(df, label_encoder, batch_size, boundaries):
+    """
+    Creates a tf.data.Dataset whose batches group clips of similar length, padding
+    each batch only to its longest sequence (with SEQUENCE_PAD_VALUE).
+    """
+    import tensorflow as tf  # type: ignore
+
+    dataset = labeled_path_slices(df, label_encoder)
+    label_dtype = dataset.element_spec[-1].dtype
+
+    dataset = dataset.shuffle(buffer_size=len(df))
+    dataset = dataset.map(load_and_preprocess_sequence, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.bucket_by_sequence_length(
+        element_length_func=lambda inputs, label: tf.shape(inputs["sequence_input"])[0],
+        bucket_boundaries=boundaries,
+        bucket_batch_sizes=[batch_size] * (len(boundaries) + 1),
+        padding_values=(
+            {
+                "mfcc_input": tf.constant(0.0),
+                "chroma_input": tf.constant(0.0),
+                "sequence_input": tf.constant(SEQUENCE_PAD_VALUE),
+            },
+            tf.constant(0.0, dtype=label_dtype),
+        ),
+    )
+    dataset = dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
+    return dataset
+
+
+def load_labeled_dataframe(features_dir):
+    """
+    Parses the features directory and normalizes the emotion labels across the corpora.
+    """
     df = parse_filepaths(features_dir)
     if df.empty:
         raise ValueError("No feature files found or parsed.")
+    return clean_emotion_labels(df)
+
 
+def clean_emotion_labels(df):
+    """
+    Maps the corpus-specific emotion names onto one shared label set.
+    """
     print("--- Cleaning Labels ---")
     print("\nBefore cleaning:")
     print(df['emotion'].value_counts())
@@ -183,9 +376,52 @@ def get_data_loaders(features_dir, batch_size=32, test_size=0.2, val_size=0.2):
     print("\nAfter cleaning:")
     print(df['emotion'].value_counts())
     print("-------------------------\n")
+    return df
 
-    label_encoder = LabelEncoder()
-    df["emotion_encoded"] = label_encoder.fit_transform(df["emotion"])
+
+def load_class_names(features_dir):
+    """
+    Returns the emotion classes in the order LabelEncoder assigns them (sorted),
+    so a saved model's outputs can be decoded without refitting the encoder.
+    """
+    return sorted(load_labeled_dataframe(features_dir)["emotion"].unique())
+
+
+def load_numerical_matrix(paths, length):
+    """
+    Loads 1D feature files into a (len(paths), length) float32 matrix, padding or truncating each row.
+    """
+    return np.vstack([pad_or_truncate(np.load(p), length) for p in paths]).astype(np.float32)
+
+
+def get_kfold_splits(df, n_splits=5, random_state=42):
+    """
+    Returns a list of (train_index, test_index) pairs for stratified k-fold cross-validation.
+    Folds are stratified jointly by emotion and language so every fold keeps the corpus mix.
+    """
+    from sklearn.model_selection import StratifiedKFold  # type: ignore
+
+    strata = df["emotion"].astype(str) + "_" + df["language"].astype(str)
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(skf.split(np.zeros(len(df)), strata))
+
+
+def fit_numerical_scalers(train_df, length):
+    """
+    Fits one StandardScaler per position on the padded ZCR and RMS matrices of the training rows.
+    """
+    from sklearn.preprocessing import StandardScaler  # type: ignore
+
+    zcr_scaler = StandardScaler().fit(load_numerical_matrix(train_df["zcr_path"], length))
+    rms_scaler = StandardScaler().fit(load_numerical_matrix(train_df["rms_path"], length))
+    return zcr_scaler, rms_scaler
+
+
+def split_dataframe(df, test_size=0.2, val_size=0.2):
+    """
+    Splits the labeled dataframe into stratified train, validation and test parts.
+    """
+    from sklearn.model_selection import train_test_split  # type: ignore
 
     train_df, test_df = train_test_split(
         df, test_size=test_size, random_state=42, stratify=df["emotion_encoded"]
@@ -196,43 +432,258 @@ def get_data_loaders(features_dir, batch_size=32, test_size=0.2, val_size=0.2):
         random_state=42,
         stratify=train_df["emotion_encoded"],
     )
+    return train_df, val_df, test_df
+
+
+def get_data_loaders(features_dir, batch_size=32, test_size=0.2, val_size=0.2, augment=True):
+    """
+    Main function to parse data, create splits, and return tf.data.Dataset objects.
+    With augment=False the training set skips FEATURE_AUGMENT, e.g. for calibration data.
+    """
+    from sklearn.preprocessing import LabelEncoder  # type: ignore
+    from src.PoCs.MultiModalTraining.feature_augment import feature_augmenter
+
+    config = load_config()
+    df = load_labeled_dataframe(features_dir)
 
+    label_encoder = LabelEncoder()
+    df["emotion_encoded"] = label_encoder.fit_transform(df["emotion"])
+    train_df, val_df, test_df = split_dataframe(df, test_size, val_size)
+
+    profiler = get_profiler()
     print("Fitting scalers on training data...")
-    zcr_train_data = np.vstack(
-        [
-            (
-                np.load(p)[:config["FIXED_1D_LENGTH"]]
-                if len(np.load(p)) > config["FIXED_1D_LENGTH"]
-                else np.pad(np.load(p), (0, config["FIXED_1D_LENGTH"] - len(np.load(p))))
-            )
-            for p in train_df["zcr_path"]
-        ]
+    with profiler.stage("scaler_fitting"):
+        zcr_scaler, rms_scaler = fit_numerical_scalers(train_df, config["FIXED_1D_LENGTH"])
+    print("Scalers fitted.")
+
+    print("Creating TensorFlow datasets...")
+    with profiler.stage("create_dataset"):
+        train_ds = create_dataset(
+            train_df, label_encoder, zcr_scaler, rms_scaler, batch_size,
+            augment_fn=feature_augmenter(config) if augment else None
+        )
+        val_ds = create_dataset(val_df, label_encoder, zcr_scaler, rms_scaler, batch_size)
+        test_ds = create_dataset(test_df, label_encoder, zcr_scaler, rms_scaler, batch_size)
+    print("Datasets created.")
+
+    return train_ds, val_ds, test_ds, label_encoder, zcr_scaler, rms_scaler
+
+
+def get_bucketed_data_loaders(features_dir, batch_size=32, test_size=0.2, val_size=0.2, num_buckets=8):
+    """
+    Variant of get_data_loaders for the recurrent models: ZCR and RMS are kept at their
+    natural length as a (frames, 2) sequence and batched by length bucket instead of being
+    truncated or padded to FIXED_1D_LENGTH.
+
+    Returns:
+        train_ds, val_ds, test_ds, label_encoder and a StandardScaler fitted per feature
+        (ZCR, RMS) over every training frame.
+    """
+    from sklearn.preprocessing import StandardScaler, LabelEncoder  # type: ignore
+
+    config = load_config()
+    max_length = config.get("MAX_SEQUENCE_LENGTH")
+    df = load_labeled_dataframe(features_dir)
+
+    label_encoder = LabelEncoder()
+    df["emotion_encoded"] = label_encoder.fit_transform(df["emotion"])
+    train_df, val_df, test_df = split_dataframe(df, test_size, val_size)
+
+    lengths = read_sequence_lengths(train_df["zcr_path"], max_length)
+    boundaries = config.get("BUCKET_BOUNDARIES") or compute_bucket_boundaries(lengths, num_buckets)
+    report = padding_report(lengths, boundaries, batch_size, config.get("FIXED_1D_LENGTH", 512))
+    print(f"Bucket boundaries (frames): {boundaries}")
+    print(
+        f"Padded frames per epoch: {report['fixed_padding']:.1%} with fixed-length batches "
+        f"({report['fixed_truncated_frames']} frames truncated), "
+        f"{report['bucketed_padding']:.1%} with bucketed batches"
+    )
+
+    profiler = get_profiler()
+    print("Fitting frame scaler on training data...")
+    with profiler.stage("scaler_fitting"):
+        frame_scaler = StandardScaler()
+        for zcr_path, rms_path in zip(train_df["zcr_path"], train_df["rms_path"]):
+            frame_scaler.partial_fit(load_sequence(zcr_path, rms_path, max_length))
+    print("Scaler fitted.")
+
+    print("Creating bucketed TensorFlow datasets...")
+    with profiler.stage("create_dataset"):
+        train_ds = create_bucketed_dataset(train_df, label_encoder, batch_size, boundaries)
+        val_ds = create_bucketed_dataset(val_df, label_encoder, batch_size, boundaries)
+        test_ds = create_bucketed_dataset(test_df, label_encoder, batch_size, boundaries)
+    print("Datasets created.")
+
+    return train_ds, val_ds, test_ds, label_encoder, frame_scaler
+
+
+def load_audio_dataframe(store):
+    """
+    Labeled clips of a WaveformStore, with a clip_id column pointing into the store.
+    Clips whose file name carries no emotion are dropped.
+    """
+    df = store.index.copy()
+    df["clip_id"] = np.arange(len(df))
+    df = df[df["emotion"] != "unknown"].reset_index(drop=True)
+    if df.empty:
+        raise ValueError("No labeled clips found in the waveform store.")
+    return clean_emotion_labels(df)
+
+
+def clip_reader(store):
+    """Returns a function reading clip `i` of the store as float32 samples in [-1, 1]."""
+    from src.utils.waveform_store import INT16_SCALE
+
+    scale = 1.0 / INT16_SCALE if store.dtype == "int16" else 1.0
+
+    def _read(clip_id):
+        return store.clip(int(clip_id)).astype(np.float32) * np.float32(scale)
+
+    return _read
+
+
+def read_clip_tensor(read_fn, clip_id):
+    """
+    Reads one clip inside a tf.data map: wraps a clip_reader function as a float32 tensor of unknown length.
+    """
+    import tensorflow as tf  # type: ignore
+
+    waveform = tf.numpy_function(read_fn, [clip_id], tf.float32)
+    waveform.set_shape([None])
+    return waveform
+
+
+def fit_audio_scalers(store, train_df, extractor, length, batch_size=64):
+    """
+    Fits the ZCR and RMS StandardScalers on the training clips, computing both features in the graph.
+    """
+    import tensorflow as tf  # type: ignore
+    from sklearn.preprocessing import StandardScaler  # type: ignore
+
+    read_fn = clip_reader(store)
+
+    def _numerical(clip_id):
+        waveform = read_clip_tensor(read_fn, clip_id)
+
+        def _pad_or_truncate(values):
+            values = values[:length]
+            return tf.pad(values, [[0, length - tf.size(values)]])
+
+        return _pad_or_truncate(extractor.zcr(waveform)), _pad_or_truncate(extractor.rms(waveform))
+
+    dataset = tf.data.Dataset.from_tensor_slices(train_df["clip_id"].values)
+    dataset = dataset.map(_numerical, num_parallel_calls=tf.data.AUTOTUNE).batch(batch_size)
+    zcr_scaler, rms_scaler = StandardScaler(), StandardScaler()
+    for zcr, rms in dataset:
+        zcr_scaler.partial_fit(zcr.numpy())
+        rms_scaler.partial_fit(rms.numpy())
+    return zcr_scaler, rms_scaler
+
+
+def validate_audio_features(store, df, extractor, num_clips=4):
+    """
+    Compares the in-graph features of the first `num_clips` clips with extract_lib's librosa features.
+
+    Returns:
+        The largest absolute difference per feature.
+    """
+    from src.utils.extract_lib import compute_features
+
+    read_fn = clip_reader(store)
+    errors = {"dd_mfcc": 0.0, "chromagram": 0.0, "zcr": 0.0, "rms": 0.0}
+    for clip_id in df["clip_id"].values[:num_clips]:
+        waveform = read_fn(clip_id)
+        expected = compute_features(waveform, store.sample_rate, extractor.n_fft, extractor.hop_length)
+        actual = extractor.features(waveform)
+        for name in errors:
+            errors[name] = max(errors[name], float(np.abs(actual[name].numpy() - expected[name]).max()))
+    return errors
+
+
+def create_audio_dataset(store, df, label_encoder, extractor, config, batch_size, shuffle=True, seed=42, augment_fn=None):
+    """
+    Creates a tf.data.Dataset that reads waveforms from the store and computes the model
+    inputs in parallel map calls, so feature computation overlaps with training.
+    augment_fn, if given, is mapped over whole batches.
+    """
+    import tensorflow as tf  # type: ignore
+
+    read_fn = clip_reader(store)
+    height, width, length = config["IMG_HEIGHT"], config["IMG_WIDTH"], config["FIXED_1D_LENGTH"]
+    labels_one_hot = tf.keras.utils.to_categorical(
+        label_encoder.transform(df["emotion"]), num_classes=len(label_encoder.classes_)
     )
-    rms_train_data = np.vstack(
-        [
-            (
-                np.load(p)[:config["FIXED_1D_LENGTH"]]
-                if len(np.load(p)) > config["FIXED_1D_LENGTH"]
-                else np.pad(np.load(p), (0, config["FIXED_1D_LENGTH"] - len(np.load(p))))
-            )
-            for p in train_df["rms_path"]
-        ]
+
+    def _load(clip_id, label):
+        waveform = read_clip_tensor(read_fn, clip_id)
+        return extractor.model_inputs(waveform, height, width, length), label
+
+    dataset = tf.data.Dataset.from_tensor_slices((df["clip_id"].values, labels_one_hot))
+    # Clip ids are shuffled before any audio is read, so the buffer costs nothing
+    if shuffle:
+        dataset = dataset.shuffle(buffer_size=len(df), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.map(_load, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size)
+    if augment_fn is not None:
+        dataset = dataset.map(augment_fn, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
+
+
+def get_audio_data_loaders(store_dir, batch_size=32, test_size=0.2, val_size=0.2, augment=True):
+    """
+    Variant of get_data_loaders that needs no precomputed features: clips come from a
+    WaveformStore (see pack_waveforms) and dd-MFCC, chroma, ZCR and RMS are computed with
+    tf.signal inside the input pipeline. FEATURE_N_FFT and FEATURE_HOP_LENGTH change the
+    analysis without re-extraction, and AUDIO_VALIDATE_CLIPS clips (default 4) are
+    checked against librosa first. augment=False skips FEATURE_AUGMENT on the training set.
+
+    Returns:
+        train_ds, val_ds, test_ds, label_encoder, zcr_scaler and rms_scaler, as get_data_loaders.
+    """
+    from sklearn.preprocessing import LabelEncoder  # type: ignore
+    from src.PoCs.MultiModalTraining.feature_augment import feature_augmenter
+    from src.PoCs.MultiModalTraining.tf_features import HOP_LENGTH, N_FFT, TFFeatureExtractor
+    from src.utils.waveform_store import WaveformStore
+
+    config = load_config()
+    store = WaveformStore(store_dir)
+    df = load_audio_dataframe(store)
+    extractor = TFFeatureExtractor(
+        store.sample_rate, config.get("FEATURE_N_FFT", N_FFT), config.get("FEATURE_HOP_LENGTH", HOP_LENGTH)
     )
-    zcr_scaler = StandardScaler().fit(zcr_train_data)
-    rms_scaler = StandardScaler().fit(rms_train_data)
+
+    num_check = config.get("AUDIO_VALIDATE_CLIPS", 4)
+    if num_check:
+        errors = validate_audio_features(store, df, extractor, num_check)
+        print("In-graph features vs librosa (max abs diff): " + ", ".join(f"{k} {v:.2e}" for k, v in errors.items()))
+        if errors["dd_mfcc"] > 1e-2 or max(errors["chromagram"], errors["zcr"], errors["rms"]) > 1e-4:
+            raise ValueError("In-graph features do not match librosa.")
+
+    label_encoder = LabelEncoder()
+    df["emotion_encoded"] = label_encoder.fit_transform(df["emotion"])
+    train_df, val_df, test_df = split_dataframe(df, test_size, val_size)
+
+    profiler = get_profiler()
+    print("Fitting scalers on training clips...")
+    with profiler.stage("scaler_fitting"):
+        zcr_scaler, rms_scaler = fit_audio_scalers(store, train_df, extractor, config["FIXED_1D_LENGTH"])
     print("Scalers fitted.")
 
-    print("Creating TensorFlow datasets...")
-    train_ds = create_dataset(train_df, label_encoder, zcr_scaler, rms_scaler, batch_size)
-    val_ds = create_dataset(val_df, label_encoder, zcr_scaler, rms_scaler, batch_size)
-    test_ds = create_dataset(test_df, label_encoder, zcr_scaler, rms_scaler, batch_size)
+    print("Creating TensorFlow datasets with in-graph features...")
+    with profiler.stage("create_dataset"):
+        train_ds = create_audio_dataset(
+            store, train_df, label_encoder, extractor, config, batch_size,
+            augment_fn=feature_augmenter(config) if augment else None
+        )
+        val_ds = create_audio_dataset(store, val_df, label_encoder, extractor, config, batch_size, shuffle=False)
+        test_ds = create_audio_dataset(store, test_df, label_encoder, extractor, config, batch_size, shuffle=False)
     print("Datasets created.")
 
     return train_ds, val_ds, test_ds, label_encoder, zcr_scaler, rms_scaler
 
 
 # --- Main execution block for one-time conversion ---
-# To run, use the command: python -m src.models.data_loader
+# To run, use the command: python -m src.PoCs.MultiModalTraining.data_loader
 # IMPORTANT: Comment out or remove this block after the conversion is complete.
 # if __name__ == '__main__':
 #    config = load_config()
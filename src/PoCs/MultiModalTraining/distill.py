@@ -0,0 +1,242 @@
+import os
+import numpy as np
+import tensorflow as tf  # type: ignore
+from tensorflow.keras import layers  # type: ignore
+from tensorflow.keras.models import Model  # type: ignore
+from sklearn.preprocessing import LabelEncoder  # type: ignore
+from src.PoCs.MultiModalTraining.checkpoint import load_trained_model
+from src.PoCs.MultiModalTraining.data_loader import (
+    clip_reader,
+    labeled_path_slices,
+    load_and_preprocess,
+    load_audio_dataframe,
+    load_labeled_dataframe,
+    read_clip_tensor,
+    split_dataframe,
+)
+from src.PoCs.MultiModalTraining.export_tflite import measure_latency
+from src.PoCs.MultiModalTraining.tf_features import N_CHROMA, N_MFCC, TFFeatureExtractor
+from src.utils.utils import load_config
+from src.utils.waveform_store import WaveformStore
+
+# dd-MFCC, chroma, ZCR and RMS stacked per frame
+NUM_FRAME_FEATURES = N_MFCC + N_CHROMA + 2
+
+
+def frame_features(extractor, waveform, num_frames):
+    """
+    The student's input for one clip: the feature matrices at their native resolution,
+    one row per STFT frame, zero-padded or truncated to `num_frames`.
+    """
+    features = extractor.features(waveform)
+    frames = tf.concat([
+        tf.transpose(features["dd_mfcc"]),
+        tf.transpose(features["chromagram"]),
+        features["zcr"][:, tf.newaxis],
+        features["rms"][:, tf.newaxis],
+    ], axis=1)[:num_frames]
+    return tf.ensure_shape(tf.pad(frames, [[0, num_frames - tf.shape(frames)[0]], [0, 0]]), [num_frames, NUM_FRAME_FEATURES])
+
+
+def build_student_model(num_frames, num_classes, normalizer):
+    """
+    Compact CNN + GRU over the (frames, features) matrix. Returns logits, so the
+    distillation loss can soften them with a temperature.
+    """
+    frames_input = layers.Input(shape=(num_frames, NUM_FRAME_FEATURES), name="frames_input")
+    x = normalizer(frames_input)
+    for filters in (64, 64):
+        x = layers.Conv1D(filters, 5, padding="same", activation="relu")(x)
+        x = layers.MaxPooling1D(2)(x)
+    x = layers.GRU(64)(x)
+    x = layers.Dropout(0.3)(x)
+    logits = layers.Dense(num_classes, dtype="float32", name="logits")(x)
+    return Model(inputs=frames_input, outputs=logits, name="student")
+
+
+def distillation_loss(num_classes, temperature=4.0, alpha=0.1):
+    """
+    Loss for targets packed as [one-hot label, softened teacher probabilities]:
+    alpha * cross-entropy with the label + (1 - alpha) * T^2 * KL(teacher || student at temperature T).
+    """
+    def _loss(y_true, logits):
+        hard, soft = y_true[:, :num_classes], y_true[:, num_classes:]
+        hard_loss = tf.keras.losses.categorical_crossentropy(hard, logits, from_logits=True)
+        soft_loss = tf.keras.losses.kullback_leibler_divergence(soft, tf.nn.softmax(logits / temperature))
+        return alpha * hard_loss + (1 - alpha) * temperature ** 2 * soft_loss
+    return _loss
+
+
+def hard_accuracy(num_classes):
+    def accuracy(y_true, logits):
+        return tf.cast(tf.equal(tf.argmax(y_true[:, :num_classes], axis=1), tf.argmax(logits, axis=1)), tf.float32)
+    return accuracy
+
+
+def soften(probabilities, temperature):
+    """Re-applies the softmax at `temperature` to probabilities (their logs are the logits up to a constant)."""
+    logits = np.log(np.clip(probabilities, 1e-12, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    return np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+
+
+def match_store_clips(split_df, store_df):
+    """
+    Attaches the waveform store's clip_id to the rows of a feature-tree split. A feature
+    folder is named after the stem of the audio file it was extracted from, so the two are
+    matched on that name; rows without a clip in the store are dropped.
+    """
+    split_df = split_df.assign(clip_name=split_df["mfcc_path"].map(lambda p: os.path.basename(os.path.dirname(p))))
+    store_names = store_df[["clip_id"]].assign(
+        clip_name=store_df["path"].map(lambda p: os.path.splitext(os.path.basename(p))[0])
+    ).drop_duplicates("clip_name")
+    return split_df.merge(store_names, on="clip_name", how="inner")
+
+
+def teacher_splits(config, store, label_encoder):
+    """
+    Recreates the train/validation/test split the teacher was trained on, with a clip_id
+    into the store for every row.
+
+    With LOADER_MODE "audio" the teacher was split over the store itself. Otherwise it was
+    split over the feature tree (FEATURES_DIR), so the same split is rebuilt there and its
+    rows are matched to their store clips (see match_store_clips).
+    """
+    if config.get("LOADER_MODE", "fixed") == "audio":
+        df = load_audio_dataframe(store)
+        df = df[df["emotion"].isin(label_encoder.classes_)].copy()
+        df["emotion_encoded"] = label_encoder.transform(df["emotion"])
+        return split_dataframe(df)
+
+    df = load_labeled_dataframe(config["FEATURES_DIR"])
+    df = df[df["emotion"].isin(label_encoder.classes_)].copy()
+    df["emotion_encoded"] = label_encoder.transform(df["emotion"])
+    store_df = store.index.assign(clip_id=np.arange(len(store)))
+    splits = [match_store_clips(part, store_df) for part in split_dataframe(df)]
+    matched = sum(len(part) for part in splits)
+    print(f"Matched {matched}/{len(df)} clips of the teacher's split to the waveform store.")
+    if not all(len(part) for part in splits):
+        raise ValueError("The waveform store holds none of the clips of a teacher split.")
+    return splits
+
+
+def distill(config):
+    """
+    Distills the trained multimodal model (MODEL_PATH) into a compact student.
+
+    The split is the one the teacher was trained on (see teacher_splits), so the test clips
+    are unseen by both models. The teacher scores every clip once from the inputs it was
+    trained on: the stored feature images and vectors, or the in-graph features with
+    LOADER_MODE "audio". The student reads the clips from the waveform store
+    (WAVEFORM_STORE_DIR) and trains on their native-resolution frame features against
+    the labels and the teacher's probabilities softened at DISTILL_TEMPERATURE.
+    Reports size, single-sample CPU latency and test accuracy of both models, and saves
+    the student (softmax outputs) to STUDENT_PATH.
+    """
+    store = WaveformStore(config.get("WAVEFORM_STORE_DIR", "src//data//waveforms"))
+    teacher, classes = load_trained_model(config.get("MODEL_PATH", "best_model.keras"))
+    if not classes:
+        classes = (
+            load_audio_dataframe(store) if config.get("LOADER_MODE", "fixed") == "audio"
+            else load_labeled_dataframe(config["FEATURES_DIR"])
+        )["emotion"]
+    label_encoder = LabelEncoder().fit(classes)
+    train_df, val_df, test_df = teacher_splits(config, store, label_encoder)
+    stored_features = config.get("LOADER_MODE", "fixed") != "audio"
+
+    num_classes = len(label_encoder.classes_)
+    num_frames = config.get("STUDENT_FRAMES", config["FIXED_1D_LENGTH"])
+    temperature = config.get("DISTILL_TEMPERATURE", 4.0)
+    batch_size = config["BATCH_SIZE"]
+    extractor = TFFeatureExtractor(store.sample_rate)
+    read_fn = clip_reader(store)
+
+    def _clips(frame):
+        return tf.data.Dataset.from_tensor_slices(frame["clip_id"].values).map(
+            lambda clip_id: read_clip_tensor(read_fn, clip_id), num_parallel_calls=tf.data.AUTOTUNE
+        )
+
+    def _teacher_inputs(frame):
+        if stored_features:
+            return labeled_path_slices(frame, label_encoder).map(
+                load_and_preprocess, num_parallel_calls=tf.data.AUTOTUNE
+            ).map(lambda inputs, _: inputs)
+        return _clips(frame).map(
+            lambda w: extractor.model_inputs(w, config["IMG_HEIGHT"], config["IMG_WIDTH"], config["FIXED_1D_LENGTH"]),
+            num_parallel_calls=tf.data.AUTOTUNE
+        )
+
+    def _teacher_probabilities(frame):
+        return teacher.predict(_teacher_inputs(frame).batch(batch_size).prefetch(tf.data.AUTOTUNE), verbose=0)
+
+    def _student_dataset(frame, targets, shuffle=False):
+        frames = _clips(frame).map(lambda w: frame_features(extractor, w, num_frames), num_parallel_calls=tf.data.AUTOTUNE)
+        # The features are deterministic, so they are computed once and kept in memory
+        dataset = tf.data.Dataset.zip((frames.cache(), tf.data.Dataset.from_tensor_slices(targets.astype(np.float32))))
+        if shuffle:
+            dataset = dataset.shuffle(len(frame), seed=42, reshuffle_each_iteration=True)
+        return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+    def _targets(frame, teacher_probs):
+        one_hot = tf.keras.utils.to_categorical(frame["emotion_encoded"], num_classes=num_classes)
+        return np.hstack([one_hot, soften(teacher_probs, temperature)])
+
+    print(f"Scoring {len(train_df) + len(val_df)} clips with the teacher...")
+    train_ds = _student_dataset(train_df, _targets(train_df, _teacher_probabilities(train_df)), shuffle=True)
+    val_ds = _student_dataset(val_df, _targets(val_df, _teacher_probabilities(val_df)))
+
+    normalizer = layers.Normalization(axis=-1)
+    normalizer.adapt(train_ds.map(lambda frames, _: frames))
+    student = build_student_model(num_frames, num_classes, normalizer)
+    student.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=config["LEARNING_RATE"]),
+        loss=distillation_loss(num_classes, temperature, config.get("DISTILL_ALPHA", 0.1)),
+        metrics=[hard_accuracy(num_classes)]
+    )
+    student.fit(
+        train_ds,
+        validation_data=val_ds,
+        epochs=config.get("DISTILL_EPOCHS", config["EPOCHS"]),
+        callbacks=[tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=10, restore_best_weights=True)]
+    )
+
+    # Deployable student: probabilities like the teacher
+    deployed = Model(student.inputs, layers.Softmax(dtype="float32")(student.outputs[0]), name="student")
+    student_path = config.get("STUDENT_PATH", "student_model.keras")
+    deployed.save(student_path)
+
+    labels = test_df["emotion_encoded"].values
+    teacher_accuracy = float(np.mean(_teacher_probabilities(test_df).argmax(axis=1) == labels))
+    test_frames = _student_dataset(test_df, np.zeros((len(test_df), 2 * num_classes)))
+    student_accuracy = float(np.mean(deployed.predict(test_frames, verbose=0).argmax(axis=1) == labels))
+
+    waveform = read_fn(test_df["clip_id"].values[0])
+    teacher_sample = {
+        name: tensor[tf.newaxis].numpy() for name, tensor in next(iter(_teacher_inputs(test_df.iloc[:1]))).items()
+    }
+    student_sample = frame_features(extractor, waveform, num_frames)[tf.newaxis].numpy()
+    teacher_ms = measure_latency(lambda x: teacher(x, training=False), teacher_sample)["median_ms"]
+    student_ms = measure_latency(lambda x: deployed({"frames_input": x}, training=False), student_sample)["median_ms"]
+
+    report = {
+        "teacher": {"params": teacher.count_params(), "latency_ms": teacher_ms, "accuracy": teacher_accuracy},
+        "student": {
+            "params": deployed.count_params(), "size_mb": os.path.getsize(student_path) / 1e6,
+            "latency_ms": student_ms, "accuracy": student_accuracy,
+        },
+    }
+    retained = student_accuracy / teacher_accuracy if teacher_accuracy > 0 else float("nan")
+    print(f"\n--- Distillation ({len(test_df)} test clips, batch size 1, CPU) ---")
+    print(f"{'model':<10}{'params':>12}{'latency (ms)':>14}{'accuracy':>10}")
+    for name, r in report.items():
+        print(f"{name:<10}{r['params']:>12,}{r['latency_ms']:>14.2f}{r['accuracy']:>10.4f}")
+    print(
+        f"Student: {report['student']['size_mb']:.2f} MB at {student_path}, "
+        f"{teacher_ms / student_ms:.1f}x faster, {retained:.1%} of the teacher's accuracy retained"
+    )
+    print("---------------------------------------------------------\n")
+    return report
+
+
+if __name__ == '__main__':
+    distill(load_config())
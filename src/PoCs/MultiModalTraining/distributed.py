@@ -0,0 +1,374 @@
+"""
+Data-parallel training of the multimodal model over several local worker processes.
+
+One TensorFlow runtime does not use a many-core CPU node well, so train_distributed
+launches DISTRIBUTED_WORKERS copies of this module, each with its share of the cores,
+joined by tf.distribute.MultiWorkerMirroredStrategy over localhost. Every worker reads
+only its shard of the files and gradients are all-reduced after each step.
+
+Keras 3's model.fit cannot consume MultiWorkerMirroredStrategy datasets, so workers
+run a small custom loop that mirrors train.main: the same loss, early stopping,
+learning-rate reduction on plateau and best-model checkpoint (written by worker 0).
+Validation and test are one finite pass over every row, padded to whole global batches
+and masked, so their metrics match those of the single-process run. JIT_COMPILE
+compiles each replica's forward and backward pass with XLA; the gradient all-reduce
+stays outside the compiled function.
+
+Usage: python -m src.PoCs.MultiModalTraining.distributed --workers 4
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import numpy as np
+from src.utils.utils import load_config
+
+WORKER_FLAG = "--worker"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def find_free_ports(count):
+    """Asks the OS for `count` free localhost ports."""
+    sockets = [socket.socket() for _ in range(count)]
+    try:
+        for s in sockets:
+            s.bind(("localhost", 0))
+        return [s.getsockname()[1] for s in sockets]
+    finally:
+        for s in sockets:
+            s.close()
+
+
+def build_tf_config(ports, index):
+    """TF_CONFIG for worker `index` of a localhost cluster."""
+    return json.dumps({
+        "cluster": {"worker": [f"localhost:{port}" for port in ports]},
+        "task": {"type": "worker", "index": index},
+    })
+
+
+def scaled_hyperparameters(config, num_workers):
+    """
+    Returns the global batch size and learning rate for num_workers workers.
+
+    By default the global batch stays BATCH_SIZE (each worker takes BATCH_SIZE / num_workers)
+    and the learning rate is unchanged, so training follows the single-process run.
+    With DISTRIBUTED_SCALE_BATCH, every worker keeps BATCH_SIZE, the global batch grows
+    num_workers times and the learning rate is scaled linearly with it.
+    """
+    if config.get("DISTRIBUTED_SCALE_BATCH", False):
+        return config["BATCH_SIZE"] * num_workers, config["LEARNING_RATE"] * num_workers
+    if config["BATCH_SIZE"] % num_workers:
+        raise ValueError(f"BATCH_SIZE {config['BATCH_SIZE']} is not divisible by {num_workers} workers.")
+    return config["BATCH_SIZE"], config["LEARNING_RATE"]
+
+
+def launch_local_workers(num_workers, log_dir=os.path.join("logs", "distributed")):
+    """
+    Starts num_workers training processes on this host and waits for them.
+
+    Each worker gets an equal share of the cores for its TensorFlow thread pools. Worker 0
+    prints to this console; the others log to log_dir/worker_<i>.log. If any worker fails,
+    the rest are stopped, since they would otherwise wait forever on the collectives.
+
+    Returns:
+        0 on success, otherwise the exit code of the first worker that failed.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    ports = find_free_ports(num_workers)
+    threads = str(max(1, (os.cpu_count() or 1) // num_workers))
+
+    processes, logs = [], []
+    for index in range(num_workers):
+        env = dict(
+            os.environ,
+            TF_CONFIG=build_tf_config(ports, index),
+            TF_NUM_INTRAOP_THREADS=threads,
+            TF_NUM_INTEROP_THREADS="1",
+            OMP_NUM_THREADS=threads,
+            # Workers import the src package regardless of the launcher's working directory
+            PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])),
+        )
+        output = None
+        if index > 0:
+            output = open(os.path.join(log_dir, f"worker_{index}.log"), "w", encoding="utf-8")
+            logs.append(output)
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "src.PoCs.MultiModalTraining.distributed", WORKER_FLAG],
+            env=env, stdout=output, stderr=subprocess.STDOUT if output else None,
+        ))
+    print(f"Launched {num_workers} workers ({threads} threads each), logs in {log_dir}")
+
+    exit_code = 0
+    try:
+        while any(p.poll() is None for p in processes):
+            failed = [p for p in processes if p.poll() not in (None, 0)]
+            if failed:
+                exit_code = failed[0].returncode
+                print(f"A worker exited with code {exit_code}; stopping the others.")
+                for p in processes:
+                    if p.poll() is None:
+                        p.terminate()
+                for p in processes:
+                    try:
+                        p.wait(timeout=30)
+                    except subprocess.TimeoutExpired:
+                        # A worker blocked inside a collective may not react to SIGTERM
+                        p.kill()
+                break
+            time.sleep(1)
+        for p in processes:
+            p.wait()
+            if exit_code == 0 and p.returncode:
+                exit_code = p.returncode
+    finally:
+        for output in logs:
+            output.close()
+    return exit_code
+
+
+class PlateauMonitor:
+    """
+    Tracks val_loss like the EarlyStopping and ReduceLROnPlateau callbacks in train.main
+    (stop after 10 epochs without improvement, multiply the learning rate by 0.2 after 5).
+    """
+
+    def __init__(self, stop_patience=10, lr_patience=5, lr_factor=0.2, min_lr=1e-6):
+        self.stop_patience = stop_patience
+        self.lr_patience = lr_patience
+        self.lr_factor = lr_factor
+        self.min_lr = min_lr
+        self.best_loss = np.inf
+        self.stale_epochs = 0
+        self.plateau_epochs = 0
+
+    def update(self, val_loss, learning_rate):
+        """
+        Returns (improved, new learning rate or None, stop).
+        """
+        if val_loss < self.best_loss:
+            self.best_loss, self.stale_epochs, self.plateau_epochs = val_loss, 0, 0
+            return True, None, False
+
+        self.stale_epochs += 1
+        self.plateau_epochs += 1
+        new_lr = None
+        if self.plateau_epochs >= self.lr_patience:
+            new_lr = max(learning_rate * self.lr_factor, self.min_lr)
+            self.plateau_epochs = 0
+        return False, new_lr, self.stale_epochs >= self.stop_patience
+
+
+def make_step_functions(strategy, model, optimizer, global_batch, jit_compile=False):
+    """
+    Builds the distributed train and eval steps. Each takes an iterator over a distributed
+    dataset and runs one batch on every replica.
+
+    The train step returns the all-reduced mean loss and the number of correct predictions
+    in the global batch. The eval step consumes (inputs, label, weight) batches (see
+    create_sharded_eval_dataset) and returns the summed loss, correct predictions and
+    weight of the rows, so padding rows count for nothing.
+    """
+    import tensorflow as tf  # type: ignore
+
+    def _batch_stats(labels, predictions):
+        per_example = tf.keras.losses.categorical_crossentropy(labels, predictions)
+        correct = tf.cast(tf.equal(tf.argmax(labels, -1), tf.argmax(predictions, -1)), tf.float32)
+        return per_example, correct
+
+    @tf.function(jit_compile=jit_compile)
+    def _gradients(inputs, labels):
+        with tf.GradientTape() as tape:
+            per_example, correct = _batch_stats(labels, model(inputs, training=True))
+            # Scaled by the global batch, so summing over replicas gives the mean loss
+            loss = tf.nn.compute_average_loss(per_example, global_batch_size=global_batch)
+        return loss, tf.reduce_sum(correct), tape.gradient(loss, model.trainable_variables)
+
+    @tf.function(jit_compile=jit_compile)
+    def _evaluate(inputs, labels, weights):
+        per_example, correct = _batch_stats(labels, model(inputs, training=False))
+        return tf.reduce_sum(per_example * weights), tf.reduce_sum(correct * weights), tf.reduce_sum(weights)
+
+    @tf.function
+    def train_step(iterator):
+        def _step(inputs, labels):
+            loss, correct, gradients = _gradients(inputs, labels)
+            optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+            return loss, correct
+
+        loss, correct = strategy.run(_step, args=next(iterator))
+        return strategy.reduce("SUM", loss, axis=None), strategy.reduce("SUM", correct, axis=None)
+
+    @tf.function
+    def eval_step(iterator):
+        totals = strategy.run(_evaluate, args=next(iterator))
+        return tuple(strategy.reduce("SUM", total, axis=None) for total in totals)
+
+    return train_step, eval_step
+
+
+def run_epoch(step_fn, iterator, steps, global_batch):
+    """Runs `steps` steps and returns the mean loss and accuracy."""
+    total_loss, total_correct = 0.0, 0.0
+    for _ in range(steps):
+        loss, correct = step_fn(iterator)
+        total_loss += float(loss)
+        total_correct += float(correct)
+    return total_loss / steps, total_correct / (steps * global_batch)
+
+
+def evaluate(step_fn, iterator, steps):
+    """Runs a finite evaluation pass and returns the mean loss and accuracy over its unpadded rows."""
+    total_loss, total_correct, total_weight = 0.0, 0.0, 0.0
+    for _ in range(steps):
+        loss, correct, weight = step_fn(iterator)
+        total_loss += float(loss)
+        total_correct += float(correct)
+        total_weight += float(weight)
+    return total_loss / total_weight, total_correct / total_weight
+
+
+def run_worker(config):
+    """
+    Trains one data-parallel replica. Must run with TF_CONFIG set (see launch_local_workers).
+
+    Returns:
+        The per-epoch history as a dict of lists.
+    """
+    import tensorflow as tf  # type: ignore
+    from src.PoCs.MultiModalTraining.data_loader import (
+        create_sharded_dataset,
+        create_sharded_eval_dataset,
+        fit_numerical_scalers,
+        load_labeled_dataframe,
+        split_dataframe,
+    )
+    from src.PoCs.MultiModalTraining.feature_augment import feature_augmenter
+    from src.PoCs.MultiModalTraining.model_zoo import build_model
+    from src.PoCs.MultiModalTraining.train import configure_precision
+    from sklearn.preprocessing import LabelEncoder  # type: ignore
+
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+    num_workers = strategy.num_replicas_in_sync
+    is_chief = strategy.cluster_resolver.task_id == 0
+    log = print if is_chief else (lambda *args, **kwargs: None)
+
+    global_batch, learning_rate = scaled_hyperparameters(config, num_workers)
+    per_replica_batch = global_batch // num_workers
+    log(f"{num_workers} workers | global batch {global_batch} ({per_replica_batch} per worker) | lr {learning_rate:g}")
+
+    # Every worker derives the same splits and scalers (fixed seeds), so no state has to be sent around
+    df = load_labeled_dataframe(config["FEATURES_DIR"])
+    label_encoder = LabelEncoder()
+    df["emotion_encoded"] = label_encoder.fit_transform(df["emotion"])
+    train_df, val_df, test_df = split_dataframe(df)
+    zcr_scaler, rms_scaler = fit_numerical_scalers(train_df, config["FIXED_1D_LENGTH"])
+    num_classes = len(label_encoder.classes_)
+
+    def _distribute_train():
+        def _dataset_fn(context):
+            return create_sharded_dataset(
+                train_df, label_encoder, context.get_per_replica_batch_size(global_batch),
+                context.num_input_pipelines, context.input_pipeline_id, augment_fn=feature_augmenter(config),
+            )
+        # Every step consumes exactly one global batch, so all workers stay in lockstep
+        steps = max(1, len(train_df) // global_batch)
+        return iter(strategy.distribute_datasets_from_function(_dataset_fn)), steps
+
+    def _distribute_eval(part_df):
+        def _dataset_fn(context):
+            return create_sharded_eval_dataset(
+                part_df, label_encoder, context.get_per_replica_batch_size(global_batch),
+                context.num_input_pipelines, context.input_pipeline_id,
+            )[0]
+        steps = -(-len(part_df) // global_batch)
+        # Iterated afresh for every pass, since the dataset does not repeat
+        return strategy.distribute_datasets_from_function(_dataset_fn), steps
+
+    configure_precision(config)
+    with strategy.scope():
+        model = build_model(
+            config.get("MODEL_NAME", "resnet50"),
+            img_shape=(config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"]),
+            numerical_shape=(config["FIXED_1D_LENGTH"] * 2,),
+            num_classes=num_classes,
+            zcr_scaler=zcr_scaler,
+            rms_scaler=rms_scaler
+        )
+        optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+        optimizer.build(model.trainable_variables)
+
+    jit_compile = config.get("JIT_COMPILE", False)
+    train_step, eval_step = make_step_functions(strategy, model, optimizer, global_batch, jit_compile)
+    log(f"XLA jit_compile: {jit_compile}")
+
+    train_iter, train_steps = _distribute_train()
+    val_data, val_steps = _distribute_eval(val_df)
+
+    history = {"loss": [], "accuracy": [], "val_loss": [], "val_accuracy": [], "epoch_s": []}
+    monitor, best_weights, current_lr = PlateauMonitor(), None, learning_rate
+    log("\n--- Starting Distributed Training ---")
+    for epoch in range(config["EPOCHS"]):
+        start = time.perf_counter()
+        loss, accuracy = run_epoch(train_step, train_iter, train_steps, global_batch)
+        epoch_s = time.perf_counter() - start
+        val_loss, val_accuracy = evaluate(eval_step, iter(val_data), val_steps)
+        for key, value in zip(history, (loss, accuracy, val_loss, val_accuracy, epoch_s)):
+            history[key].append(value)
+        log(
+            f"Epoch {epoch + 1}/{config['EPOCHS']} - {epoch_s:.1f}s - loss: {loss:.4f} - accuracy: {accuracy:.4f}"
+            f" - val_loss: {val_loss:.4f} - val_accuracy: {val_accuracy:.4f}"
+        )
+
+        # val_loss is all-reduced, so every worker takes the same decisions below
+        improved, new_lr, stop = monitor.update(val_loss, current_lr)
+        if improved:
+            best_weights = model.get_weights()
+            if is_chief:
+                model.save("best_model.keras")
+        if new_lr is not None:
+            current_lr = new_lr
+            optimizer.learning_rate.assign(new_lr)
+            log(f"Reducing learning rate to {new_lr:g}")
+        if stop:
+            log("Early stopping.")
+            break
+
+    if best_weights is not None:
+        model.set_weights(best_weights)
+    log("--- Distributed Training Finished ---\n")
+
+    test_data, test_steps = _distribute_eval(test_df)
+    test_loss, test_accuracy = evaluate(eval_step, iter(test_data), test_steps)
+    log(f"Test Loss: {test_loss:.4f}")
+    log(f"Test Accuracy: {test_accuracy:.4f}")
+    history["test_loss"], history["test_accuracy"] = test_loss, test_accuracy
+    return history
+
+
+def train_distributed(num_workers=None, config=None):
+    """
+    Runs data-parallel training with num_workers local processes (default: DISTRIBUTED_WORKERS or 2).
+    """
+    config = config or load_config()
+    num_workers = num_workers or config.get("DISTRIBUTED_WORKERS", 2)
+    return launch_local_workers(num_workers, config.get("DISTRIBUTED_LOG_DIR", os.path.join("logs", "distributed")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Data-parallel training over local worker processes.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: DISTRIBUTED_WORKERS or 2).")
+    parser.add_argument(WORKER_FLAG, action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(load_config())
+        return 0
+    return train_distributed(args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import argparse
+import time
+import numpy as np
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.checkpoint import load_trained_model
+from src.PoCs.MultiModalTraining.data_loader import load_class_names
+from src.PoCs.MultiModalTraining.infer import parity_report, reference_probabilities
+from src.PoCs.MultiModalTraining.tf_features import TFFeatureExtractor
+from src.utils.resampling import CANONICAL_SAMPLE_RATE
+from src.utils.utils import load_config
+
+
+class ServingModule(tf.Module):
+    """
+    Wraps the trained model with the in-graph feature front-end and label decoding.
+
+    The exported signature takes one clip of raw mono float PCM in [-1, 1] at the sample
+    rate the module was built for, and returns the predicted label, the class
+    probabilities and the class names. Everything between the waveform and the label
+    runs in the TensorFlow graph.
+    """
+
+    def __init__(self, model, classes, config, sr):
+        super().__init__()
+        self.model = model
+        self.extractor = TFFeatureExtractor(sr)
+        self.classes = tf.constant(list(classes))
+        self.img_height = config["IMG_HEIGHT"]
+        self.img_width = config["IMG_WIDTH"]
+        self.length = config["FIXED_1D_LENGTH"]
+
+    @tf.function(input_signature=[tf.TensorSpec([None], tf.float32, name="waveform")])
+    def serve(self, waveform):
+        inputs = self.extractor.model_inputs(waveform, self.img_height, self.img_width, self.length)
+        probabilities = self.model({name: tensor[tf.newaxis] for name, tensor in inputs.items()}, training=False)[0]
+        return {
+            "label": tf.gather(self.classes, tf.argmax(probabilities)),
+            "probabilities": probabilities,
+            "classes": self.classes,
+        }
+
+
+def export_serving_model(model, classes, config, output_dir, sr):
+    """
+    Exports the model and its preprocessing as one SavedModel with a "serving_default"
+    signature mapping a waveform at `sr` Hz to {label, probabilities, classes}.
+    """
+    module = ServingModule(model, classes, config, sr)
+    tf.saved_model.save(module, output_dir, signatures={"serving_default": module.serve})
+    print(f"Serving model ({sr} Hz input, {len(classes)} classes) saved to {output_dir}")
+    return output_dir
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export a SavedModel that classifies raw waveforms.")
+    parser.add_argument("--model", default=None, help="Keras model or lean checkpoint (default: MODEL_PATH).")
+    parser.add_argument("-o", "--output", default=None, help="SavedModel folder (default: SERVING_DIR or serving_model).")
+    parser.add_argument(
+        "--sample-rate", type=int, default=None,
+        help="Input sample rate (default: SERVE_SAMPLE_RATE, else CANONICAL_SAMPLE_RATE, the training features' rate)."
+    )
+    parser.add_argument(
+        "--check", nargs="*", default=[],
+        help="Audio files to classify with the exported model; its predictions are compared with the training features'."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import librosa  # type: ignore
+
+    args = parse_args(argv)
+    config = load_config()
+    canonical_sr = config.get("CANONICAL_SAMPLE_RATE", CANONICAL_SAMPLE_RATE)
+    sr = args.sample_rate or config.get("SERVE_SAMPLE_RATE", canonical_sr)
+    if sr != canonical_sr:
+        print(
+            f"Warning: serving at {sr} Hz, but the features were trained at {canonical_sr} Hz; "
+            "resample clients to the canonical rate for matching predictions."
+        )
+    output_dir = args.output or config.get("SERVING_DIR", "serving_model")
+
+    model, classes = load_trained_model(args.model or config.get("MODEL_PATH", "best_model.keras"))
+    classes = classes or load_class_names(config["FEATURES_DIR"])
+    export_serving_model(model, classes, config, output_dir, sr)
+
+    # Reload as a plain SavedModel: no project code or Python preprocessing involved
+    serve = tf.saved_model.load(output_dir).signatures["serving_default"]
+    served = []
+    for path in args.check:
+        waveform, _ = librosa.load(path, sr=sr, mono=True)
+        start = time.perf_counter()
+        result = serve(waveform=tf.constant(waveform))
+        elapsed = (time.perf_counter() - start) * 1000
+        label = result["label"].numpy().decode()
+        served.append(result["probabilities"].numpy())
+        print(f"{path}: {label} (p={np.max(served[-1]):.3f}, {elapsed:.1f} ms)")
+
+    # The graph renders the images without matplotlib and JPEG, so measure what that costs
+    if args.check:
+        reference = reference_probabilities(model.predict_on_batch, args.check, config)
+        parity_report(reference, np.stack(served), "Serving graph")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+import os
+import time
+import numpy as np
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.data_loader import get_data_loaders
+from src.utils.utils import load_config
+
+# "float32" is a plain conversion kept as a reference point for the quantized builds
+QUANTIZATION_MODES = ("float32", "dynamic", "int8")
+
+
+def representative_dataset(train_ds, num_samples=200):
+    """
+    Returns a generator function that yields single training samples for int8 calibration.
+    Samples are keyed by input name so they reach the right model input.
+    """
+    def _generator():
+        for inputs, _ in train_ds.unbatch().take(num_samples):
+            yield {name: np.expand_dims(tensor.numpy(), 0) for name, tensor in inputs.items()}
+
+    return _generator
+
+
+def convert_to_tflite(model, mode, representative_data=None):
+    """
+    Converts a Keras model to a TFLite flatbuffer.
+
+    Args:
+        model: The trained Keras model.
+        mode (str): "float32" (no quantization), "dynamic" (int8 weights, float activations)
+                    or "int8" (int8 weights and activations, float input/output).
+        representative_data: Generator function used to calibrate activation ranges, required for "int8".
+
+    Returns:
+        The serialized TFLite model as bytes.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode '{mode}'. Expected one of {QUANTIZATION_MODES}.")
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if mode in ("dynamic", "int8"):
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == "int8":
+        if representative_data is None:
+            raise ValueError("Full int8 quantization needs a representative dataset.")
+        converter.representative_dataset = representative_data
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    return converter.convert()
+
+
+def export_tflite_models(model, train_ds, config, modes=QUANTIZATION_MODES):
+    """
+    Converts the model once per quantization mode and writes each build to TFLITE_DIR
+    (default "tflite") as model_<mode>.tflite.
+
+    Returns:
+        A dict mapping each mode to the path of its .tflite file.
+    """
+    output_dir = config.get("TFLITE_DIR", "tflite")
+    os.makedirs(output_dir, exist_ok=True)
+    representative_data = representative_dataset(train_ds, config.get("TFLITE_CALIBRATION_SAMPLES", 200))
+
+    paths = {}
+    for mode in modes:
+        print(f"Converting to TFLite ({mode})...")
+        tflite_model = convert_to_tflite(model, mode, representative_data)
+        path = os.path.join(output_dir, f"model_{mode}.tflite")
+        with open(path, "wb") as f:
+            f.write(tflite_model)
+        paths[mode] = path
+        print(f"Saved {path} ({len(tflite_model) / 1e6:.1f} MB)")
+    return paths
+
+
+class TFLiteRunner:
+    """
+    Runs a TFLite build of the multimodal model on CPU.
+    Inputs are passed as the same dict the tf.data loaders produce.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.runner = self.interpreter.get_signature_runner()
+
+    def predict(self, inputs):
+        """Returns the class probabilities for a batch of inputs."""
+        feed = {name: np.asarray(value, dtype=np.float32) for name, value in inputs.items()}
+        outputs = self.runner(**feed)
+        return next(iter(outputs.values()))
+
+
+def measure_latency(predict_fn, inputs, runs=50, warmup=5):
+    """
+    Times repeated calls of predict_fn on the same inputs.
+    Returns the median and 95th percentile latency in milliseconds.
+    """
+    for _ in range(warmup):
+        predict_fn(inputs)
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        predict_fn(inputs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": float(np.median(timings)), "p95_ms": float(np.percentile(timings, 95))}
+
+
+def evaluate_accuracy(predict_fn, test_ds):
+    """Computes top-1 accuracy of predict_fn over a batched test dataset."""
+    correct, total = 0, 0
+    for inputs, labels in test_ds:
+        probabilities = predict_fn({name: tensor.numpy() for name, tensor in inputs.items()})
+        correct += int(np.sum(np.argmax(probabilities, axis=1) == np.argmax(labels.numpy(), axis=1)))
+        total += len(labels)
+    return correct / max(total, 1)
+
+
+def benchmark_tflite(config, keras_model_path="best_model.keras"):
+    """
+    Exports the trained model to TFLite and compares every build against the Keras model
+    on single-sample CPU latency, on-disk size and test accuracy.
+    """
+    # Calibration needs the real input distribution, so no feature augmentation
+    train_ds, _, test_ds, _, _, _ = get_data_loaders(
+        features_dir=config["FEATURES_DIR"],
+        batch_size=config["BATCH_SIZE"],
+        augment=False
+    )
+    model = tf.keras.models.load_model(keras_model_path)
+    paths = export_tflite_models(model, train_ds, config)
+    num_threads = config.get("TFLITE_NUM_THREADS")
+
+    sample_inputs, _ = next(iter(test_ds.unbatch().batch(1)))
+    sample_inputs = {name: tensor.numpy() for name, tensor in sample_inputs.items()}
+
+    def _keras_predict(inputs):
+        return model(inputs, training=False).numpy()
+
+    results = [{
+        "variant": "keras",
+        "size_mb": os.path.getsize(keras_model_path) / 1e6,
+        **measure_latency(_keras_predict, sample_inputs),
+        "accuracy": evaluate_accuracy(_keras_predict, test_ds),
+    }]
+    for mode, path in paths.items():
+        runner = TFLiteRunner(path, num_threads=num_threads)
+        results.append({
+            "variant": f"tflite_{mode}",
+            "size_mb": os.path.getsize(path) / 1e6,
+            **measure_latency(runner.predict, sample_inputs),
+            "accuracy": evaluate_accuracy(runner.predict, test_ds),
+        })
+
+    print("\n--- TFLite Benchmark (batch size 1, CPU) ---")
+    print(f"{'variant':<16}{'size (MB)':>11}{'median (ms)':>13}{'p95 (ms)':>10}{'accuracy':>10}")
+    for r in results:
+        print(f"{r['variant']:<16}{r['size_mb']:>11.1f}{r['median_ms']:>13.2f}{r['p95_ms']:>10.2f}{r['accuracy']:>10.4f}")
+    print("---------------------------------------------\n")
+    return results
+
+
+if __name__ == '__main__':
+    benchmark_tflite(load_config())
@@ -0,0 +1,178 @@
+import time
+import numpy as np
+import tensorflow as tf  # type: ignore
+from src.utils.utils import load_config
+
+# Defaults for FEATURE_AUGMENT_SETTINGS. Widths and the warp are fractions of the axis
+# length, so they mean the same at any IMG_HEIGHT/IMG_WIDTH/FIXED_1D_LENGTH.
+DEFAULT_SETTINGS = {
+    "FREQ_MASKS": 2,         # frequency bands masked per image
+    "FREQ_MASK_WIDTH": 0.15,  # widest band, as a fraction of the image height
+    "TIME_MASKS": 2,         # time spans masked per sample
+    "TIME_MASK_WIDTH": 0.1,  # longest span, as a fraction of the time axis
+    "TIME_WARP": 0.1,        # largest shift of the warp point, as a fraction of the time axis
+    "GAIN_DB": 6.0,          # RMS gain jitter range, +/- dB
+}
+
+
+def band_mask(batch_size, length, num_masks, max_width):
+    """
+    Draws `num_masks` random bands per sample, each up to `max_width` * length wide.
+
+    Returns:
+        A (batch_size, length) float tensor, 0 inside a band and 1 elsewhere.
+    """
+    length_f = tf.cast(length, tf.float32)
+    widths = tf.floor(tf.random.uniform([batch_size, num_masks]) * (max_width * length_f + 1))
+    starts = tf.floor(tf.random.uniform([batch_size, num_masks]) * (length_f - widths + 1))
+    positions = tf.range(length_f)[tf.newaxis, tf.newaxis]
+    inside = (positions >= starts[..., tf.newaxis]) & (positions < (starts + widths)[..., tf.newaxis])
+    return 1.0 - tf.cast(tf.reduce_any(inside, axis=1), tf.float32)
+
+
+def time_warp_positions(batch_size, length, max_shift):
+    """
+    SpecAugment-style time warp as a piecewise-linear map: a random point of the time axis
+    moves by up to `max_shift` * length and both sides are stretched to follow it.
+
+    Returns:
+        A (batch_size, length) tensor with the source position of every output step.
+    """
+    last = tf.cast(length, tf.float32) - 1.0
+    center = tf.random.uniform([batch_size, 1], 2 * max_shift, 1 - 2 * max_shift) * last
+    target = center + tf.random.uniform([batch_size, 1], -max_shift, max_shift) * last
+    steps = tf.range(last + 1.0)[tf.newaxis]
+    positions = tf.where(
+        steps < target,
+        steps * center / target,
+        center + (steps - target) * (last - center) / (last - target),
+    )
+    return tf.clip_by_value(positions, 0.0, last)
+
+
+def resample_time(values, positions):
+    """
+    Linearly interpolates `values` (batch, time, ...) at `positions` (batch, time).
+    """
+    length = tf.shape(values)[1]
+    lower = tf.floor(positions)
+    lower_index = tf.cast(lower, tf.int32)
+    upper_index = tf.minimum(lower_index + 1, length - 1)
+    weight = positions - lower
+    weight = tf.reshape(weight, tf.concat([tf.shape(weight), tf.ones([tf.rank(values) - 2], tf.int32)], axis=0))
+    below = tf.gather(values, lower_index, batch_dims=1)
+    above = tf.gather(values, upper_index, batch_dims=1)
+    return below + (above - below) * weight
+
+
+def augment_images(images, time_positions, time_mask, settings):
+    """
+    Warps and masks a (batch, frequency, time, channels) batch of feature images.
+    Masked cells are set to 0, which is the ImageNet mean after ResNet preprocessing.
+    """
+    batch_size, height = tf.shape(images)[0], tf.shape(images)[1]
+    images = tf.transpose(resample_time(tf.transpose(images, [0, 2, 1, 3]), time_positions), [0, 2, 1, 3])
+    freq_mask = band_mask(batch_size, height, settings["FREQ_MASKS"], settings["FREQ_MASK_WIDTH"])
+    return images * freq_mask[:, :, tf.newaxis, tf.newaxis] * time_mask[:, tf.newaxis, :, tf.newaxis]
+
+
+def augment_numerical(numerical, settings):
+    """
+    Warps, masks and gain-jitters a (batch, 2 * length) batch of [ZCR | RMS] vectors.
+    Both halves share the warp and the masks; the gain only scales RMS, as ZCR does not depend on level.
+    """
+    batch_size = tf.shape(numerical)[0]
+    frames = tf.transpose(tf.reshape(numerical, [batch_size, 2, -1]), [0, 2, 1])
+    length = tf.shape(frames)[1]
+    if settings["TIME_WARP"] > 0:
+        frames = resample_time(frames, time_warp_positions(batch_size, length, settings["TIME_WARP"]))
+    frames *= band_mask(batch_size, length, settings["TIME_MASKS"], settings["TIME_MASK_WIDTH"])[..., tf.newaxis]
+    gain_db = tf.random.uniform([batch_size, 1], -settings["GAIN_DB"], settings["GAIN_DB"])
+    frames *= tf.stack([tf.ones_like(gain_db), tf.pow(10.0, gain_db / 20.0)], axis=-1)
+    return tf.reshape(tf.transpose(frames, [0, 2, 1]), [batch_size, -1])
+
+
+def augment_batch(inputs, labels, settings):
+    """
+    Applies random time warping, time/frequency masking and gain jitter to one batch of
+    model inputs, with every sample drawing its own parameters. Meant for a dataset map
+    after .batch(), so all of it runs as a few vectorized ops per batch.
+
+    The two images share one warp and one set of time masks, since their time axes cover
+    the same clip; they get independent frequency masks. No gain is applied to the images:
+    dd-MFCC (second-order deltas of log-mel cepstra) and per-frame normalized chroma do not
+    change with level. Inputs other than the images and numerical_input pass through.
+    """
+    inputs = dict(inputs)
+    images = [name for name in ("mfcc_input", "chroma_input") if name in inputs]
+    if images:
+        batch_size, width = tf.shape(inputs[images[0]])[0], tf.shape(inputs[images[0]])[2]
+        if settings["TIME_WARP"] > 0:
+            time_positions = time_warp_positions(batch_size, width, settings["TIME_WARP"])
+        else:
+            time_positions = tf.tile(tf.range(tf.cast(width, tf.float32))[tf.newaxis], [batch_size, 1])
+        time_mask = band_mask(batch_size, width, settings["TIME_MASKS"], settings["TIME_MASK_WIDTH"])
+        for name in images:
+            inputs[name] = augment_images(inputs[name], time_positions, time_mask, settings)
+    if "numerical_input" in inputs:
+        inputs["numerical_input"] = augment_numerical(inputs["numerical_input"], settings)
+    return inputs, labels
+
+
+def feature_augmenter(config):
+    """
+    Returns the batch map function for the training set when FEATURE_AUGMENT is enabled,
+    or None. FEATURE_AUGMENT_SETTINGS overrides entries of DEFAULT_SETTINGS.
+    """
+    if not config.get("FEATURE_AUGMENT", False):
+        return None
+    settings = {**DEFAULT_SETTINGS, **config.get("FEATURE_AUGMENT_SETTINGS", {})}
+    unknown = set(settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown FEATURE_AUGMENT_SETTINGS: {sorted(unknown)}")
+    # The warp point is drawn from [2 * TIME_WARP, 1 - 2 * TIME_WARP], which is empty from 0.25 up
+    if not 0 <= settings["TIME_WARP"] < 0.25:
+        raise ValueError(f"FEATURE_AUGMENT_SETTINGS TIME_WARP must be in [0, 0.25), got {settings['TIME_WARP']}")
+    return lambda inputs, labels: augment_batch(inputs, labels, settings)
+
+
+def compare_augmentation_cost(config, batch_size=32, seconds=3.0, sr=16000, repeats=10):
+    """
+    Times one augmented view per clip with the waveform transforms of data_augmentation
+    (every combination, then re-extracting the features) against augment_batch on a batch
+    of model inputs, on a synthetic clip. Returns the CPU milliseconds per clip of both.
+    """
+    from src.data_augmentation import COMBINATIONS, aplly_transforms
+    from src.utils.extract_lib import compute_features
+
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    clip = (0.3 * np.sin(2 * np.pi * 220 * t) + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+    start = time.process_time()
+    for combination in COMBINATIONS:
+        compute_features(aplly_transforms(clip, sr, "F", 0, combination).astype(np.float32), sr)
+    waveform_ms = (time.process_time() - start) * 1000 / len(COMBINATIONS)
+
+    shape = (batch_size, config["IMG_HEIGHT"], config["IMG_WIDTH"], config["NUM_CHANNELS"])
+    inputs = {
+        "mfcc_input": tf.random.normal(shape),
+        "chroma_input": tf.random.normal(shape),
+        "numerical_input": tf.random.uniform((batch_size, config["FIXED_1D_LENGTH"] * 2)),
+    }
+    augment = tf.function(feature_augmenter({**config, "FEATURE_AUGMENT": True}))
+    augment(inputs, tf.zeros([batch_size]))
+    start = time.process_time()
+    for _ in range(repeats):
+        augment(inputs, tf.zeros([batch_size]))
+    feature_ms = (time.process_time() - start) * 1000 / (repeats * batch_size)
+
+    print(f"\n--- Augmentation cost ({seconds:.0f} s clip, CPU time per augmented clip) ---")
+    print(f"Waveform transforms + feature extraction: {waveform_ms:8.2f} ms")
+    print(f"Feature-level (batched, in tf.data):      {feature_ms:8.3f} ms ({waveform_ms / feature_ms:.0f}x cheaper)")
+    print("-----------------------------------------------------------------------\n")
+    return {"waveform_ms": waveform_ms, "feature_ms": feature_ms}
+
+
+if __name__ == '__main__':
+    compare_augmentation_cost(load_config())
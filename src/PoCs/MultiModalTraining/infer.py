@@ -0,0 +1,210 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import tensorflow as tf  # type: ignore
+from threadpoolctl import threadpool_limits  # type: ignore
+from src.PoCs.MultiModalTraining.cascade import CascadeClassifier
+from src.PoCs.MultiModalTraining.checkpoint import load_lean_checkpoint, load_trained_model
+from src.PoCs.MultiModalTraining.data_loader import decode_image, load_class_names, pad_or_truncate
+from src.PoCs.MultiModalTraining.export_tflite import TFLiteRunner
+from src.utils.extract_lib import encode_clip_features
+from src.utils.utils import load_config
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac")
+
+
+def collect_audio_paths(inputs):
+    """
+    Expands the CLI inputs into a list of audio files.
+    Each input may be a directory (searched recursively), an audio file,
+    or a .txt file listing one audio path per line.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(
+                    os.path.join(root, f) for f in sorted(files) if f.lower().endswith(AUDIO_EXTENSIONS)
+                )
+        elif item.lower().endswith(".txt"):
+            with open(item, "r", encoding="utf-8") as f:
+                paths.extend(line.strip() for line in f if line.strip())
+        else:
+            paths.append(item)
+    return paths
+
+
+def build_batch(prepared, config):
+    """
+    Decodes and stacks clips prepared by extract_lib.encode_clip_features into one batched model input dict.
+    """
+    length = config["FIXED_1D_LENGTH"]
+    return {
+        "mfcc_input": tf.stack([decode_image(p["mfcc_jpeg"], config) for p in prepared]).numpy(),
+        "chroma_input": tf.stack([decode_image(p["chroma_jpeg"], config) for p in prepared]).numpy(),
+        "numerical_input": np.stack([
+            np.concatenate([pad_or_truncate(p["zcr"], length), pad_or_truncate(p["rms"], length)])
+            for p in prepared
+        ]).astype(np.float32),
+    }
+
+
+def reference_probabilities(predict_fn, paths, config):
+    """
+    Scores clips on the exact training inputs (encode_clip_features: matplotlib render and
+    JPEG round trip), in this process. The baseline for parity checks of front-ends that
+    approximate that render, such as the serving graph and the streaming recognizer.
+
+    Returns:
+        A (len(paths), classes) array of probabilities.
+    """
+    prepared = [encode_clip_features(path)[1] for path in paths]
+    failed = [path for path, p in zip(paths, prepared) if p is None]
+    if failed:
+        raise ValueError(f"Could not compute reference features for: {failed}")
+    return np.asarray(predict_fn(build_batch(prepared, config)))
+
+
+def parity_report(reference, candidate, name):
+    """
+    Prints and returns the prediction gap between an approximate front-end (`candidate`
+    probabilities) and the training inputs (`reference`): top-1 agreement and the mean
+    and largest absolute probability difference.
+    """
+    reference, candidate = np.asarray(reference), np.asarray(candidate)
+    diff = np.abs(reference - candidate)
+    report = {
+        "clips": len(reference),
+        "top1_agreement": float(np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1))),
+        "mean_abs_diff": float(diff.mean()),
+        "max_abs_diff": float(diff.max()),
+    }
+    print(
+        f"{name} vs training features on {report['clips']} clips: top-1 agreement {report['top1_agreement']:.1%}, "
+        f"probability gap mean {report['mean_abs_diff']:.4f}, max {report['max_abs_diff']:.4f}"
+    )
+    return report
+
+
+class ResultWriter:
+    """Streams predictions to a CSV or JSONL file as batches complete."""
+
+    def __init__(self, output_path, classes):
+        self.classes = classes
+        self.jsonl = output_path.lower().endswith(".jsonl")
+        self._file = open(output_path, "w", encoding="utf-8", newline="")
+        if not self.jsonl:
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(["path", "label"] + [f"prob_{c}" for c in classes])
+
+    def write(self, paths, probabilities):
+        for path, probs in zip(paths, probabilities):
+            label = self.classes[int(np.argmax(probs))]
+            if self.jsonl:
+                row = {"path": path, "label": label, "probabilities": dict(zip(self.classes, map(float, probs)))}
+                self._file.write(json.dumps(row) + "\n")
+            else:
+                self._csv.writerow([path, label] + [f"{p:.6f}" for p in probs])
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_batch_inference(paths, predict_fn, classes, config, output_path, batch_size=256, workers=None):
+    """
+    Scores every clip in `paths` and streams the results to output_path.
+
+    Feature extraction runs in a process pool (one worker per core by default) while
+    the main process decodes images and runs the model on large batches.
+
+    Returns:
+        The number of clips scored and the throughput in clips per second.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output_path, classes)
+    start = time.perf_counter()
+    scored = 0
+
+    def _flush(batch_paths, batch_prepared):
+        probabilities = np.asarray(predict_fn(build_batch(batch_prepared, config)))
+        writer.write(batch_paths, probabilities)
+        return len(batch_paths)
+
+    print(f"Scoring {len(paths)} clips with {workers} extraction workers, batch size {batch_size}...")
+    # Spawned workers avoid inheriting the parent's TensorFlow runtime, and single-threaded
+    # BLAS in each worker lets the pool itself spread the load over the cores
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=threadpool_limits,
+        initargs=(1,),
+    ) as executor:
+        batch_paths, batch_prepared = [], []
+        for path, prepared in executor.map(encode_clip_features, paths, chunksize=8):
+            if prepared is None:
+                continue
+            batch_paths.append(path)
+            batch_prepared.append(prepared)
+            if len(batch_paths) == batch_size:
+                scored += _flush(batch_paths, batch_prepared)
+                batch_paths, batch_prepared = [], []
+                print(f"  {scored} clips scored ({scored / (time.perf_counter() - start):.1f} clips/s)")
+        if batch_paths:
+            scored += _flush(batch_paths, batch_prepared)
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    throughput = scored / elapsed if elapsed > 0 else 0.0
+    print(f"\nScored {scored}/{len(paths)} clips in {elapsed:.1f}s ({throughput:.1f} clips/s) -> {output_path}")
+    return scored, throughput
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch emotion inference over audio files.")
+    parser.add_argument("inputs", nargs="+", help="Audio files, directories, or .txt files listing audio paths.")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .jsonl).")
+    parser.add_argument(
+        "--model", default=None,
+        help="Keras model file or lean checkpoint folder (default: MODEL_PATH or best_model.keras)."
+    )
+    parser.add_argument("--cascade", default=None, help="Numerical first-stage model (lean checkpoint) for cascade inference.")
+    parser.add_argument("--threshold", type=float, default=0.9, help="Cascade confidence below which clips escalate.")
+    parser.add_argument("--tflite", default=None, help="Use a TFLite build instead of the Keras model.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Prediction batch size.")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction workers (default: all cores).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config()
+
+    # The model is loaded once and reused for every batch
+    cascade = None
+    saved_classes = None
+    if args.tflite:
+        predict_fn = TFLiteRunner(args.tflite).predict
+    else:
+        model, saved_classes = load_trained_model(args.model or config.get("MODEL_PATH", "best_model.keras"))
+        predict_fn = model.predict_on_batch
+        if args.cascade:
+            numerical_model, _ = load_lean_checkpoint(args.cascade)
+            cascade = CascadeClassifier(numerical_model, model, args.threshold)
+            predict_fn = cascade.predict
+
+    # Lean checkpoints record their classes; only fall back to the feature tree without them
+    classes = saved_classes or load_class_names(config["FEATURES_DIR"])
+    paths = collect_audio_paths(args.inputs)
+    run_batch_inference(paths, predict_fn, classes, config, args.output, args.batch_size, args.workers)
+    if cascade is not None:
+        print(f"Cascade: {cascade.escalated}/{cascade.samples} clips escalated to the full model")
+
+
+if __name__ == '__main__':
+    main()
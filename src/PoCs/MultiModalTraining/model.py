@@ -5,6 +5,9 @@ from tensorflow.keras.layers import (  # type: ignore
     GlobalAveragePooling2D,
 )
 from tensorflow.keras.applications import ResNet50  # type: ignore
+from src.PoCs.MultiModalTraining.data_loader import SEQUENCE_PAD_VALUE
+
+RECURRENT_LAYERS = {"rnn": layers.SimpleRNN, "lstm": layers.LSTM, "gru": layers.GRU}
 
 
 def create_visual_branch(input_tensor, name):
@@ -35,15 +38,15 @@ def create_visual_branch(input_tensor, name):
     return x
 
 
-def create_numerical_branch(numerical_input, zcr_scaler, rms_scaler):
+def scale_numerical_features(numerical_input, zcr_scaler, rms_scaler):
     """
-    Builds the branch of the model that processes numerical features.
+    Splits the concatenated [ZCR, RMS] input back into its two parts and standardizes
+    each with its training-set scaler. Returns the scaled ZCR and RMS tensors.
     """
-    # Split the 1024-feature input back into its original 512-feature parts
-    zcr_features = numerical_input[:, :512]  # First 512 features
-    rms_features = numerical_input[:, 512:]  # Last 512 features
+    length = len(zcr_scaler.mean_)
+    zcr_features = numerical_input[:, :length]  # First FIXED_1D_LENGTH features
+    rms_features = numerical_input[:, length:]  # Last FIXED_1D_LENGTH features
 
-    # --- Apply Scaling Separately ---
     # Convert scaler attributes to TensorFlow constants
     zcr_mean = tf.constant(zcr_scaler.mean_, dtype=tf.float32)
     zcr_scale = tf.constant(zcr_scaler.scale_, dtype=tf.float32)
@@ -53,16 +56,102 @@ def create_numerical_branch(numerical_input, zcr_scaler, rms_scaler):
     rms_scale = tf.constant(rms_scaler.scale_, dtype=tf.float32)
     rms_scaled = (rms_features - rms_mean) / rms_scale
 
+    return zcr_scaled, rms_scaled
+
+
+def create_numerical_branch(numerical_input, zcr_scaler, rms_scaler, units=(512, 256), dropout=0.3):
+    """
+    Builds the branch of the model that processes numerical features.
+    `units` are the widths of its two dense layers and `dropout` the rate between them.
+    """
+    # --- Apply Scaling Separately ---
+    zcr_scaled, rms_scaled = scale_numerical_features(numerical_input, zcr_scaler, rms_scaler)
+
     # Concatenate the individually scaled features back together
     concatenated_scaled = layers.Concatenate()([zcr_scaled, rms_scaled])
 
-    x = layers.Dense(512, activation='relu')(concatenated_scaled)
-    x = layers.Dropout(0.3)(x)
+    x = layers.Dense(units[0], activation='relu')(concatenated_scaled)
+    x = layers.Dropout(dropout)(x)
+    x = layers.Dense(units[1], activation='relu')(x)
+
+    return x
+
+
+def create_sequence_branch(sequence_input, frame_scaler, rnn_type="gru", units=128):
+    """
+    Builds the recurrent branch for variable-length (frames, 2) ZCR/RMS sequences.
+    Padded frames are masked, so the recurrent layers skip them entirely.
+    """
+    if rnn_type not in RECURRENT_LAYERS:
+        raise ValueError(f"Unknown recurrent layer '{rnn_type}'. Expected one of {list(RECURRENT_LAYERS)}.")
+    rnn = RECURRENT_LAYERS[rnn_type]
+
+    x = layers.Masking(mask_value=SEQUENCE_PAD_VALUE)(sequence_input)
+    # Per-feature standardization; the mask is carried through to the recurrent layers
+    x = layers.Normalization(mean=frame_scaler.mean_, variance=frame_scaler.var_)(x)
+    x = rnn(units, return_sequences=True)(x)
+    x = rnn(units // 2)(x)
     x = layers.Dense(256, activation='relu')(x)
 
     return x
 
 
+def create_classification_head(combined_features, num_classes, units=128, dropout=0.5):
+    """
+    Adds the dense classification head shared by every multimodal variant.
+    """
+    x = layers.Dense(units, activation='relu')(combined_features)
+    x = layers.Dropout(dropout)(x)
+    # Keep the softmax in float32 so probabilities stay stable under a mixed precision policy
+    return layers.Dense(num_classes, activation='softmax', dtype='float32')(x)
+
+
+def build_visual_encoder(img_shape, name):
+    """
+    Builds a standalone frozen ResNet50 + pooling encoder that maps an image to its embedding.
+    """
+    image_input = layers.Input(shape=img_shape, name=f"{name}_input")
+    embedding = create_visual_branch(image_input, name=name)
+    return Model(inputs=image_input, outputs=embedding, name=f"{name}_encoder")
+
+
+def build_head_model(
+    embedding_dim, numerical_shape, num_classes, zcr_scaler, rms_scaler,
+    numerical_units=(512, 256), numerical_dropout=0.3, head_units=128, head_dropout=0.5
+):
+    """
+    Builds the trainable part of the multimodal model on top of precomputed visual embeddings.
+    Both ResNet50 branches are frozen and run in inference mode, so training this head on
+    cached embeddings is equivalent to training the full model while skipping the backbones.
+    The layer widths and dropout rates default to those of build_multimodal_model.
+    """
+    mfcc_input = layers.Input(shape=(embedding_dim,), name="mfcc_embedding")
+    chroma_input = layers.Input(shape=(embedding_dim,), name="chroma_embedding")
+    numerical_input = layers.Input(shape=numerical_shape, name="numerical_input")
+
+    numerical_branch = create_numerical_branch(
+        numerical_input, zcr_scaler, rms_scaler, units=numerical_units, dropout=numerical_dropout
+    )
+    combined_features = layers.Concatenate()([mfcc_input, chroma_input, numerical_branch])
+    output = create_classification_head(combined_features, num_classes, units=head_units, dropout=head_dropout)
+
+    return Model(
+        inputs=[mfcc_input, chroma_input, numerical_input],
+        outputs=output
+    )
+
+
+def build_numerical_model(numerical_shape, num_classes, zcr_scaler, rms_scaler):
+    """
+    Builds a classifier on the ZCR/RMS input alone: the numerical branch plus the shared head.
+    It skips both ResNet50 passes, so it is the cheap first stage of cascade inference.
+    """
+    numerical_input = layers.Input(shape=numerical_shape, name="numerical_input")
+    numerical_branch = create_numerical_branch(numerical_input, zcr_scaler, rms_scaler)
+    output = create_classification_head(numerical_branch, num_classes)
+    return Model(inputs=numerical_input, outputs=output, name="numerical_classifier")
+
+
 def build_multimodal_model(img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler):
     """
     Builds the complete multi-input model.
@@ -81,9 +170,7 @@ def build_multimodal_model(img_shape, numerical_shape, num_classes, zcr_scaler,
     combined_features = layers.Concatenate()([mfcc_branch, chroma_branch, numerical_branch])
 
     # Add the final classification head
-    x = layers.Dense(128, activation='relu')(combined_features)
-    x = layers.Dropout(0.5)(x)
-    output = layers.Dense(num_classes, activation='softmax')(x)
+    output = create_classification_head(combined_features, num_classes)
 
     # Create the final model
     model = Model(
@@ -92,3 +179,25 @@ def build_multimodal_model(img_shape, numerical_shape, num_classes, zcr_scaler,
     )
 
     return model
+
+
+def build_sequence_multimodal_model(img_shape, num_classes, frame_scaler, rnn_type="gru"):
+    """
+    Builds the multi-input model for length-bucketed batches: the numerical branch is
+    recurrent and reads the variable-length "sequence_input" instead of a fixed vector.
+    """
+    mfcc_input = layers.Input(shape=img_shape, name="mfcc_input")
+    chroma_input = layers.Input(shape=img_shape, name="chroma_input")
+    sequence_input = layers.Input(shape=(None, 2), name="sequence_input")
+
+    mfcc_branch = create_visual_branch(mfcc_input, name="mfcc")
+    chroma_branch = create_visual_branch(chroma_input, name="chroma")
+    sequence_branch = create_sequence_branch(sequence_input, frame_scaler, rnn_type)
+
+    combined_features = layers.Concatenate()([mfcc_branch, chroma_branch, sequence_branch])
+    output = create_classification_head(combined_features, num_classes)
+
+    return Model(
+        inputs=[mfcc_input, chroma_input, sequence_input],
+        outputs=output
+    )
@@ -0,0 +1,187 @@
+import time
+import numpy as np
+import tensorflow as tf  # type: ignore
+from tensorflow.keras.models import Model  # type: ignore
+from tensorflow.keras import layers  # type: ignore
+from src.PoCs.MultiModalTraining.export_tflite import measure_latency
+from src.PoCs.MultiModalTraining.model import (
+    RECURRENT_LAYERS,
+    build_multimodal_model,
+    create_classification_head,
+    scale_numerical_features,
+)
+
+# name -> builder(img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler)
+MODEL_ZOO = {}
+
+# Gates per recurrent cell, used to count the FLOPs of each time step
+RECURRENT_GATES = {"SimpleRNN": 1, "GRU": 3, "LSTM": 4}
+
+
+def register_model(name):
+    """Decorator that adds a builder to MODEL_ZOO under `name`."""
+    def _register(builder):
+        MODEL_ZOO[name] = builder
+        return builder
+    return _register
+
+
+def build_model(name, img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler):
+    """
+    Builds the architecture registered as `name` over the standard loader inputs
+    (mfcc_input, chroma_input, numerical_input).
+    """
+    if name not in MODEL_ZOO:
+        raise ValueError(f"Unknown model '{name}'. Available models: {sorted(MODEL_ZOO)}.")
+    return MODEL_ZOO[name](img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler)
+
+
+@register_model("resnet50")
+def build_resnet50(img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler):
+    """The original frozen-ResNet50 multimodal model."""
+    return build_multimodal_model(img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler)
+
+
+def create_cnn_rnn_branch(image_input, rnn, name, units=128):
+    """
+    Convolutional front-end over a spectrogram image followed by a recurrent layer that
+    reads the resulting feature map column by column (the image width is the time axis).
+    """
+    # Images arrive with ResNet50 "caffe" preprocessing, roughly in [-128, 128]
+    x = layers.Rescaling(1.0 / 128, name=f"{name}_rescale")(image_input)
+    for filters in (32, 64, 128):
+        x = layers.Conv2D(filters, 3, padding="same", activation="relu")(x)
+        x = layers.BatchNormalization()(x)
+        x = layers.MaxPooling2D(2)(x)
+
+    # (height, width, channels) -> (width, height * channels): one time step per column
+    x = layers.Permute((2, 1, 3))(x)
+    x = layers.Reshape((x.shape[1], x.shape[2] * x.shape[3]))(x)
+    return rnn(units, name=f"{name}_{rnn.__name__.lower()}")(x)
+
+
+def create_cnn_rnn_numerical_branch(numerical_input, zcr_scaler, rms_scaler, rnn, units=64):
+    """
+    Treats the scaled ZCR and RMS vectors as a 2-channel sequence: Conv1D, pooling, then a recurrent layer.
+    """
+    zcr_scaled, rms_scaled = scale_numerical_features(numerical_input, zcr_scaler, rms_scaler)
+    # (batch, L) + (batch, L) -> (batch, L, 2); built from plain layers so saved models reload in safe mode
+    length = zcr_scaled.shape[-1]
+    x = layers.Concatenate(axis=-1, name="numerical_sequence")([
+        layers.Reshape((length, 1))(zcr_scaled),
+        layers.Reshape((length, 1))(rms_scaled),
+    ])
+    x = layers.Conv1D(32, 5, padding="same", activation="relu")(x)
+    x = layers.MaxPooling1D(4)(x)
+    return rnn(units, name=f"numerical_{rnn.__name__.lower()}")(x)
+
+
+def build_hybrid_model(img_shape, numerical_shape, num_classes, zcr_scaler, rms_scaler, rnn_type):
+    """
+    Builds a CNN + recurrent hybrid, trained end to end, with one branch per existing feature input.
+    """
+    rnn = RECURRENT_LAYERS[rnn_type]
+    mfcc_input = layers.Input(shape=img_shape, name="mfcc_input")
+    chroma_input = layers.Input(shape=img_shape, name="chroma_input")
+    numerical_input = layers.Input(shape=numerical_shape, name="numerical_input")
+
+    mfcc_branch = create_cnn_rnn_branch(mfcc_input, rnn, name="mfcc")
+    chroma_branch = create_cnn_rnn_branch(chroma_input, rnn, name="chroma")
+    numerical_branch = create_cnn_rnn_numerical_branch(numerical_input, zcr_scaler, rms_scaler, rnn)
+
+    combined_features = layers.Concatenate()([mfcc_branch, chroma_branch, numerical_branch])
+    output = create_classification_head(combined_features, num_classes)
+
+    return Model(
+        inputs=[mfcc_input, chroma_input, numerical_input],
+        outputs=output,
+        name=f"cnn_{rnn_type}"
+    )
+
+
+for _rnn_type in RECURRENT_LAYERS:
+    register_model(f"cnn_{_rnn_type}")(
+        lambda *args, rnn_type=_rnn_type: build_hybrid_model(*args, rnn_type=rnn_type)
+    )
+
+
+def random_inputs(model, batch_size, seed=0):
+    """Returns a dict of random float32 tensors matching the model's inputs."""
+    rng = np.random.default_rng(seed)
+    return {
+        tensor.name.split(":")[0]: rng.standard_normal((batch_size, *tensor.shape[1:])).astype(np.float32)
+        for tensor in model.inputs
+    }
+
+
+def recurrent_flops(model):
+    """
+    Counts the multiply-adds of every recurrent layer over all its time steps (x2 for FLOPs).
+    The graph profiler only sees a recurrent layer's loop body once, so these are counted here.
+    """
+    total = 0
+    for layer in model._flatten_layers(include_self=False):
+        gates = RECURRENT_GATES.get(type(layer).__name__)
+        if gates is None:
+            continue
+        _, timesteps, input_dim = layer.input.shape
+        units = layer.units
+        total += 2 * gates * timesteps * (input_dim * units + units * units + units)
+    return total
+
+
+def count_flops(model):
+    """
+    Estimates the FLOPs of one forward pass on a single sample: the TF graph profiler over the
+    frozen inference graph for everything outside recurrent loops, plus recurrent_flops.
+    """
+    from tensorflow.python.framework.convert_to_constants import (  # type: ignore
+        convert_variables_to_constants_v2,
+    )
+
+    specs = {
+        tensor.name.split(":")[0]: tf.TensorSpec((1, *tensor.shape[1:]), tf.float32) for tensor in model.inputs
+    }
+    concrete = tf.function(lambda inputs: model(inputs, training=False)).get_concrete_function(specs)
+    frozen = convert_variables_to_constants_v2(concrete)
+    options = tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+    options["output"] = "none"
+    graph_flops = tf.compat.v1.profiler.profile(graph=frozen.graph, options=options).total_float_ops
+    return graph_flops + recurrent_flops(model)
+
+
+def measure_train_step_time(model, batch_size, num_classes, steps=10, warmup=3):
+    """Median time in seconds of one train step on a random batch (the model must be compiled)."""
+    inputs = random_inputs(model, batch_size)
+    labels = tf.keras.utils.to_categorical(np.arange(batch_size) % num_classes, num_classes)
+    for _ in range(warmup):
+        model.train_on_batch(inputs, labels)
+    times = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        model.train_on_batch(inputs, labels)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def profile_model(model, num_classes, batch_sizes=(1, 8, 32), train_batch_size=32):
+    """
+    Measures the cost side of a compiled model.
+
+    Returns:
+        A dict with total/trainable parameters, FLOPs per sample, median CPU latency
+        per batch size (seconds) and median train step time (seconds).
+    """
+    trainable = int(sum(np.prod(w.shape) for w in model.trainable_weights))
+    with tf.device("/CPU:0"):
+        latency_s = {
+            int(b): measure_latency(model.predict_on_batch, random_inputs(model, b), runs=20, warmup=3)["median_ms"] / 1000
+            for b in batch_sizes
+        }
+    return {
+        "params": int(model.count_params()),
+        "trainable_params": trainable,
+        "flops": int(count_flops(model)),
+        "latency_s": latency_s,
+        "train_step_s": measure_train_step_time(model, train_batch_size, num_classes),
+    }
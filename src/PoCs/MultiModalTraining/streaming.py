@@ -0,0 +1,294 @@
+import time
+from collections import deque
+import numpy as np
+import librosa  # type: ignore
+import soundfile as sf  # type: ignore
+import tensorflow as tf  # type: ignore
+from matplotlib import colormaps  # type: ignore
+from scipy.fft import dct  # type: ignore
+from scipy.signal import get_window, savgol_filter  # type: ignore
+from src.PoCs.MultiModalTraining.checkpoint import load_trained_model
+from src.PoCs.MultiModalTraining.data_loader import load_class_names, pad_or_truncate
+from src.PoCs.MultiModalTraining.infer import parity_report, reference_probabilities
+from src.PoCs.MultiModalTraining.tf_features import AMIN, DELTA_WIDTH, HOP_LENGTH, N_FFT, N_MELS, N_MFCC, TOP_DB
+from src.utils.extract_lib import chroma_basis
+from src.utils.resampling import CANONICAL_SAMPLE_RATE, resample
+from src.utils.utils import load_config
+
+
+class RingBuffer:
+    """
+    Fixed-capacity FIFO of columns backed by a preallocated array.
+    Once full, new columns overwrite the oldest ones, so memory never grows with the stream.
+    """
+
+    def __init__(self, capacity, rows=None, dtype=np.float32):
+        shape = (capacity,) if rows is None else (rows, capacity)
+        self._data = np.zeros(shape, dtype=dtype)
+        self.capacity = capacity
+        self.total = 0  # Number of columns ever written
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def extend(self, block):
+        """Appends the columns of `block` (last axis)."""
+        n = block.shape[-1]
+        self.total += n
+        if n >= self.capacity:
+            block = block[..., -self.capacity:]
+            n = self.capacity
+        start = (self.total - n) % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[..., start:start + first] = block[..., :first]
+        self._data[..., :n - first] = block[..., first:]
+
+    def latest(self, n=None):
+        """Returns a copy of the newest `n` columns (all stored columns by default), oldest first."""
+        n = len(self) if n is None else min(n, len(self))
+        end = self.total % self.capacity
+        idx = (np.arange(end - n, end)) % self.capacity
+        return self._data[..., idx]
+
+
+class IncrementalFeatureExtractor:
+    """
+    Computes the extract_lib features frame by frame as audio arrives.
+
+    Every new hop of samples produces one STFT frame, from which the power spectrum,
+    the log-mel column (for MFCCs), ZCR and RMS are derived and pushed into ring
+    buffers covering the analysis window. The spectral peaks librosa.estimate_tuning
+    histograms are also picked once per frame. Nothing is recomputed for frames already
+    seen; only the cheap DCT, top_db clipping and delta-delta filter, the tuning histogram
+    over the window's peaks (as extract_lib estimates it per clip) and the chroma
+    projection with that tuning run over the window when features are requested.
+    Frame values match librosa away from the edges of the signal.
+    """
+
+    def __init__(self, sr, window_frames, n_fft=N_FFT, hop_length=HOP_LENGTH):
+        if n_fft % hop_length != 0:
+            raise ValueError("n_fft must be a multiple of hop_length.")
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+
+        self._window = get_window("hann", n_fft, fftbins=True).astype(np.float32)
+        self._mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=N_MELS).astype(np.float32)
+
+        self._samples = RingBuffer(n_fft)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.power = RingBuffer(window_frames, rows=n_fft // 2 + 1)
+        # (frequencies, magnitudes) of each frame's piptrack peaks
+        self._peaks = deque(maxlen=window_frames)
+        self.log_mel = RingBuffer(window_frames, rows=N_MELS)
+        self.zcr = RingBuffer(window_frames)
+        self.rms = RingBuffer(window_frames)
+
+        # Centered framing: the first frame is centered on sample 0
+        self._samples.extend(np.zeros(n_fft // 2, dtype=np.float32))
+
+    @property
+    def frames(self):
+        """Total number of frames computed so far."""
+        return self.zcr.total
+
+    def _process_frame(self, frame):
+        spectrum = np.abs(np.fft.rfft(frame * self._window)) ** 2
+        self.power.extend(spectrum[:, None])
+        # piptrack thresholds and picks peaks within each frame, so a frame's peaks never change
+        pitches, mags = librosa.piptrack(S=spectrum[:, None], sr=self.sr, n_fft=self.n_fft)
+        voiced = pitches[:, 0] > 0
+        self._peaks.append((pitches[voiced, 0], mags[voiced, 0]))
+
+        mel = self._mel_basis @ spectrum
+        self.log_mel.extend((10.0 * np.log10(np.maximum(AMIN, mel)))[:, None])
+
+        signs = np.signbit(np.where(np.abs(frame) <= 1e-10, 0.0, frame))
+        self.zcr.extend(np.array([np.count_nonzero(signs[1:] != signs[:-1]) / self.n_fft]))
+        self.rms.extend(np.array([np.sqrt(np.mean(frame ** 2))]))
+
+    def push(self, samples):
+        """
+        Feeds new audio samples and returns the number of frames they completed.
+        """
+        self._pending = np.concatenate([self._pending, np.asarray(samples, dtype=np.float32)])
+        new_frames = 0
+        while len(self._pending) >= self.hop_length:
+            self._samples.extend(self._pending[:self.hop_length])
+            self._pending = self._pending[self.hop_length:]
+            if self._samples.total >= self.n_fft:
+                self._process_frame(self._samples.latest())
+                new_frames += 1
+        return new_frames
+
+    def tuning(self):
+        """
+        librosa.estimate_tuning over the current window, from the peaks stored per frame:
+        only the median threshold and the deviation histogram are computed here.
+        """
+        if not self._peaks:
+            return 0.0
+        pitches = np.concatenate([p for p, _ in self._peaks])
+        mags = np.concatenate([m for _, m in self._peaks])
+        threshold = np.median(mags) if len(mags) else 0.0
+        return librosa.pitch_tuning(pitches[mags >= threshold], bins_per_octave=12)
+
+    def features(self):
+        """
+        Returns the features over the current window as a dict with
+        dd_mfcc (13, frames), chroma (12, frames), zcr (frames,) and rms (frames,).
+        """
+        log_mel = self.log_mel.latest()
+        log_mel = np.maximum(log_mel, log_mel.max() - TOP_DB)
+        mfcc = dct(log_mel, axis=0, type=2, norm="ortho")[:N_MFCC]
+        dd_mfcc = savgol_filter(mfcc, DELTA_WIDTH, polyorder=2, deriv=2, axis=-1, mode="interp")
+
+        # The chroma filterbank depends on the tuning of the whole window, so it is applied here
+        power = self.power.latest()
+        chroma = chroma_basis(self.sr, self.n_fft, self.tuning()).astype(np.float32) @ power
+        return {
+            "dd_mfcc": dd_mfcc,
+            "chroma": librosa.util.normalize(chroma, norm=np.inf, axis=0),
+            "zcr": self.zcr.latest(),
+            "rms": self.rms.latest(),
+        }
+
+
+def render_feature_image(spec, img_height, img_width):
+    """
+    Renders a feature matrix the way save_spec_as_image draws it (librosa's default
+    colormap, min/max normalization, low rows at the bottom) straight into a
+    ResNet50-ready array, without a matplotlib figure or an image file round trip.
+    The prediction gap this leaves against the training images is reported when the module runs.
+    """
+    cmap = colormaps["magma"] if spec.min() >= 0 else colormaps["coolwarm"]
+    span = spec.max() - spec.min()
+    normalized = (spec - spec.min()) / span if span > 0 else np.zeros_like(spec)
+    rgb = cmap(np.flipud(normalized))[..., :3] * 255.0
+    img = tf.image.resize(rgb.astype(np.float32), [img_height, img_width])
+    return tf.keras.applications.resnet50.preprocess_input(img).numpy()
+
+
+def keras_predict_fn(model):
+    """Wraps a Keras model as a predict function over an input dict."""
+    def _predict(inputs):
+        return model(inputs, training=False).numpy()
+    return _predict
+
+
+class StreamingEmotionRecognizer:
+    """
+    Emits emotion predictions over a sliding window of a live audio stream.
+
+    Args:
+        predict_fn: Callable mapping a batched input dict to class probabilities,
+                    e.g. keras_predict_fn(model) or TFLiteRunner(path).predict.
+        classes: Class names in label-encoder order.
+        config (dict): Project config (image size and FIXED_1D_LENGTH).
+        sr (int): Sample rate of the incoming audio; the training features' rate
+                  (CANONICAL_SAMPLE_RATE) for predictions to match training.
+        window_seconds (float): Length of audio each prediction covers.
+        hop_seconds (float): How often a new prediction is emitted.
+    """
+
+    def __init__(self, predict_fn, classes, config, sr, window_seconds=3.0, hop_seconds=0.5):
+        self.predict_fn = predict_fn
+        self.classes = list(classes)
+        self.config = config
+        self.sr = sr
+        window_frames = int(np.ceil(window_seconds * sr / HOP_LENGTH))
+        self.hop_frames = max(1, int(round(hop_seconds * sr / HOP_LENGTH)))
+        self.extractor = IncrementalFeatureExtractor(sr, window_frames)
+        self._frames_since_emit = 0
+
+    def _build_inputs(self, features):
+        height, width = self.config["IMG_HEIGHT"], self.config["IMG_WIDTH"]
+        length = self.config["FIXED_1D_LENGTH"]
+        numerical = np.concatenate([
+            pad_or_truncate(features["zcr"], length),
+            pad_or_truncate(features["rms"], length),
+        ]).astype(np.float32)
+        return {
+            "mfcc_input": render_feature_image(features["dd_mfcc"], height, width)[None],
+            "chroma_input": render_feature_image(features["chroma"], height, width)[None],
+            "numerical_input": numerical[None],
+        }
+
+    def push(self, chunk):
+        """
+        Feeds an audio chunk and returns the predictions it triggered, each a dict
+        with the stream time (s), the predicted label and the class probabilities.
+        """
+        self._frames_since_emit += self.extractor.push(chunk)
+        predictions = []
+        if self._frames_since_emit >= self.hop_frames and len(self.extractor.zcr) >= DELTA_WIDTH:
+            self._frames_since_emit = 0
+            probabilities = self.predict_fn(self._build_inputs(self.extractor.features()))[0]
+            predictions.append({
+                "time": self.extractor.frames * HOP_LENGTH / self.sr,
+                "label": self.classes[int(np.argmax(probabilities))],
+                "probabilities": dict(zip(self.classes, probabilities.tolist())),
+            })
+        return predictions
+
+
+def whole_clip_probabilities(recognizer, audio):
+    """
+    Runs the recognizer's front-end (incremental features and render_feature_image) over
+    a whole clip as one window, for comparing it with the training features.
+    """
+    extractor = IncrementalFeatureExtractor(recognizer.sr, int(np.ceil(len(audio) / HOP_LENGTH)) + 1)
+    extractor.push(audio)
+    return recognizer.predict_fn(recognizer._build_inputs(extractor.features()))[0]
+
+
+def replay_wav(recognizer, wav_path, chunk_seconds=0.1):
+    """
+    Replays a WAV file through the recognizer in fixed-size chunks, as a live source would,
+    and reports per-chunk processing latency against the chunk duration.
+    The file is resampled to the recognizer's rate first, like a capture device opened at that rate.
+    """
+    audio, native_sr = sf.read(wav_path, dtype="float32", always_2d=True)
+    audio = resample(audio.mean(axis=1), native_sr, recognizer.sr)
+    sr = recognizer.sr
+
+    chunk_size = int(chunk_seconds * sr)
+    latencies, predictions = [], []
+    for start in range(0, len(audio), chunk_size):
+        t0 = time.perf_counter()
+        predictions.extend(recognizer.push(audio[start:start + chunk_size]))
+        latencies.append(time.perf_counter() - t0)
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"\n--- Streaming replay: {wav_path} ---")
+    for p in predictions:
+        print(f"{p['time']:7.2f}s  {p['label']}")
+    print(
+        f"Chunk duration: {chunk_seconds * 1000:.0f} ms | latency median {np.median(latencies_ms):.2f} ms, "
+        f"p95 {np.percentile(latencies_ms, 95):.2f} ms, max {latencies_ms.max():.2f} ms"
+    )
+    print("--------------------------------------\n")
+    return predictions, latencies_ms
+
+
+if __name__ == '__main__':
+    config = load_config()
+    model, classes = load_trained_model(config.get("MODEL_PATH", "best_model.keras"))
+    classes = classes or load_class_names(config["FEATURES_DIR"])
+
+    wav_path = config["STREAM_WAV"]
+    recognizer = StreamingEmotionRecognizer(
+        keras_predict_fn(model),
+        classes,
+        config,
+        # The features must be computed at the rate the model was trained on
+        sr=config.get("CANONICAL_SAMPLE_RATE", CANONICAL_SAMPLE_RATE),
+        window_seconds=config.get("STREAM_WINDOW_SECONDS", 3.0),
+        hop_seconds=config.get("STREAM_HOP_SECONDS", 0.5),
+    )
+    replay_wav(recognizer, wav_path, chunk_seconds=config.get("STREAM_CHUNK_SECONDS", 0.1))
+
+    # The streaming images skip the matplotlib render and JPEG round trip of training, so measure what that costs
+    audio, native_sr = sf.read(wav_path, dtype="float32", always_2d=True)
+    streamed = whole_clip_probabilities(recognizer, resample(audio.mean(axis=1), native_sr, recognizer.sr))
+    parity_report(reference_probabilities(recognizer.predict_fn, [wav_path], config), streamed[None], "Streaming front-end")
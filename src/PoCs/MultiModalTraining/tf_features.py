@@ -0,0 +1,213 @@
+import numpy as np
+import tensorflow as tf  # type: ignore
+
+# librosa defaults used by extract_lib.compute_features
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+N_CHROMA = 12
+TOP_DB = 80.0
+AMIN = 1e-10
+ZCR_THRESHOLD = 1e-10
+# librosa.feature.delta(order=2) uses a 9-frame Savitzky-Golay window
+DELTA_WIDTH = 9
+# librosa.estimate_tuning: piptrack range and threshold, histogram resolution
+PITCH_FMIN = 150.0
+PITCH_FMAX = 4000.0
+PITCH_THRESHOLD = 0.1
+TUNING_BINS = np.linspace(-0.5, 0.5, 101)
+# Colormaps librosa.display.specshow picks for non-negative and signed data
+COLORMAPS = ("magma", "coolwarm")
+
+
+def build_constants(sr, n_fft=N_FFT):
+    """
+    Precomputes, with librosa and matplotlib, every matrix the in-graph features need:
+    the mel filterbank, one chroma filterbank per candidate tuning, the delta-delta
+    filter and the colormap lookup tables.
+    """
+    import librosa  # type: ignore
+    from matplotlib import colormaps  # type: ignore
+    from scipy.signal import savgol_coeffs  # type: ignore
+
+    return {
+        "mel_basis": librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=N_MELS).T.astype(np.float32),
+        "chroma_banks": np.stack([
+            librosa.filters.chroma(sr=sr, n_fft=n_fft, tuning=tuning).T for tuning in TUNING_BINS[:-1]
+        ]).astype(np.float32),
+        "delta_filter": savgol_coeffs(DELTA_WIDTH, polyorder=2, deriv=2, use="dot").astype(np.float32),
+        "colormaps": np.stack([colormaps[name](np.arange(256))[:, :3] * 255.0 for name in COLORMAPS]).astype(np.float32),
+    }
+
+
+def _median(values):
+    values = tf.sort(values)
+    n = tf.size(values)
+    upper = values[n // 2]
+    lower = values[(n - 1) // 2]
+    return (upper + lower) / 2
+
+
+class TFFeatureExtractor:
+    """
+    Computes the extract_lib features of one mono clip with TensorFlow ops only, so they
+    can run inside a SavedModel or a tf.data pipeline.
+
+    The STFT, mel and chroma projections, power_to_db, DCT, delta-delta, ZCR and RMS follow
+    the librosa calls in extract_lib.compute_features, including chroma_stft's tuning
+    estimate (piptrack + pitch histogram). The images are rendered like
+    streaming.render_feature_image: the feature matrix is colour-mapped as specshow does
+    and resized directly, without the matplotlib figure and JPEG round trip.
+
+    Args:
+        sr (int): Sample rate of the waveforms; the filterbanks are built for it.
+    """
+
+    def __init__(self, sr, n_fft=N_FFT, hop_length=HOP_LENGTH):
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        constants = build_constants(sr, n_fft)
+        self.mel_basis = tf.constant(constants["mel_basis"])
+        self.chroma_banks = tf.constant(constants["chroma_banks"])
+        self.delta_filter = tf.constant(constants["delta_filter"])
+        self.colormaps = tf.constant(constants["colormaps"])
+
+        fft_freqs = np.linspace(0, sr / 2, n_fft // 2 + 1)
+        self.pitch_mask = tf.constant((PITCH_FMIN <= fft_freqs) & (fft_freqs < min(PITCH_FMAX, sr / 2)))
+        self.bin_index = tf.constant(np.arange(n_fft // 2 + 1), tf.float32)
+
+    def power_spectrogram(self, waveform):
+        """Centered, zero-padded |STFT|^2 with a periodic Hann window, shape (frames, bins)."""
+        padded = tf.pad(waveform, [[self.n_fft // 2, self.n_fft // 2]])
+        stft = tf.signal.stft(
+            padded, self.n_fft, self.hop_length, self.n_fft, window_fn=tf.signal.hann_window, pad_end=False
+        )
+        return tf.square(tf.abs(stft))
+
+    def dd_mfcc(self, power):
+        """Second-order delta of 13 MFCCs, shape (13, frames) like librosa."""
+        log_mel = 10.0 * tf.math.log(tf.maximum(AMIN, tf.matmul(power, self.mel_basis))) / tf.math.log(10.0)
+        log_mel = tf.maximum(log_mel, tf.reduce_max(log_mel) - TOP_DB)
+        mfcc = tf.transpose(tf.signal.dct(log_mel, type=2, norm="ortho")[:, :N_MFCC])
+
+        # A quadratic fit has a constant second derivative, so savgol's "interp" edges
+        # repeat the first and last full-window values
+        half = DELTA_WIDTH // 2
+        inner = tf.linalg.matvec(tf.signal.frame(mfcc, DELTA_WIDTH, 1, axis=-1), self.delta_filter)
+        return tf.concat([
+            tf.repeat(inner[:, :1], half, axis=1), inner, tf.repeat(inner[:, -1:], half, axis=1)
+        ], axis=1)
+
+    def estimate_tuning(self, power):
+        """
+        librosa.estimate_tuning over the power spectrogram: interpolated spectral peaks
+        between 150 Hz and 4 kHz, kept when above the median peak magnitude, histogrammed
+        by their deviation from equal temperament.
+
+        Returns:
+            The index of the estimated tuning in TUNING_BINS.
+        """
+        # Parabolic peak interpolation and gradient along frequency
+        prev, cur, nxt = power[:, :-2], power[:, 1:-1], power[:, 2:]
+        a = nxt + prev - 2 * cur
+        b = (nxt - prev) / 2
+        shift = tf.where(tf.abs(b) >= tf.abs(a), 0.0, tf.math.divide_no_nan(-b, a))
+        shift = tf.pad(shift, [[0, 0], [1, 1]])
+        gradient = tf.concat([power[:, 1:2] - power[:, :1], b, power[:, -1:] - power[:, -2:-1]], axis=1)
+
+        # Local maxima of the spectrum after thresholding at 10% of each frame's peak
+        peaks = power * tf.cast(power > PITCH_THRESHOLD * tf.reduce_max(power, axis=1, keepdims=True), power.dtype)
+        is_max = tf.concat([
+            tf.zeros_like(peaks[:, :1], tf.bool),
+            (peaks[:, 1:-1] > peaks[:, :-2]) & (peaks[:, 1:-1] >= peaks[:, 2:]),
+            peaks[:, -1:] > peaks[:, -2:-1],
+        ], axis=1) & self.pitch_mask
+
+        pitches = tf.boolean_mask((self.bin_index + shift) * self.sr / self.n_fft, is_max)
+        mags = tf.boolean_mask(power + 0.5 * gradient * shift, is_max)
+        voiced = pitches > 0
+        threshold = tf.cond(
+            tf.reduce_any(voiced), lambda: _median(tf.boolean_mask(mags, voiced)), lambda: tf.constant(0.0)
+        )
+        frequencies = tf.cast(tf.boolean_mask(pitches, voiced & (mags >= threshold)), tf.float64)
+
+        residual = tf.math.floormod(N_CHROMA * tf.math.log(frequencies / (440.0 / 16)) / np.log(2.0), 1.0)
+        residual = tf.where(residual >= 0.5, residual - 1.0, residual)
+        bins = tf.clip_by_value(tf.searchsorted(TUNING_BINS, residual, side="right") - 1, 0, len(TUNING_BINS) - 2)
+        counts = tf.math.bincount(tf.cast(bins, tf.int32), minlength=len(TUNING_BINS) - 1)
+        # An empty set of pitches means a tuning of 0.0
+        return tf.where(tf.size(frequencies) > 0, tf.argmax(counts, output_type=tf.int32), (len(TUNING_BINS) - 1) // 2)
+
+    def chroma(self, power):
+        """chroma_stft with estimated tuning and per-frame max normalization, shape (12, frames)."""
+        raw = tf.matmul(power, tf.gather(self.chroma_banks, self.estimate_tuning(power)))
+        peak = tf.reduce_max(raw, axis=1, keepdims=True)
+        return tf.transpose(raw / tf.where(peak < np.finfo(np.float32).tiny, 1.0, peak))
+
+    def zcr(self, waveform):
+        """Zero-crossing rate per frame (edge-padded, centered), shape (frames,)."""
+        padded = tf.concat([
+            tf.fill([self.n_fft // 2], waveform[0]), waveform, tf.fill([self.n_fft // 2], waveform[-1])
+        ], axis=0)
+        frames = tf.signal.frame(padded, self.n_fft, self.hop_length)
+        negative = tf.where(tf.abs(frames) <= ZCR_THRESHOLD, 0.0, frames) < 0
+        crossings = tf.math.count_nonzero(negative[:, 1:] != negative[:, :-1], axis=1)
+        return tf.cast(crossings, tf.float32) / self.n_fft
+
+    def rms(self, waveform):
+        """Root-mean-square energy per frame (zero-padded, centered), shape (frames,)."""
+        padded = tf.pad(waveform, [[self.n_fft // 2, self.n_fft // 2]])
+        frames = tf.signal.frame(padded, self.n_fft, self.hop_length)
+        return tf.sqrt(tf.reduce_mean(tf.square(frames), axis=1))
+
+    def features(self, waveform):
+        """
+        Returns dd_mfcc (13, frames), chromagram (12, frames), zcr and rms (frames,) for one clip.
+        Clips shorter than the 9-frame delta window are zero-padded first (librosa rejects them).
+        """
+        waveform = tf.convert_to_tensor(waveform, tf.float32)
+        min_samples = (DELTA_WIDTH - 1) * self.hop_length
+        waveform = tf.pad(waveform, [[0, tf.maximum(0, min_samples - tf.size(waveform))]])
+        power = self.power_spectrogram(waveform)
+        return {
+            "dd_mfcc": self.dd_mfcc(power),
+            "chromagram": self.chroma(power),
+            "zcr": self.zcr(waveform),
+            "rms": self.rms(waveform),
+        }
+
+    def render_image(self, spec, img_height, img_width):
+        """
+        Colour-maps a feature matrix like specshow (magma for non-negative data, coolwarm
+        otherwise, min/max normalized, low rows at the bottom), resizes it and applies
+        the ResNet50 preprocessing. This approximates the training images (matplotlib figure
+        and JPEG round trip); `export --check` reports the resulting prediction gap.
+        """
+        low, high = tf.reduce_min(spec), tf.reduce_max(spec)
+        span = high - low
+        normalized = tf.where(span > 0, (spec - low) / tf.where(span > 0, span, 1.0), 0.0)
+        index = tf.clip_by_value(tf.cast(tf.floor(normalized * 256), tf.int32), 0, 255)
+        lut = tf.gather(self.colormaps, tf.cast(low < 0, tf.int32))
+        rgb = tf.gather(lut, tf.reverse(index, axis=[0]))
+        img = tf.image.resize(rgb, [img_height, img_width])
+        return tf.keras.applications.resnet50.preprocess_input(img)
+
+    def model_inputs(self, waveform, img_height, img_width, length):
+        """
+        Builds the unbatched multimodal model inputs for one clip: the two images and the
+        ZCR/RMS vector zero-padded or truncated to `length` each.
+        """
+        features = self.features(waveform)
+
+        def _pad_or_truncate(values):
+            values = values[:length]
+            return tf.pad(values, [[0, length - tf.size(values)]])
+
+        numerical = tf.concat([_pad_or_truncate(features["zcr"]), _pad_or_truncate(features["rms"])], axis=0)
+        return {
+            "mfcc_input": self.render_image(features["dd_mfcc"], img_height, img_width),
+            "chroma_input": self.render_image(features["chromagram"], img_height, img_width),
+            "numerical_input": tf.ensure_shape(numerical, [2 * length]),
+        }
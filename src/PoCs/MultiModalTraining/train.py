@@ -1,8 +1,12 @@
 import tensorflow as tf  # type: ignore
 import matplotlib.pyplot as plt  # type: ignore
-from src.models.data_loader import get_data_loaders
-from src.models.model import build_multimodal_model
+from src.PoCs.MultiModalTraining.data_loader import get_audio_data_loaders, get_data_loaders, get_bucketed_data_loaders
+from src.PoCs.MultiModalTraining.model import build_sequence_multimodal_model
+from src.PoCs.MultiModalTraining.model_zoo import build_model
+from src.PoCs.MultiModalTraining.export_tflite import export_tflite_models
+from src.PoCs.MultiModalTraining.checkpoint import LeanCheckpoint
 from src.utils.utils import load_config
+from src.utils.memory_profile import get_profiler
 from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping, ReduceLROnPlateau  # type: ignore
 
 
@@ -31,15 +35,77 @@ def plot_history(history, model_name):
     plt.show()
 
 
+def configure_precision(config):
+    """
+    Sets the global Keras dtype policy from config.
+    With MIXED_PRECISION enabled, layers compute in bfloat16 while variables stay float32.
+    Must be called before the model is built.
+    """
+    policy = "mixed_bfloat16" if config.get("MIXED_PRECISION", False) else "float32"
+    tf.keras.mixed_precision.set_global_policy(policy)
+    return policy
+
+
+def compile_model(model, config):
+    """
+    Compiles the model with the optimizer and step compilation settings from config.
+    JIT_COMPILE enables XLA for the train and eval steps, and LOSS_SCALING wraps the
+    optimizer in a LossScaleOptimizer when mixed precision is active.
+    """
+    optimizer = tf.keras.optimizers.Adam(learning_rate=config["LEARNING_RATE"])
+    if config.get("MIXED_PRECISION", False) and config.get("LOSS_SCALING", True):
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+
+    model.compile(
+        optimizer=optimizer,
+        loss='categorical_crossentropy',
+        metrics=['accuracy'],
+        jit_compile=config.get("JIT_COMPILE", False)
+    )
+    return model
+
+
+def load_data(config, loader_mode, augment=True):
+    """
+    Builds the datasets of LOADER_MODE: "fixed" (precomputed features), "bucketed"
+    (variable-length ZCR/RMS sequences) or "audio" (features computed in the input pipeline).
+    Returns the tuple of the matching data_loader function.
+    """
+    if loader_mode == "audio":
+        return get_audio_data_loaders(
+            store_dir=config.get("WAVEFORM_STORE_DIR", "src//data//waveforms"),
+            batch_size=config["BATCH_SIZE"],
+            augment=augment
+        )
+    if loader_mode == "bucketed":
+        return get_bucketed_data_loaders(
+            features_dir=config["FEATURES_DIR"],
+            batch_size=config["BATCH_SIZE"],
+            num_buckets=config.get("NUM_BUCKETS", 8)
+        )
+    return get_data_loaders(
+        features_dir=config["FEATURES_DIR"],
+        batch_size=config["BATCH_SIZE"],
+        augment=augment
+    )
+
+
 def main():
 
     config = load_config()
+    policy = configure_precision(config)
+    print(f"Dtype policy: {policy} | XLA jit_compile: {config.get('JIT_COMPILE', False)}")
+
     # 1. Load Data
+    # LOADER_MODE "bucketed" keeps ZCR/RMS at their natural length for a recurrent branch,
+    # "audio" computes every feature in the input pipeline from the packed waveform store
+    loader_mode = config.get("LOADER_MODE", "fixed")
+    bucketed = loader_mode == "bucketed"
     try:
-        train_ds, val_ds, test_ds, label_encoder, zcr_scaler, rms_scaler = get_data_loaders(
-            features_dir=config["FEATURES_DIR"],
-            batch_size=config["BATCH_SIZE"]
-        )
+        if bucketed:
+            train_ds, val_ds, test_ds, label_encoder, frame_scaler = load_data(config, loader_mode)
+        else:
+            train_ds, val_ds, test_ds, label_encoder, zcr_scaler, rms_scaler = load_data(config, loader_mode)
     except ValueError as e:
         print(f"Error loading data: {e}")
         print("Please ensure the 'features' directory exists and is populated correctly.")
@@ -52,32 +118,52 @@ def main():
     numerical_shape = (config["FIXED_1D_LENGTH"] * 2,)
 
     # 2. Build Model
-    model = build_multimodal_model(
-        img_shape=img_shape,
-        numerical_shape=numerical_shape,
-        num_classes=num_classes,
-        zcr_scaler=zcr_scaler,
-        rms_scaler=rms_scaler
-    )
+    if bucketed:
+        model = build_sequence_multimodal_model(
+            img_shape=img_shape,
+            num_classes=num_classes,
+            frame_scaler=frame_scaler,
+            rnn_type=config.get("RNN_TYPE", "gru")
+        )
+    else:
+        # MODEL_NAME picks an architecture from the model zoo (resnet50, cnn_rnn, cnn_lstm, cnn_gru)
+        model = build_model(
+            config.get("MODEL_NAME", "resnet50"),
+            img_shape=img_shape,
+            numerical_shape=numerical_shape,
+            num_classes=num_classes,
+            zcr_scaler=zcr_scaler,
+            rms_scaler=rms_scaler
+        )
 
     # 3. Compile Model
-    optimizer = tf.keras.optimizers.Adam(learning_rate=config["LEARNING_RATE"])
-    model.compile(
-        optimizer=optimizer,
-        loss='categorical_crossentropy',
-        metrics=['accuracy']
-    )
+    compile_model(model, config)
 
     model.summary()
 
     # --- Define Callbacks ---
-    # Save the best model based on validation loss
-    model_checkpoint_callback = ModelCheckpoint(
-        filepath='best_model.keras',
-        save_best_only=True,
-        monitor='val_loss',
-        mode='min'
-    )
+    # Save the best model based on validation loss. CHECKPOINT_MODE "lean" writes only the
+    # non-frozen variables plus scaler/label state, from a background thread
+    if config.get("CHECKPOINT_MODE", "full") == "lean":
+        if bucketed:
+            build = {"builder": "sequence", "img_shape": img_shape, "rnn_type": config.get("RNN_TYPE", "gru")}
+            scalers = {"frame": frame_scaler}
+        else:
+            build = {
+                "builder": "zoo", "model_name": config.get("MODEL_NAME", "resnet50"),
+                "img_shape": img_shape, "numerical_shape": numerical_shape
+            }
+            scalers = {"zcr": zcr_scaler, "rms": rms_scaler}
+        model_checkpoint_callback = LeanCheckpoint(
+            config.get("CHECKPOINT_DIR", "best_model_lean"), build, scalers, label_encoder
+        )
+    else:
+        model_checkpoint_callback = ModelCheckpoint(
+            filepath='best_model.keras',
+            save_best_only=True,
+            monitor='val_loss',
+            mode='min'
+        )
 
     # Stop training if validation loss doesn't improve for 10 epochs
     early_stopping_callback = EarlyStopping(
@@ -103,12 +189,14 @@ def main():
 
     # 4. Train Model
     print("\n--- Starting Model Training ---")
-    history = model.fit(
-        train_ds,
-        validation_data=val_ds,
-        epochs=config["EPOCHS"],
-        callbacks=training_callbacks  # Pass the list here
-    )
+    # The training stage covers the full-split shuffle buffers, which fill while iterating
+    with get_profiler().stage("training"):
+        history = model.fit(
+            train_ds,
+            validation_data=val_ds,
+            epochs=config["EPOCHS"],
+            callbacks=training_callbacks  # Pass the list here
+        )
     print("--- Model Training Finished ---\n")
 
     # 5. Evaluate Model
@@ -118,6 +206,17 @@ def main():
     print(f"Test Loss: {test_loss:.4f}")
     print(f"Test Accuracy: {test_accuracy:.4f}")
 
+    # Optional deployment artifacts: float, dynamic-range and full-int8 TFLite builds
+    if config.get("EXPORT_TFLITE", False):
+        if bucketed:
+            print("Skipping TFLite export: it needs fixed input shapes (LOADER_MODE 'fixed').")
+        else:
+            # int8 ranges are calibrated on the real inputs, not on masked and gain-jittered batches
+            calibration_ds = train_ds
+            if config.get("FEATURE_AUGMENT", False):
+                calibration_ds = load_data(config, loader_mode, augment=False)[0]
+            export_tflite_models(model, calibration_ds, config)
+
     # 6. Visualize Results
     plot_history(history, model.name)
 
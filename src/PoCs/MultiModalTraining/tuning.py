@@ -0,0 +1,262 @@
+"""
+Hyperparameter search over the classification head of the multimodal model.
+
+The ResNet50 backbone stays frozen, so its embeddings are computed once (the same
+cache as cross_validation) and each trial trains only the head: dense widths, dropout,
+learning rate and batch size drawn from SEARCH_SPACE. Trials run in spawned worker
+processes under asynchronous successive halving (ASHAScheduler), which promotes only
+the best trials of each rung to longer training and resumes them from saved weights.
+
+Usage: python -m src tune
+"""
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+import tensorflow as tf  # type: ignore
+from sklearn.model_selection import train_test_split  # type: ignore
+from sklearn.preprocessing import LabelEncoder, StandardScaler  # type: ignore
+from src.PoCs.MultiModalTraining.cross_validation import EMBEDDING_DIM, prepare_shared_features
+from src.PoCs.MultiModalTraining.data_loader import load_labeled_dataframe
+from src.PoCs.MultiModalTraining.model import build_head_model
+from src.utils.utils import init_worker_threads, load_config
+
+# Hyperparameters of the classification head. Lists are categorical choices and
+# {"log_uniform": [low, high]} is sampled log-uniformly. TUNING_SPACE in config.json overrides it.
+SEARCH_SPACE = {
+    "numerical_units": [[256, 128], [512, 256], [1024, 512]],
+    "numerical_dropout": [0.1, 0.3, 0.5],
+    "head_units": [64, 128, 256],
+    "head_dropout": [0.3, 0.5],
+    "learning_rate": {"log_uniform": [1e-4, 1e-2]},
+    "batch_size": [16, 32, 64],
+}
+
+
+def sample_params(space, rng):
+    """Draws one configuration from the search space."""
+    params = {}
+    for name, domain in space.items():
+        if isinstance(domain, dict):
+            low, high = domain["log_uniform"]
+            params[name] = float(math.exp(rng.uniform(math.log(low), math.log(high))))
+        else:
+            params[name] = domain[int(rng.integers(len(domain)))]
+    return params
+
+
+class ASHAScheduler:
+    """
+    Asynchronous successive halving.
+
+    Trials start on the lowest rung (min_epochs of training). Rung k trains for
+    min_epochs * eta**k epochs, up to max_epochs. Whenever a worker is free, the scheduler
+    promotes a trial that ranks in the top 1/eta of the results seen so far on its rung,
+    searching from the highest rung down, and otherwise starts a new trial. Workers
+    never wait for a rung to fill up, and weak trials simply never get promoted.
+    Lower metric values are better.
+    """
+
+    def __init__(self, min_epochs=1, max_epochs=27, eta=3):
+        self.eta = eta
+        self.rungs = []
+        epochs = min_epochs
+        while epochs < max_epochs:
+            self.rungs.append(epochs)
+            epochs *= eta
+        self.rungs.append(max_epochs)
+        self.results = [{} for _ in self.rungs]
+        self.promoted = [set() for _ in self.rungs]
+
+    def record(self, trial_id, rung, metric):
+        self.results[rung][trial_id] = metric
+
+    def next_promotion(self):
+        """Returns (trial_id, next rung) for the best promotable trial, or None."""
+        for rung in range(len(self.rungs) - 2, -1, -1):
+            ranked = sorted(self.results[rung].items(), key=lambda item: item[1])
+            top = ranked[:len(ranked) // self.eta]
+            for trial_id, _ in top:
+                if trial_id not in self.promoted[rung]:
+                    self.promoted[rung].add(trial_id)
+                    return trial_id, rung + 1
+        return None
+
+
+def run_trial(trial_id, params, rung, start_epoch, end_epoch, feature_paths, labels, num_classes,
+              train_idx, val_idx, scalers, trial_dir):
+    """
+    Trains one trial's head from start_epoch to end_epoch on the shared cached features and
+    scores it on the validation rows. Executed in a worker process. Weights are kept in
+    trial_dir between rungs (with the optimizer state), so a promoted trial resumes
+    instead of starting over.
+    """
+    start = time.perf_counter()
+    tf.keras.utils.set_random_seed(42 + trial_id)
+    features = {name: np.load(path, mmap_mode="r") for name, path in feature_paths.items()}
+
+    def _inputs(idx):
+        numerical = np.concatenate([features["zcr"][idx], features["rms"][idx]], axis=1)
+        return [features["mfcc_embeddings"][idx], features["chroma_embeddings"][idx], numerical]
+
+    zcr_scaler, rms_scaler = scalers
+    model = build_head_model(
+        embedding_dim=EMBEDDING_DIM,
+        numerical_shape=(len(zcr_scaler.mean_) * 2,),
+        num_classes=num_classes,
+        zcr_scaler=zcr_scaler,
+        rms_scaler=rms_scaler,
+        numerical_units=params["numerical_units"],
+        numerical_dropout=params["numerical_dropout"],
+        head_units=params["head_units"],
+        head_dropout=params["head_dropout"],
+    )
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=params["learning_rate"]),
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    weights_path = os.path.join(trial_dir, "head.weights.h5")
+    if start_epoch > 0:
+        # Create the optimizer slots first so its saved state is restored along with the weights
+        model.optimizer.build(model.trainable_variables)
+        model.load_weights(weights_path)
+
+    history = model.fit(
+        _inputs(train_idx),
+        tf.keras.utils.to_categorical(labels[train_idx], num_classes=num_classes),
+        validation_data=(_inputs(val_idx), tf.keras.utils.to_categorical(labels[val_idx], num_classes=num_classes)),
+        batch_size=params["batch_size"],
+        initial_epoch=start_epoch,
+        epochs=end_epoch,
+        verbose=0
+    )
+    os.makedirs(trial_dir, exist_ok=True)
+    model.save_weights(weights_path)
+
+    return {
+        "trial": trial_id,
+        "rung": rung,
+        "epochs": end_epoch,
+        "params": params,
+        "val_loss": float(history.history["val_loss"][-1]),
+        "val_accuracy": float(history.history["val_accuracy"][-1]),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_search(config):
+    """
+    Searches the head's hyperparameters with ASHA over parallel worker processes.
+
+    The frozen-backbone embeddings and padded ZCR/RMS matrices are computed once
+    (the same cache as cross-validation) and every trial trains only the head on them.
+    Config keys: TUNING_TRIALS (default 27), TUNING_MIN_EPOCHS (1), TUNING_MAX_EPOCHS
+    (EPOCHS), TUNING_ETA (3), TUNING_METRIC ("val_loss" or "val_accuracy"),
+    TUNING_WORKERS (cores), TUNING_SPACE, TUNING_DIR ("tuning") and CV_CACHE_DIR.
+
+    Every rung result is appended to TUNING_DIR/trials.jsonl and the best configuration
+    is written to TUNING_DIR/best.json.
+
+    Returns:
+        The best result (params, metrics and the epochs it was trained for).
+    """
+    start = time.perf_counter()
+    num_trials = config.get("TUNING_TRIALS", 27)
+    max_epochs = config.get("TUNING_MAX_EPOCHS", config["EPOCHS"])
+    metric = config.get("TUNING_METRIC", "val_loss")
+    sign = -1 if metric == "val_accuracy" else 1
+    space = config.get("TUNING_SPACE", SEARCH_SPACE)
+    output_dir = config.get("TUNING_DIR", "tuning")
+    os.makedirs(output_dir, exist_ok=True)
+
+    df = load_labeled_dataframe(config["FEATURES_DIR"]).reset_index(drop=True)
+    label_encoder = LabelEncoder()
+    labels = label_encoder.fit_transform(df["emotion"])
+    num_classes = len(label_encoder.classes_)
+    feature_paths = prepare_shared_features(df, config, config.get("CV_CACHE_DIR", "cv_cache"))
+
+    strata = df["emotion"].astype(str) + "_" + df["language"].astype(str)
+    train_idx, val_idx = train_test_split(
+        np.arange(len(df)), test_size=config.get("CV_VAL_SPLIT", 0.2), random_state=42, stratify=strata
+    )
+    scalers = (
+        StandardScaler().fit(np.load(feature_paths["zcr"], mmap_mode="r")[train_idx]),
+        StandardScaler().fit(np.load(feature_paths["rms"], mmap_mode="r")[train_idx]),
+    )
+
+    scheduler = ASHAScheduler(config.get("TUNING_MIN_EPOCHS", 1), max_epochs, config.get("TUNING_ETA", 3))
+    rng = np.random.default_rng(config.get("TUNING_SEED", 42))
+    trials, trained_epochs, best = {}, 0, None
+    cpu_count = os.cpu_count() or 1
+    workers = config.get("TUNING_WORKERS") or cpu_count
+    threads = max(1, cpu_count // workers)
+    print(f"ASHA over {num_trials} trials, rungs {scheduler.rungs} epochs, {workers} workers...")
+
+    def _submit(executor, trial_id, rung):
+        start_epoch = scheduler.rungs[rung - 1] if rung > 0 else 0
+        return executor.submit(
+            run_trial, trial_id, trials[trial_id], rung, start_epoch, scheduler.rungs[rung],
+            feature_paths, labels, num_classes, train_idx, val_idx, scalers,
+            os.path.join(output_dir, f"trial_{trial_id:03d}"),
+        )
+
+    with open(os.path.join(output_dir, "trials.jsonl"), "w", encoding="utf-8") as log, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker_threads,
+        initargs=(threads,),
+    ) as executor:
+        running = set()
+        while True:
+            # Keep every worker busy: promote when possible, otherwise start a new trial
+            while len(running) < workers:
+                promotion = scheduler.next_promotion()
+                if promotion is not None:
+                    running.add(_submit(executor, *promotion))
+                elif len(trials) < num_trials:
+                    trial_id = len(trials)
+                    trials[trial_id] = sample_params(space, rng)
+                    running.add(_submit(executor, trial_id, 0))
+                else:
+                    break
+            if not running:
+                break
+
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                rung = result["rung"]
+                trained_epochs += result["epochs"] - (scheduler.rungs[rung - 1] if rung > 0 else 0)
+                scheduler.record(result["trial"], rung, sign * result[metric])
+                log.write(json.dumps(result) + "\n")
+                log.flush()
+                print(
+                    f"trial {result['trial']:3d} rung {rung} ({result['epochs']} epochs): "
+                    f"val_loss {result['val_loss']:.4f}, val_accuracy {result['val_accuracy']:.4f}"
+                )
+                # The best configuration is the best among trials trained the longest
+                if best is None or (result["epochs"], -sign * result[metric]) > (best["epochs"], -sign * best[metric]):
+                    best = result
+
+    grid_epochs = num_trials * max_epochs
+    best = {**best, "trained_epochs": trained_epochs, "full_budget_epochs": grid_epochs}
+    with open(os.path.join(output_dir, "best.json"), "w", encoding="utf-8") as f:
+        json.dump(best, f, indent=2)
+
+    print("\n--- Hyperparameter Search ---")
+    print(f"Best ({metric}, {best['epochs']} epochs): {best[metric]:.4f}")
+    print(f"Params: {best['params']}")
+    print(
+        f"Compute: {trained_epochs} epochs trained vs {grid_epochs} for full training of every trial "
+        f"({trained_epochs / grid_epochs:.0%}), wall-clock {time.perf_counter() - start:.1f}s"
+    )
+    print("-----------------------------\n")
+    return best
+
+
+if __name__ == '__main__':
+    run_search(load_config())
@@ -1,7 +1,7 @@
 import os
 import shutil
 from collections import defaultdict
-from utils.audio_metadado import get_audio_metadado
+from src.utils.audio_metadado import get_audio_metadado
 
 AUDIO_DICT = defaultdict(lambda: defaultdict(int))  # Count of audio files by language and emotion
 EMOTION_FILES = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))  # File details by language, emotion, and gender
@@ -9,13 +9,15 @@ DUPLICATION_INDICES = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
 REVERSE_ORDER = defaultdict(lambda: defaultdict(bool))  # Alternate gender selection order for balancing
 MAX_IDS = defaultdict(lambda: defaultdict(int))  # Track maximum ID for each language-emotion combination
 
+DATASET_DIR = "src//data//dataset"
 
-def read_data():
+
+def read_data(dataset_dir=DATASET_DIR):
     """
     Reads all WAV files from the dataset directory and populates the global data structures.
     Extracts metadata from each audio file and organizes it by language, emotion, and gender.
     """
-    for root, directories, files in os.walk("src//data//dataset"):
+    for root, directories, files in os.walk(dataset_dir):
         for file in files:
             if file.lower().endswith(".wav"):
 
@@ -39,7 +41,7 @@ def read_data():
                     continue
 
 
-def balance_all_emotions():
+def balance_all_emotions(dataset_dir=DATASET_DIR):
     """
     Balances the number of audio files across all emotions and gender by duplicating existing files.
     For each language-emotion combination that has fewer files than the maximum count,
@@ -98,7 +100,7 @@ def balance_all_emotions():
                 REVERSE_ORDER[language][emotion] = not REVERSE_ORDER[language][emotion]
 
     audio_dict_updated = defaultdict(lambda: defaultdict(int))
-    for root, directories, files in os.walk("src//data//dataset"):
+    for root, directories, files in os.walk(dataset_dir):
         for file in files:
             if file.lower().endswith(".wav"):
                 try:
@@ -112,6 +114,15 @@ def balance_all_emotions():
     return audio_dict_updated
 
 
+def balance_dataset(dataset_dir=DATASET_DIR):
+    """
+    Reads the dataset and balances it in place.
+    Returns the updated count of audio files by language and emotion.
+    """
+    read_data(dataset_dir)
+    return balance_all_emotions(dataset_dir)
+
+
 if __name__ == "__main__":
     read = read_data()
     balance = balance_all_emotions()
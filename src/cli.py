@@ -0,0 +1,287 @@
+"""
+Unified command line for the HybridSER pipeline.
+
+Usage: python -m src <command> [options]
+
+Only argparse and the standard library are imported at startup. Each command
+imports the modules it needs (librosa, TensorFlow, pandas, ...) inside its own
+handler, so `--help` and lightweight commands start quickly.
+"""
+import argparse
+import sys
+from src.utils.utils import load_config
+
+# Mirrors src.utils.resampling.QUALITY_TIERS, which is not imported at startup
+QUALITY_CHOICES = ["fast", "standard", "high"]
+
+
+def _config_value(key, fallback=None):
+    """Returns a config.json value, or `fallback` when the file or key is missing."""
+    try:
+        return load_config().get(key, fallback)
+    except FileNotFoundError:
+        return fallback
+
+
+def cmd_reorganize(args):
+    from src.utils.reorganize_data import reorganize_all
+
+    reorganize_all(dataset_base=args.source, output_root=args.output, sr=args.sr, quality=args.quality)
+
+
+def cmd_resample(args):
+    from src.utils.resampling import normalize_sample_rate
+
+    counts = normalize_sample_rate(args.source, sr=args.sr, quality=args.quality, workers=args.workers)
+    if counts["failed"]:
+        return 1
+
+
+def cmd_trim(args):
+    from src.utils.trimming import trim_directory
+
+    summary = trim_directory(args.source, top_db=args.top_db, margin=args.margin, workers=args.workers)
+    if summary["failed"]:
+        return 1
+
+
+def cmd_balance(args):
+    from src.balance import balance_dataset
+
+    counts = balance_dataset(args.dataset)
+    for language, emotions in counts.items():
+        print(f"{language}: {dict(emotions)}")
+
+
+def cmd_augment(args):
+    from src.data_augmentation import process_directory
+
+    process_directory(args.source, args.output)
+
+
+def cmd_extract(args):
+    from src.utils.extract_lib import process_dataset, rename_feature_directories
+
+    print("--- Starting Feature Extraction ---")
+    process_dataset(args.source, args.output, image_format=args.image_format, quality=args.quality)
+    print("\n--- Feature extraction complete! ---")
+
+    if not args.no_rename:
+        print("\n--- Starting Directory Renaming ---")
+        rename_feature_directories(args.output)
+
+    if args.jpeg:
+        from src.PoCs.MultiModalTraining.data_loader import convert_png_to_jpeg
+
+        convert_png_to_jpeg(args.output, quality=args.quality, workers=args.workers)
+
+
+def cmd_pack(args):
+    from src.utils.waveform_store import pack_waveforms
+
+    pack_waveforms(args.source, args.output, sr=args.sr, dtype=args.dtype, workers=args.workers, quality=args.quality)
+
+
+def cmd_train(args):
+    if args.workers and args.workers > 1:
+        from src.PoCs.MultiModalTraining.distributed import train_distributed
+
+        return train_distributed(args.workers)
+
+    from src.PoCs.MultiModalTraining import train
+
+    train.main()
+
+
+def cmd_tune(args):
+    from src.PoCs.MultiModalTraining.tuning import run_search
+
+    config = load_config()
+    if args.trials is not None:
+        config["TUNING_TRIALS"] = args.trials
+    if args.workers is not None:
+        config["TUNING_WORKERS"] = args.workers
+    run_search(config)
+
+
+def cmd_export(args):
+    from src.PoCs.MultiModalTraining import export_serving
+
+    export_serving.main(args.export_args)
+
+
+def cmd_infer(args):
+    from src.PoCs.MultiModalTraining import infer
+
+    infer.main(args.infer_args)
+
+
+def cmd_stats(args):
+    from src.utils.data_visualisers import analyze_shapes, audio_stats, print_audio_stats
+
+    if args.features_dir:
+        analyze_shapes(args.features_dir, plot=args.plot, workers=args.workers)
+    if args.audio_dir:
+        print_audio_stats(audio_stats(args.audio_dir, workers=args.workers))
+
+
+def cmd_pipeline(args):
+    from src.pipeline import Pipeline, STATE_FILE, default_stages
+
+    config = load_config()
+    pipeline = Pipeline(
+        default_stages(config),
+        state_path=config.get("PIPELINE_STATE", STATE_FILE),
+        workers=args.workers or config.get("PIPELINE_WORKERS", 2),
+    )
+    status = pipeline.run(force=args.force, dry_run=args.dry_run)
+    if any(s in ("failed", "blocked") for s in status.values()):
+        return 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="HybridSER pipeline commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("reorganize", help="Rename and relocate the raw corpora into the mono dataset tree.")
+    p.add_argument("--source", default="src//data//dataset_base", help="Folder holding VERBO, CaFE and RAVDESS.")
+    p.add_argument("--output", default="src//data//dataset", help="Destination dataset folder.")
+    p.add_argument("--sr", type=int, default=None, help="Canonical sample rate (default: CANONICAL_SAMPLE_RATE or 16000).")
+    p.add_argument(
+        "--quality", choices=QUALITY_CHOICES, default=None, help="Resampling quality (default: RESAMPLE_QUALITY or high)."
+    )
+    p.set_defaults(func=cmd_reorganize)
+
+    p = subparsers.add_parser("resample", help="Bring every clip of a folder to the canonical sample rate, in place.")
+    p.add_argument("--source", default="src//data//dataset", help="Folder with the WAV/FLAC files.")
+    p.add_argument("--sr", type=int, default=None, help="Canonical sample rate (default: CANONICAL_SAMPLE_RATE or 16000).")
+    p.add_argument(
+        "--quality", choices=QUALITY_CHOICES, default=None, help="Resampling quality (default: RESAMPLE_QUALITY or high)."
+    )
+    p.add_argument("--workers", type=int, default=None, help="Resampling processes (default: all cores).")
+    p.set_defaults(func=cmd_resample)
+
+    p = subparsers.add_parser("trim", help="Cut leading/trailing silence in place and record the boundaries.")
+    p.add_argument("--source", default="src//data//dataset", help="Folder with the WAV/FLAC files.")
+    p.add_argument(
+        "--top-db", type=float, default=None, help="Silence threshold below the loudest frame (default: TRIM_TOP_DB or 40)."
+    )
+    p.add_argument("--margin", type=float, default=None, help="Seconds kept around speech (default: TRIM_MARGIN or 0.05).")
+    p.add_argument("--workers", type=int, default=None, help="Trimming processes (default: all cores).")
+    p.set_defaults(func=cmd_trim)
+
+    p = subparsers.add_parser("balance", help="Duplicate files so every language/emotion has the same count.")
+    p.add_argument("--dataset", default="src//data//dataset", help="Dataset folder to balance in place.")
+    p.set_defaults(func=cmd_balance)
+
+    p = subparsers.add_parser("augment", help="Generate pitch/time/noise augmented copies of every clip.")
+    p.add_argument("--source", default="src//data//dataset", help="Folder with the source WAV files.")
+    p.add_argument("--output", default="src//data//augmented", help="Folder for the augmented WAV files.")
+    p.set_defaults(func=cmd_augment)
+
+    p = subparsers.add_parser("extract", help="Extract dd-MFCC, chromagram, ZCR and RMS features.")
+    p.add_argument("--source", default=None, help="Audio folder (default: DATASET_FOLDER).")
+    p.add_argument("--output", default=None, help="Features folder (default: OUTPUT_FOLDER_RAW_FEATURES).")
+    p.add_argument("--no-rename", action="store_true", help="Skip renaming the feature directories.")
+    p.add_argument(
+        "--image-format", choices=["png", "jpeg"], default=None, help="Image codec written (default: IMAGE_FORMAT or png)."
+    )
+    p.add_argument("--quality", type=int, default=None, help="Image quality (default: IMAGE_QUALITY or 90).")
+    p.add_argument("--jpeg", action="store_true", help="Convert the PNG images to JPEG afterwards (resumable).")
+    p.add_argument("--workers", type=int, default=8, help="Threads used for the JPEG conversion.")
+    p.set_defaults(func=cmd_extract)
+
+    p = subparsers.add_parser("pack", help="Resample every clip once into a memory-mapped waveform store.")
+    p.add_argument("--source", default="src//data//augmented", help="Folder with the audio files.")
+    p.add_argument("--output", default=None, help="Store folder (default: WAVEFORM_STORE_DIR).")
+    p.add_argument(
+        "--sr", type=int, default=None,
+        help="Target sample rate (default: WAVEFORM_SAMPLE_RATE, CANONICAL_SAMPLE_RATE or 16000)."
+    )
+    p.add_argument("--dtype", choices=["int16", "float32"], default=None, help="Sample type (default: int16).")
+    p.add_argument(
+        "--quality", choices=QUALITY_CHOICES, default=None,
+        help="Quality for clips not already at --sr (default: RESAMPLE_QUALITY or high)."
+    )
+    p.add_argument("--workers", type=int, default=None, help="Decoding processes (default: all cores).")
+    p.set_defaults(func=cmd_pack)
+
+    p = subparsers.add_parser("train", help="Train the multimodal model using config.json.")
+    p.add_argument("--workers", type=int, default=None, help="Data-parallel worker processes (default: single process).")
+    p.set_defaults(func=cmd_train)
+
+    p = subparsers.add_parser("tune", help="Search the head's hyperparameters with successive halving (ASHA).")
+    p.add_argument("--trials", type=int, default=None, help="Configurations sampled (default: TUNING_TRIALS or 27).")
+    p.add_argument("--workers", type=int, default=None, help="Trials trained concurrently (default: all cores).")
+    p.set_defaults(func=cmd_tune)
+
+    p = subparsers.add_parser(
+        "infer", help="Batch inference over audio files (see `python -m src infer -h`).", add_help=False
+    )
+    p.add_argument("infer_args", nargs=argparse.REMAINDER, help="Arguments forwarded to the inference command.")
+    p.set_defaults(func=cmd_infer)
+
+    p = subparsers.add_parser(
+        "export", help="Export a SavedModel from raw waveform to label (see `python -m src export -h`).", add_help=False
+    )
+    p.add_argument("export_args", nargs=argparse.REMAINDER, help="Arguments forwarded to the export command.")
+    p.set_defaults(func=cmd_export)
+
+    p = subparsers.add_parser("stats", help="Summarize .npy feature shapes and audio durations from file headers.")
+    p.add_argument("--features-dir", default=None, help="Features folder (default: FEATURES_DIR).")
+    p.add_argument("--audio-dir", default=None, help="Also summarize the audio files of this folder.")
+    p.add_argument("--plot", action="store_true", help="Show the shape distribution chart.")
+    p.add_argument("--workers", type=int, default=8, help="Threads used to scan folders and read headers.")
+    p.set_defaults(func=cmd_stats)
+
+    p = subparsers.add_parser("pipeline", help="Run every stage in dependency order, skipping unchanged ones.")
+    p.add_argument("--force", nargs="*", default=[], metavar="STAGE", help="Stages to rebuild regardless of cache.")
+    p.add_argument("--dry-run", action="store_true", help="Only show which stages would run.")
+    p.add_argument("--workers", type=int, default=None, help="Stages run concurrently (default: PIPELINE_WORKERS or 2).")
+    p.set_defaults(func=cmd_pipeline)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+
+    # infer and export own their options (including -h), so everything after them is forwarded untouched
+    if argv[:1] == ["infer"]:
+        return cmd_infer(argparse.Namespace(infer_args=argv[1:]))
+    if argv[:1] == ["export"]:
+        return cmd_export(argparse.Namespace(export_args=argv[1:]))
+
+    args = parser.parse_args(argv)
+
+    # Config-backed defaults are only resolved for the command being run
+    if args.command == "extract":
+        args.source = args.source or _config_value("DATASET_FOLDER")
+        args.output = args.output or _config_value("OUTPUT_FOLDER_RAW_FEATURES")
+        args.image_format = args.image_format or _config_value("IMAGE_FORMAT", "png")
+        args.quality = args.quality or _config_value("IMAGE_QUALITY", 90)
+        if not args.source or not args.output:
+            parser.error("extract needs --source/--output or DATASET_FOLDER/OUTPUT_FOLDER_RAW_FEATURES in config.json")
+    elif args.command in ("reorganize", "resample"):
+        args.sr = args.sr or _config_value("CANONICAL_SAMPLE_RATE", 16000)
+        args.quality = args.quality or _config_value("RESAMPLE_QUALITY", "high")
+    elif args.command == "trim":
+        args.top_db = args.top_db if args.top_db is not None else _config_value("TRIM_TOP_DB", 40.0)
+        args.margin = args.margin if args.margin is not None else _config_value("TRIM_MARGIN", 0.05)
+    elif args.command == "pack":
+        args.output = args.output or _config_value("WAVEFORM_STORE_DIR", "src//data//waveforms")
+        args.sr = args.sr or _config_value("WAVEFORM_SAMPLE_RATE", _config_value("CANONICAL_SAMPLE_RATE", 16000))
+        args.dtype = args.dtype or _config_value("WAVEFORM_DTYPE", "int16")
+        args.quality = args.quality or _config_value("RESAMPLE_QUALITY", "high")
+    elif args.command == "stats":
+        if not args.audio_dir:
+            args.features_dir = args.features_dir or _config_value("FEATURES_DIR")
+        if not args.features_dir and not args.audio_dir:
+            parser.error("stats needs --features-dir, --audio-dir or FEATURES_DIR in config.json")
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
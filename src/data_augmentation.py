@@ -3,7 +3,9 @@ import librosa
 import numpy as np
 import random
 import soundfile as sf
-from utils.audio_metadado import get_audio_metadado
+from src.utils.audio_metadado import get_audio_metadado
+from src.utils.kernels import add_awgn
+from src.utils.memory_profile import get_profiler
 
 
 SNR_LOW = [23, 30]
@@ -15,6 +17,10 @@ RATE_HIGH = [[1.04, 1.1], [0.9, 0.96]]
 N_STEPS_FEMALE = [[2, 3], [1, 2]]  # N_STEPS [[high], [low]]
 N_STEPS_MALE = [[-3, -2], [-2, -1]]
 
+# "numba" adds the noise in place in float32 (src.utils.kernels.add_awgn),
+# "numpy" builds float64 noise and signal copies
+KERNEL_BACKEND = "numba"
+
 COMBINATIONS = [
     "pitch",
     "time",
@@ -66,6 +72,12 @@ def time_stretch(audio, rate):
 
 
 def awgn(audio, snr_db):
+    """
+    Adds white Gaussian noise at `snr_db`. With the numba backend a float32 `audio` is
+    modified in place (aplly_transforms only passes its own working copy).
+    """
+    if KERNEL_BACKEND == "numba":
+        return add_awgn(np.ascontiguousarray(audio, dtype=np.float32), snr_db)
     snr = 10 ** (snr_db / 10)
     power = np.mean(audio**2)
     noise_power = power / snr
@@ -92,13 +104,12 @@ def aplly_transforms(audio, sr, gender, intensity, combination):
     return audio_transformed
 
 
-def process_directory(directory_source):
+def process_directory(directory_source, directory_augmented=os.path.join("src//data", "augmented")):
     """
     Processes all WAV audio files in the source directory and generates augmented versions.
     For each audio file, applies multiple transformation combinations at different intensity levels,
     organizes output by emotion categories, and saves with descriptive filenames containing metadata.
     """
-    directory_augmented = os.path.join("src//data", "augmented")
     os.makedirs(directory_augmented, exist_ok=True)
 
     count_id = 0
@@ -110,34 +121,39 @@ def process_directory(directory_source):
                 complete_path = os.path.join(root, file)
                 files_wav.append(complete_path)
 
-    for path_file in files_wav:
-        file = os.path.basename(path_file)
+    profiler = get_profiler()
+    with profiler.stage("augmentation"):
+        for path_file in files_wav:
+            file = os.path.basename(path_file)
 
-        try:
-            meta = get_audio_metadado(file)
+            try:
+                meta = get_audio_metadado(file)
 
-            emotion_dir = os.path.join(directory_augmented, meta.emotion)
-            os.makedirs(emotion_dir, exist_ok=True)
+                emotion_dir = os.path.join(directory_augmented, meta.emotion)
+                os.makedirs(emotion_dir, exist_ok=True)
 
-            audio, sr = librosa.load(path_file)
+                # Clips are stored at the canonical rate (src.utils.resampling), so no resampling here
+                audio, sr = librosa.load(path_file, sr=None)
 
-            for intensity in [0, 1]:
-                for combination in COMBINATIONS:
-                    audio_augmented = aplly_transforms(
-                        audio, sr, meta.gender, intensity, combination
-                    )
+                for intensity in [0, 1]:
+                    for combination in COMBINATIONS:
+                        audio_augmented = aplly_transforms(
+                            audio, sr, meta.gender, intensity, combination
+                        )
 
-                    new_id = f"{meta.id}_{count_id}"
-                    new_name = f"{meta.language}_{meta.gender}_{meta.emotion}_{new_id}_{intensity}_{combination}.wav"
-                    new_path = os.path.join(emotion_dir, new_name)
+                        new_id = f"{meta.id}_{count_id}"
+                        new_name = f"{meta.language}_{meta.gender}_{meta.emotion}_{new_id}_{intensity}_{combination}.wav"
+                        new_path = os.path.join(emotion_dir, new_name)
 
-                    sf.write(new_path, audio_augmented, sr)
+                        sf.write(new_path, audio_augmented, sr)
 
-                    count_id += 1
+                        count_id += 1
 
-        except ValueError as e:
-            print(f"Error {file}: {e}")
-            continue
+            except ValueError as e:
+                print(f"Error {file}: {e}")
+                continue
+            finally:
+                profiler.tick()
 
     print("Data Augmentation ended...")
 
@@ -0,0 +1,304 @@
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+STATE_FILE = ".pipeline_state.json"
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline.
+
+    target is a "module:function" path imported only when the stage runs, params are
+    passed to it as keyword arguments, and overrides replace module-level settings
+    (e.g. data_augmentation.SNR_LOW) before the call. inputs and outputs are files or
+    directories; deps names the stages that must finish first.
+    """
+
+    name: str
+    target: str
+    params: Dict = field(default_factory=dict)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    overrides: Dict = field(default_factory=dict)
+    # Delete the outputs before rebuilding (for stages whose outputs are fully derived)
+    clean_outputs: bool = False
+
+
+def fingerprint_paths(paths):
+    """
+    Hashes the relative path, size and modification time of every file under `paths`.
+    File contents are not read, so fingerprinting a large tree stays cheap.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"path:{path}\n".encode())
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                stat = os.stat(full_path)
+                rel_path = os.path.relpath(full_path, path)
+                digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def stage_fingerprint(stage):
+    """Combines a stage's code target, parameters and current input files into one hash."""
+    definition = json.dumps(
+        {"target": stage.target, "params": stage.params, "overrides": stage.overrides},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(definition.encode())
+    digest.update(fingerprint_paths(stage.inputs).encode())
+    return digest.hexdigest()
+
+
+def run_stage(stage):
+    """Imports and runs a stage's target. Executed inside a worker process."""
+    module_name, function_name = stage.target.split(":")
+    module = importlib.import_module(module_name)
+    for attribute, value in stage.overrides.items():
+        setattr(module, attribute, value)
+
+    if stage.clean_outputs:
+        for output in stage.outputs:
+            if os.path.isdir(output):
+                shutil.rmtree(output)
+            elif os.path.isfile(output):
+                os.remove(output)
+
+    getattr(module, function_name)(**stage.params)
+
+
+def topological_order(stages):
+    """
+    Returns the stages ordered so every stage comes after its dependencies.
+    Raises ValueError on unknown dependencies or cycles.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    ordered, visiting, done = [], set(), set()
+
+    def _visit(stage):
+        if stage.name in done:
+            return
+        if stage.name in visiting:
+            raise ValueError(f"Dependency cycle through stage '{stage.name}'.")
+        visiting.add(stage.name)
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'.")
+            _visit(by_name[dep])
+        visiting.discard(stage.name)
+        done.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        _visit(stage)
+    return ordered
+
+
+class Pipeline:
+    """
+    Runs a dependency graph of stages, skipping those whose inputs and parameters are
+    unchanged since their last successful run and running independent stages concurrently.
+
+    A stage's fingerprint is recorded after it runs, from the state its inputs are left
+    in, and taken again for every successful stage once the whole run is over. Stages
+    that edit a shared tree in place (resample, trim and balance on the dataset, rename
+    on the features) change the inputs of the stages before them, so only the final state
+    describes what a later run will find; recording it means an unchanged tree skips them
+    all. Stages that edit the same tree must therefore be ordered through deps. Upstream
+    changes reach downstream stages through the files they share.
+    """
+
+    def __init__(self, stages, state_path=STATE_FILE, workers=2):
+        self.stages = {stage.name: stage for stage in topological_order(stages)}
+        self.state_path = state_path
+        self.workers = workers
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def is_up_to_date(self, stage):
+        if not all(os.path.exists(output) for output in stage.outputs):
+            return False
+        return self.state.get(stage.name) == stage_fingerprint(stage)
+
+    def run(self, force=(), dry_run=False):
+        """
+        Executes the pipeline.
+
+        Args:
+            force: Names of stages to rebuild even if they are up to date.
+            dry_run (bool): Only report what would run, assuming every stage that runs changes its outputs.
+
+        Returns:
+            A dict mapping each stage name to "skipped", "ran", "failed" or "blocked"
+            (or "would run" in a dry run).
+        """
+        status = {}
+        pending = list(self.stages)
+
+        if dry_run:
+            for name in pending:
+                stage = self.stages[name]
+                stale = name in force or any(status[d] == "would run" for d in stage.deps)
+                status[name] = "would run" if stale or not self.is_up_to_date(stage) else "skipped"
+                print(f"[pipeline] {name}: {status[name]}")
+            return status
+
+        running = {}
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(status.get(d) in ("failed", "blocked") for d in stage.deps):
+                        status[name] = "blocked"
+                        pending.remove(name)
+                        print(f"[pipeline] {name}: blocked by a failed dependency")
+                    elif all(status.get(d) in ("ran", "skipped") for d in stage.deps):
+                        pending.remove(name)
+                        if name not in force and self.is_up_to_date(stage):
+                            status[name] = "skipped"
+                            print(f"[pipeline] {name}: up to date, skipped")
+                        else:
+                            print(f"[pipeline] {name}: running")
+                            running[executor.submit(run_stage, stage)] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        status[name] = "failed"
+                        print(f"[pipeline] {name}: failed ({e})")
+                        continue
+                    status[name] = "ran"
+                    self.state[name] = stage_fingerprint(self.stages[name])
+                    self._save_state()
+                    print(f"[pipeline] {name}: done")
+
+        for name, result in status.items():
+            if result in ("ran", "skipped"):
+                self.state[name] = stage_fingerprint(self.stages[name])
+        self._save_state()
+        return status
+
+
+def default_stages(config):
+    """
+    Builds the project's pipeline from config.json:
+    reorganize -> resample -> (trim) -> balance -> augment -> extract -> rename -> jpeg -> (train, stats).
+    With IMAGE_FORMAT "jpeg" extraction writes JPEG directly and the jpeg stage finds nothing to convert.
+    Likewise reorganize already writes clips at CANONICAL_SAMPLE_RATE, so resample only has
+    work on trees reorganized before (or at another rate); no later stage resamples.
+    With TRIM_SILENCE, a trim stage cuts leading/trailing silence (TRIM_TOP_DB, TRIM_MARGIN)
+    right after resampling, so balancing, augmentation and extraction only see speech.
+
+    AUGMENTATION_SETTINGS (a dict of data_augmentation constants such as SNR_LOW or
+    RATE_HIGH) is part of the augment stage's parameters, so changing one setting
+    rebuilds augmentation and whatever consumes its output, nothing upstream.
+    EXTRACTION_SETTINGS does the same for extract_lib constants such as KERNEL_BACKEND.
+    """
+    dataset_base = config.get("DATASET_BASE", "src//data//dataset_base")
+    dataset = config.get("DATASET_DIR", "src//data//dataset")
+    augmented = config.get("AUGMENTED_DIR", "src//data//augmented")
+    extraction_source = config.get("DATASET_FOLDER", augmented)
+    raw_features = config.get("OUTPUT_FOLDER_RAW_FEATURES", "src//data//features")
+    features = config.get("FEATURES_DIR", raw_features)
+    config_path = config.get("CONFIG_PATH", "config.json")
+    sample_rate = {"sr": config.get("CANONICAL_SAMPLE_RATE", 16000), "quality": config.get("RESAMPLE_QUALITY", "high")}
+
+    ingest = [
+        Stage(
+            "reorganize", "src.utils.reorganize_data:reorganize_all",
+            params={"dataset_base": dataset_base, "output_root": dataset, **sample_rate},
+            inputs=[dataset_base], outputs=[dataset],
+        ),
+        Stage(
+            "resample", "src.utils.resampling:normalize_sample_rate",
+            params={"directory": dataset, **sample_rate},
+            inputs=[dataset], outputs=[dataset], deps=["reorganize"],
+        ),
+    ]
+    if config.get("TRIM_SILENCE", False):
+        ingest.append(Stage(
+            "trim", "src.utils.trimming:trim_directory",
+            params={
+                "directory": dataset, "top_db": config.get("TRIM_TOP_DB", 40.0), "margin": config.get("TRIM_MARGIN", 0.05)
+            },
+            inputs=[dataset], outputs=[dataset], deps=["resample"],
+        ))
+
+    return ingest + [
+        Stage(
+            "balance", "src.balance:balance_dataset",
+            params={"dataset_dir": dataset},
+            inputs=[dataset], outputs=[dataset], deps=[ingest[-1].name],
+        ),
+        Stage(
+            "augment", "src.data_augmentation:process_directory",
+            params={"directory_source": dataset, "directory_augmented": augmented},
+            overrides=config.get("AUGMENTATION_SETTINGS", {}),
+            inputs=[dataset], outputs=[augmented], deps=["balance"], clean_outputs=True,
+        ),
+        Stage(
+            "extract", "src.utils.extract_lib:process_dataset",
+            params={
+                "source_root": extraction_source,
+                "output_root": raw_features,
+                "image_format": config.get("IMAGE_FORMAT", "png"),
+                "quality": config.get("IMAGE_QUALITY", 90),
+            },
+            overrides=config.get("EXTRACTION_SETTINGS", {}),
+            inputs=[extraction_source], outputs=[raw_features], deps=["augment"], clean_outputs=True,
+        ),
+        Stage(
+            "rename", "src.utils.extract_lib:rename_feature_directories",
+            params={"root_dir": raw_features},
+            inputs=[raw_features], outputs=[raw_features], deps=["extract"],
+        ),
+        Stage(
+            "jpeg", "src.PoCs.MultiModalTraining.data_loader:convert_png_to_jpeg",
+            params={"directory": features, "quality": config.get("IMAGE_QUALITY", 90)},
+            inputs=[features], outputs=[features], deps=["rename"],
+        ),
+        Stage(
+            "train", "src.PoCs.MultiModalTraining.train:main",
+            inputs=[features, config_path], outputs=["best_model.keras"], deps=["jpeg"],
+        ),
+        Stage(
+            "stats", "src.utils.data_visualisers:analyze_shapes",
+            params={"directory_path": features, "plot": False},
+            inputs=[features], deps=["jpeg"],
+        ),
+    ]
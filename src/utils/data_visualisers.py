@@ -1,17 +1,66 @@
 import os
 import numpy as np  # type: ignore
-import matplotlib.pyplot as plt  # type: ignore
-from collections import Counter
-from typing import List, Tuple, Dict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Optional
 from src.utils.utils import load_config
+from src.utils.audio_metadado import get_audio_metadado
 
 
-def find_npy_shapes(directory_path: str) -> List[Tuple[int, ...]]:
+def find_files(directory_path: str, suffixes: Tuple[str, ...], workers: int = 8) -> List[str]:
+    """
+    Recursively lists the files under a directory whose names end with one of `suffixes`.
+    Each top-level subdirectory is walked in its own thread, so large trees on
+    network or spinning disks are listed in parallel.
+
+    Args:
+        directory_path (str): The path to the directory to scan.
+        suffixes (tuple): Lower-case file name endings to keep, e.g. (".npy",).
+        workers (int): Number of threads walking subdirectories.
+
+    Returns:
+        A sorted list of matching file paths.
+    """
+    def _walk(path):
+        found = []
+        for root, _, files in os.walk(path):
+            found.extend(os.path.join(root, f) for f in files if f.lower().endswith(suffixes))
+        return found
+
+    paths, subdirs = [], []
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.name.lower().endswith(suffixes):
+                paths.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for found in executor.map(_walk, subdirs):
+            paths.extend(found)
+    return sorted(paths)
+
+
+def read_npy_shape(path: str) -> Tuple[int, ...]:
+    """
+    Reads an array's shape from its .npy header without loading the data.
+    Headers of every format version NumPy reads (1.0, 2.0 and the utf-8 3.0) are parsed
+    by NumPy's own dispatcher, which raises ValueError on any other version.
+    """
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        shape, _, _ = np.lib.format._read_array_header(f, version)
+    return shape
+
+
+def find_npy_shapes(directory_path: str, workers: int = 8) -> List[Tuple[int, ...]]:
     """
     Recursively walks a directory, finds .npy files, and returns a list of their shapes.
+    Only the .npy headers are read, in parallel threads.
 
     Args:
         directory_path (str): The path to the directory to scan.
+        workers (int): Number of threads listing directories and reading headers.
 
     Returns:
         A list containing the shape tuples of all found .npy arrays.
@@ -23,21 +72,104 @@ def find_npy_shapes(directory_path: str) -> List[Tuple[int, ...]]:
 
     print(f"Scanning directory: {directory_path}")
 
-    # os.walk generates the file names in a directory tree
-    for root, _, files in os.walk(directory_path):
-        for filename in files:
-            if filename.endswith(".npy"):
-                full_path = os.path.join(root, filename)
-                try:
-                    # Load the array to get its shape
-                    array = np.load(full_path)
-                    shapes_list.append(array.shape)
-                except Exception as e:
-                    print(f"Error loading file {full_path}: {e}")
+    def _read(full_path):
+        try:
+            return read_npy_shape(full_path)
+        except Exception as e:
+            print(f"Error loading file {full_path}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for shape in executor.map(_read, find_files(directory_path, (".npy",), workers)):
+            if shape is not None:
+                shapes_list.append(shape)
 
     return shapes_list
 
 
+def read_audio_header(path: str) -> Optional[Dict]:
+    """
+    Reads duration, sample rate and channel count from an audio file header via soundfile.info,
+    without decoding samples. Language, gender and emotion come from the standardized file name
+    when it follows the {language}_{gender}_{emotion}_{id} pattern.
+    """
+    import soundfile as sf  # type: ignore
+
+    try:
+        info = sf.info(path)
+    except Exception as e:
+        print(f"Error reading header of {path}: {e}")
+        return None
+
+    try:
+        meta = get_audio_metadado(os.path.basename(path))
+    except ValueError:
+        meta = None
+
+    return {
+        "path": path,
+        "duration": info.duration,
+        "samplerate": info.samplerate,
+        "channels": info.channels,
+        "language": meta.language if meta else "unknown",
+        "gender": meta.gender if meta else "unknown",
+        "emotion": meta.emotion if meta else "unknown",
+    }
+
+
+def audio_stats(directory_path: str, workers: int = 8) -> Dict:
+    """
+    Summarizes the audio files of a directory from their headers only.
+
+    Returns:
+        A dict with the file count, total hours, sample-rate and channel counts, and
+        per-emotion, per-language and per-gender counts and duration statistics (seconds).
+    """
+    paths = find_files(directory_path, (".wav", ".flac", ".ogg"), workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        headers = [h for h in executor.map(read_audio_header, paths) if h is not None]
+
+    def _by(key):
+        groups = defaultdict(list)
+        for h in headers:
+            groups[h[key]].append(h["duration"])
+        return {
+            name: {
+                "count": len(durations),
+                "total": float(np.sum(durations)),
+                "mean": float(np.mean(durations)),
+                "min": float(np.min(durations)),
+                "max": float(np.max(durations)),
+            }
+            for name, durations in sorted(groups.items())
+        }
+
+    return {
+        "files": len(headers),
+        "total_hours": sum(h["duration"] for h in headers) / 3600,
+        "samplerates": dict(Counter(h["samplerate"] for h in headers)),
+        "channels": dict(Counter(h["channels"] for h in headers)),
+        "by_emotion": _by("emotion"),
+        "by_language": _by("language"),
+        "by_gender": _by("gender"),
+    }
+
+
+def print_audio_stats(stats: Dict):
+    """Prints the summary produced by audio_stats."""
+    print("\n--- Audio Summary ---")
+    print(f"Total audio files: {stats['files']} ({stats['total_hours']:.2f} h)")
+    print(f"Sample rates: {stats['samplerates']}")
+    print(f"Channels: {stats['channels']}")
+    for title, key in (("emotion", "by_emotion"), ("language", "by_language"), ("gender", "by_gender")):
+        print(f"\nBy {title}:")
+        for name, d in stats[key].items():
+            print(
+                f"  - {name}: {d['count']} files, {d['total'] / 60:.1f} min "
+                f"(mean {d['mean']:.2f}s, min {d['min']:.2f}s, max {d['max']:.2f}s)"
+            )
+
+
 def plot_shape_distribution(shape_counts: Dict[Tuple[int, ...], int]):
     """
     Creates and displays a horizontal bar chart from a dictionary of shape counts.
@@ -45,6 +177,9 @@ def plot_shape_distribution(shape_counts: Dict[Tuple[int, ...], int]):
     Args:
         shape_counts: A dictionary with shape tuples as keys and their counts as values.
     """
+    # Imported here so shape scans don't pay for loading matplotlib
+    import matplotlib.pyplot as plt  # type: ignore
+
     if not shape_counts:
         print("No data available to plot.")
         return
@@ -71,27 +206,45 @@ def plot_shape_distribution(shape_counts: Dict[Tuple[int, ...], int]):
     plt.show()
 
 
-# --- Main execution block ---
-if __name__ == "__main__":
-    config = load_config()
+def analyze_shapes(directory_path: str, plot: bool = True, workers: int = 8) -> Dict[Tuple[int, ...], int]:
+    """
+    Scans a directory for .npy files, prints a summary of their shapes and optionally plots it.
 
+    Args:
+        directory_path (str): The path to the directory to scan.
+        plot (bool): Whether to display the shape distribution chart.
+        workers (int): Number of threads used for the scan.
+
+    Returns:
+        A dictionary with shape tuples as keys and their counts as values.
+    """
     # 1. Find all .npy shapes in the target directory
-    all_shapes = find_npy_shapes(config["FEATURES_DIR"])
+    all_shapes = find_npy_shapes(directory_path, workers)
 
-    if all_shapes:
-        # 2. Count the frequency of each unique shape
-        shape_counts = Counter(all_shapes)
+    if not all_shapes:
+        print("\nAnalysis complete. No .npy files were found.")
+        return {}
+
+    # 2. Count the frequency of each unique shape
+    shape_counts = Counter(all_shapes)
 
-        print("\n--- Analysis Summary ---")
-        print(f"Total .npy files found: {len(all_shapes)}")
-        print(f"Unique shapes found: {len(shape_counts)}")
+    print("\n--- Analysis Summary ---")
+    print(f"Total .npy files found: {len(all_shapes)}")
+    print(f"Unique shapes found: {len(shape_counts)}")
 
-        print("\nCounts by shape:")
-        for shape, count in shape_counts.items():
-            print(f"  - Shape {shape}: {count} occurrences")
+    print("\nCounts by shape:")
+    for shape, count in shape_counts.items():
+        print(f"  - Shape {shape}: {count} occurrences")
 
+    if plot:
         print("\nGenerating plot...")
         # 3. Plot the results
         plot_shape_distribution(shape_counts)
-    else:
-        print("\nAnalysis complete. No .npy files were found.")
+
+    return dict(shape_counts)
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    config = load_config()
+    analyze_shapes(config["FEATURES_DIR"])
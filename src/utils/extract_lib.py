@@ -1,24 +1,37 @@
+import functools
+import io
 import os
 import librosa  # type: ignore
 import librosa.display  # type: ignore
 import matplotlib.pyplot as plt  # type: ignore
 import numpy as np  # type: ignore
 from pathlib import Path
-from utils import load_config
+from src.utils.image_codec import IMAGE_EXTENSIONS, encode_image
+from src.utils.kernels import frame_zcr_rms
+from src.utils.resampling import CANONICAL_SAMPLE_RATE, resample
+from src.utils.utils import load_config
+from src.utils.memory_profile import get_profiler
+
+# "numba" computes ZCR and RMS with the fused kernel of src.utils.kernels,
+# "librosa" with librosa.feature; both give the same values. The pipeline sets it
+# from EXTRACTION_SETTINGS in config.json
+KERNEL_BACKEND = "numba"
 
 
 # --- New Helper Function to Save Spectrogram Kernel ---
-def save_spec_as_image(spec_data, file_path, sr, y_axis=None):
+def save_spec_as_image(spec_data, file_path, sr, y_axis=None, image_format=None):
     """
     Generates and saves a spectrogram image without axes, borders, or colorbars.
     This function saves only the core content of the plot.
 
     Args:
         spec_data (np.ndarray): The spectrogram data from librosa.
-        file_path (Path or str): The full path to save the image file.
+        file_path (Path, str or file-like): The full path (or buffer) to save the image to.
         sr (int): The sampling rate of the audio.
         y_axis (str, optional): The y-axis type for specshow, e.g., 'chroma'.
                                 Defaults to None.
+        image_format (str, optional): Image format, required when file_path is a buffer.
+                                      Defaults to the file extension.
     """
     # Create a figure and an axes object. The axes will cover the entire figure.
     fig = plt.figure(figsize=(4, 4), dpi=100)  # DPI can be adjusted for resolution
@@ -32,20 +45,112 @@ def save_spec_as_image(spec_data, file_path, sr, y_axis=None):
     # Save the figure.
     # - bbox_inches='tight' crops the figure to the plotted data.
     # - pad_inches=0 removes any padding around the cropped area.
-    plt.savefig(file_path, bbox_inches="tight", pad_inches=0)
+    plt.savefig(file_path, bbox_inches="tight", pad_inches=0, format=image_format)
 
     # Close the figure to free up memory
     plt.close(fig)
 
 
-def extract_features(audio_path, output_dir):
+def render_spec_jpeg(spec_data, sr, y_axis=None, quality=90):
+    """
+    Renders a spectrogram exactly as save_spec_as_image does and returns it as JPEG bytes,
+    matching the PNG -> JPEG conversion the training features go through.
+    """
+    jpeg_buffer = io.BytesIO()
+    save_spec_image(spec_data, jpeg_buffer, sr, y_axis=y_axis, image_format="jpeg", quality=quality)
+    return jpeg_buffer.getvalue()
+
+
+def save_spec_image(spec_data, destination, sr, y_axis=None, image_format="png", quality=90):
+    """
+    Renders a spectrogram with save_spec_as_image and stores it in `image_format`.
+    Non-PNG formats are rendered to PNG in memory and re-encoded, so a JPEG written
+    here is identical to one produced by converting the PNG afterwards.
+    """
+    if image_format == "png":
+        save_spec_as_image(spec_data, destination, sr, y_axis=y_axis, image_format="png")
+        return
+
+    png_buffer = io.BytesIO()
+    save_spec_as_image(spec_data, png_buffer, sr, y_axis=y_axis, image_format="png")
+    png_buffer.seek(0)
+    encode_image(png_buffer, destination, image_format, quality)
+
+
+@functools.lru_cache(maxsize=None)
+def mel_basis(sr, n_fft=2048):
+    """librosa's default mel filterbank, built once per sample rate."""
+    return librosa.filters.mel(sr=sr, n_fft=n_fft)
+
+
+@functools.lru_cache(maxsize=None)
+def chroma_basis(sr, n_fft=2048, tuning=0.0):
+    """librosa's chroma filterbank, built once per sample rate and tuning estimate."""
+    return librosa.filters.chroma(sr=sr, n_fft=n_fft, tuning=tuning)
+
+
+def compute_features(signal, sr, n_fft=2048, hop_length=512):
+    """
+    Computes the raw feature arrays for one signal.
+    Returns a dict with dd_mfcc, chromagram, zcr and rms arrays.
+
+    Same values as librosa.feature.mfcc / chroma_stft with their defaults, but the power
+    spectrogram is computed once for both and the filterbanks come from a per-rate cache.
+    With every clip at the canonical rate, the filters are only ever built once.
+    ZCR and RMS come from one compiled pass over the signal (see KERNEL_BACKEND), framed
+    with n_fft and hop_length like the spectral features.
+    """
+    power = np.abs(librosa.stft(signal, n_fft=n_fft, hop_length=hop_length)) ** 2
+    mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel_basis(sr, n_fft) @ power), n_mfcc=13)
+    tuning = librosa.estimate_tuning(S=power, sr=sr, bins_per_octave=12)
+    chromagram = librosa.util.normalize(chroma_basis(sr, n_fft, tuning) @ power, norm=np.inf, axis=-2)
+    if KERNEL_BACKEND == "numba":
+        zcr, rms = frame_zcr_rms(np.ascontiguousarray(signal), n_fft, hop_length)
+    else:
+        zcr = librosa.feature.zero_crossing_rate(y=signal, frame_length=n_fft, hop_length=hop_length)[0]
+        rms = librosa.feature.rms(y=signal, frame_length=n_fft, hop_length=hop_length)[0]
+    return {
+        "dd_mfcc": librosa.feature.delta(data=mfccs, order=2),
+        "chromagram": chromagram,
+        "zcr": zcr,
+        "rms": rms,
+    }
+
+
+def encode_clip_features(audio_path, sr=CANONICAL_SAMPLE_RATE):
+    """
+    Computes the model inputs for one clip in memory, without writing feature files.
+    The clip is first brought to `sr`, the rate the training features were extracted at,
+    and the images are rendered and JPEG-encoded exactly like the stored training features.
+    Lives here rather than next to the model so process-pool workers can import it
+    without loading TensorFlow.
+
+    Returns:
+        (audio_path, dict with mfcc_jpeg, chroma_jpeg, zcr and rms), or (audio_path, None) on failure.
+    """
+    try:
+        signal, native_sr = librosa.load(audio_path, sr=None)
+        signal = resample(signal, native_sr, sr)
+        features = compute_features(signal, sr)
+        return audio_path, {
+            "mfcc_jpeg": render_spec_jpeg(features["dd_mfcc"], sr),
+            "chroma_jpeg": render_spec_jpeg(features["chromagram"], sr, y_axis="chroma"),
+            "zcr": features["zcr"],
+            "rms": features["rms"],
+        }
+    except Exception as e:
+        print(f"Error processing {audio_path}: {e}")
+        return audio_path, None
+
+
+def extract_features(audio_path, output_dir, image_format="png", quality=90):
     """
     Extracts features from an audio file and saves them to a specified directory.
 
     For each audio file, it creates a subdirectory in output_dir named after the
     audio file. Inside this subdirectory, it saves:
-    - Delta-Delta MFCCs as an image (dd_mfcc.png)
-    - Chromagram as an image (chromagram.png)
+    - Delta-Delta MFCCs as an image (dd_mfcc.png, or dd_mfcc.jpeg with image_format="jpeg")
+    - Chromagram as an image (chromagram.png / chromagram.jpeg)
     - Zero-Crossing Rate as a NumPy array (zcr.npy)
     - RMS Energy as a NumPy array (rms.npy)
     """
@@ -56,45 +161,47 @@ def extract_features(audio_path, output_dir):
         print(f"Processing {audio_path} -> {target_dir}")
 
         signal, sr = librosa.load(audio_path, sr=None)
+        features = compute_features(signal, sr)
 
-        mfccs = librosa.feature.mfcc(y=signal, n_mfcc=13, sr=sr)
-        delta2_mfccs = librosa.feature.delta(data=mfccs, order=2)
+        # --- 1. Delta-Delta MFCC (Image) ---
         # Save the kernel of the spectrogram using the new helper function
-        save_spec_as_image(delta2_mfccs, target_dir / "dd_mfcc.png", sr)
+        ext = IMAGE_EXTENSIONS[image_format]
+        save_spec_image(features["dd_mfcc"], target_dir / f"dd_mfcc{ext}", sr, image_format=image_format, quality=quality)
 
         # --- 2. Chromagram (Image) ---
-        # Calculate features
-        chromagram = librosa.feature.chroma_stft(y=signal, sr=sr)
         # Save the kernel, specifying the y_axis type for chromagrams
-        save_spec_as_image(
-            chromagram, target_dir / "chromagram.png", sr, y_axis="chroma"
+        save_spec_image(
+            features["chromagram"], target_dir / f"chromagram{ext}", sr, y_axis="chroma",
+            image_format=image_format, quality=quality,
         )
 
-        # --- 3. Zero-Crossing Rate (Array) ---
-        zcr = librosa.feature.zero_crossing_rate(y=signal)[0]
-        np.save(target_dir / "zcr.npy", zcr)
-
-        rms = librosa.feature.rms(y=signal)[0]
-        np.save(target_dir / "rms.npy", rms)
+        # --- 3. Zero-Crossing Rate and RMS (Arrays) ---
+        np.save(target_dir / "zcr.npy", features["zcr"])
+        np.save(target_dir / "rms.npy", features["rms"])
 
     except Exception as e:
         print(f"Error processing {audio_path}: {e}")
 
 
 def process_dataset(
-    source_root, output_root, audio_extensions=(".wav", ".mp3", ".flac")
+    source_root, output_root, audio_extensions=(".wav", ".mp3", ".flac"), image_format="png", quality=90
 ):
     """
     Recursively finds all audio files in the source_root, extracts their
     features, and saves them to the output_root.
+    With image_format="jpeg" the images are written as JPEG directly, which makes
+    the separate PNG -> JPEG conversion unnecessary.
     """
     Path(output_root).mkdir(parents=True, exist_ok=True)
 
-    for root, _, files in os.walk(source_root):
-        for file in files:
-            if file.lower().endswith(audio_extensions):
-                audio_path = os.path.join(root, file)
-                extract_features(audio_path, output_root)
+    profiler = get_profiler()
+    with profiler.stage("extraction"):
+        for root, _, files in os.walk(source_root):
+            for file in files:
+                if file.lower().endswith(audio_extensions):
+                    audio_path = os.path.join(root, file)
+                    extract_features(audio_path, output_root, image_format, quality)
+                    profiler.tick()
 
 
 # --- Parsing Functions (Unchanged) ---
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image  # type: ignore
+
+# Codecs the feature images can be stored in, with the file extension used for each.
+# The training loader decodes JPEG, so PNG is only an intermediate format.
+IMAGE_EXTENSIONS = {"png": ".png", "jpeg": ".jpeg"}
+TMP_SUFFIX = ".tmp"
+
+
+def encode_image(source, destination, image_format="jpeg", quality=90):
+    """
+    Re-encodes an image with PIL.
+
+    Args:
+        source (str or file-like): Image to read.
+        destination (str or file-like): Where to write the encoded image. Paths are
+            written to a temporary file first and renamed into place, so an interrupted
+            write never leaves a truncated image behind.
+        image_format (str): One of IMAGE_EXTENSIONS.
+        quality (int): Encoder quality, used by lossy codecs.
+    """
+    if image_format not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported image format '{image_format}'. Choose from {list(IMAGE_EXTENSIONS)}.")
+
+    with Image.open(source) as img:
+        # JPEG has no alpha channel or palette
+        if image_format == "jpeg" and img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+
+        if not isinstance(destination, (str, os.PathLike)):
+            img.save(destination, image_format, quality=quality)
+            return
+
+        tmp_path = os.fspath(destination) + TMP_SUFFIX
+        try:
+            img.save(tmp_path, image_format, quality=quality)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _transcode_file(source_path, image_format, quality, remove_source):
+    """
+    Converts one file. Returns "converted", "skipped" or "failed".
+    """
+    target_path = os.path.splitext(source_path)[0] + IMAGE_EXTENSIONS[image_format]
+    try:
+        # The target only ever appears complete (atomic rename), so an existing one
+        # means a previous run converted this file and was stopped before cleaning up
+        if os.path.exists(target_path):
+            status = "skipped"
+        else:
+            encode_image(source_path, target_path, image_format, quality)
+            status = "converted"
+        if remove_source:
+            os.remove(source_path)
+        return status
+    except Exception as e:
+        print(f"Could not convert {source_path}: {e}")
+        return "failed"
+
+
+def transcode_tree(directory, source_ext=".png", image_format="jpeg", quality=90, workers=8, remove_source=True):
+    """
+    Recursively converts every `source_ext` image under `directory` to `image_format`
+    using a thread pool (PIL releases the GIL while encoding).
+
+    The conversion can be interrupted and re-run: files whose target already exists are
+    not re-encoded, and temporary files left by an interrupted run are removed.
+
+    Returns:
+        A dict with the number of converted, skipped and failed files.
+    """
+    sources = []
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if filename.endswith(TMP_SUFFIX):
+                os.remove(path)
+            elif filename.lower().endswith(source_ext):
+                sources.append(path)
+
+    counts = {"converted": 0, "skipped": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        statuses = executor.map(
+            lambda path: _transcode_file(path, image_format, quality, remove_source), sources
+        )
+        for status in statuses:
+            counts[status] += 1
+    return counts
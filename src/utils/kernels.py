@@ -0,0 +1,84 @@
+"""
+Numba-compiled kernels for the per-sample loops of extraction and augmentation.
+
+Compiled functions are cached on disk next to this module (cache=True), so the JIT cost
+is paid once per signature and machine, not on every run.
+"""
+import numba  # type: ignore
+import numpy as np
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+# librosa.zero_crossings treats |x| <= threshold as zero, and zero as positive
+ZCR_THRESHOLD = 1e-10
+
+
+@numba.njit(cache=True)
+def frame_zcr_rms(signal, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH):
+    """
+    Frame-wise zero-crossing rate and RMS in one pass over each frame, without building
+    padded or framed copies of the signal.
+
+    Equivalent to librosa.feature.zero_crossing_rate(y)[0] (edge padding, crossings
+    counted between consecutive samples of a frame, divided by frame_length) and
+    librosa.feature.rms(y)[0] (zero padding), both centered, with the same frame count.
+
+    Returns:
+        (zcr as float64, rms as float32), like librosa.
+    """
+    n = signal.shape[0]
+    half = frame_length // 2
+    n_frames = 1 + (n + 2 * half - frame_length) // hop_length
+    zcr = np.empty(n_frames, np.float64)
+    rms = np.empty(n_frames, np.float32)
+
+    for t in range(n_frames):
+        crossings = 0
+        energy = 0.0
+        previous_negative = False
+        for j in range(frame_length):
+            i = t * hop_length + j - half
+            if 0 <= i < n:
+                value = signal[i]
+                energy += value * value
+            else:
+                value = signal[0] if i < 0 else signal[n - 1]
+            negative = value < -ZCR_THRESHOLD
+            if j > 0 and negative != previous_negative:
+                crossings += 1
+            previous_negative = negative
+        zcr[t] = crossings / frame_length
+        rms[t] = np.sqrt(energy / frame_length)
+    return zcr, rms
+
+
+@numba.njit(cache=True)
+def _add_scaled_noise(audio, noise, snr_db):
+    n = audio.shape[0]
+    if n == 0:
+        return audio
+    power = 0.0
+    for i in range(n):
+        power += audio[i] * audio[i]
+    noise_std = np.sqrt(power / n / 10.0 ** (snr_db / 10.0))
+    for i in range(n):
+        audio[i] += noise_std * noise[i]
+    return audio
+
+
+_rng = np.random.default_rng()
+
+
+def add_awgn(audio, snr_db, rng=None):
+    """
+    Adds white Gaussian noise at `snr_db` to the 1-D array `audio` in place, in its own dtype.
+
+    The signal power is accumulated in float64 inside the kernel, with no squared temporary,
+    and the noise is drawn as float32 by NumPy's ziggurat sampler, which is faster than
+    drawing it sample by sample in compiled code. The only temporary is that noise vector.
+
+    Returns:
+        `audio`, for chaining.
+    """
+    noise = (rng or _rng).standard_normal(audio.shape[0], dtype=np.float32)
+    return _add_scaled_noise(audio, noise, snr_db)
@@ -0,0 +1,192 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Opt-in switches: MEMORY_PROFILE=<report.json> turns profiling on,
+# MEMORY_PROFILE_EVERY=<N> records a checkpoint every N files inside a stage.
+REPORT_ENV = "MEMORY_PROFILE"
+EVERY_ENV = "MEMORY_PROFILE_EVERY"
+
+# Allocation sites from these files describe the profiler itself, not the pipeline
+IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+def _read_status_mb(field):
+    """Reads a memory field (e.g. VmRSS, VmHWM) from /proc/self/status in MB, or None if unavailable."""
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB."""
+    rss = _read_status_mb("VmRSS")
+    return rss if rss is not None else peak_rss_mb()
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB (since the last reset_peak_rss, where supported).
+    0.0 where neither /proc nor the POSIX resource module is available (Windows); the
+    tracemalloc figures of the report are still valid there.
+    """
+    peak = _read_status_mb("VmHWM")
+    if peak is None:
+        try:
+            import resource
+        except ImportError:
+            return 0.0
+        # ru_maxrss is reported in KB on Linux and cannot be reset
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return peak
+
+
+def reset_peak_rss():
+    """Resets the kernel's peak RSS counter so the next reading covers only what follows (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def top_allocations(snapshot, top_n):
+    """Returns the top_n allocation sites of a tracemalloc snapshot, largest first."""
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, name) for name in IGNORED_FILES])
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_mb": stat.size / 1e6,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top_n]
+    ]
+
+
+class MemoryProfiler:
+    """
+    Records peak RSS and the largest Python allocation sites per pipeline stage.
+
+    Stages are delimited with the `stage` context manager; code that walks over files
+    calls `tick()` once per file so a checkpoint is taken every `every_n_files` files.
+    The report is rewritten as JSON after every stage, so a run that dies of OOM still
+    leaves the numbers up to its last completed stage. When disabled every call is a no-op.
+    """
+
+    def __init__(self, report_path=None, every_n_files=100, top_n=10):
+        self.enabled = report_path is not None
+        self.report_path = report_path
+        self.every_n_files = every_n_files
+        self.top_n = top_n
+        self.stages = []
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._stack:
+            # Keep the enclosing stage's peaks before resetting the counters for this one
+            self._merge_peaks(self._stack[-1], tracemalloc.get_traced_memory()[1], peak_rss_mb())
+        tracemalloc.reset_peak()
+        reset_peak_rss()
+
+        record = {
+            "stage": name,
+            "start_rss_mb": current_rss_mb(),
+            "files": 0,
+            "checkpoints": [],
+            "traced_peak": 0,
+            "rss_peak": 0.0,
+            "_start": time.perf_counter(),
+        }
+        self._stack.append(record)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self._merge_peaks(record, tracemalloc.get_traced_memory()[1], peak_rss_mb())
+            traced_peak, rss_peak = record.pop("traced_peak"), record.pop("rss_peak")
+            entry = {
+                "stage": name,
+                "seconds": time.perf_counter() - record.pop("_start"),
+                "files": record["files"],
+                "start_rss_mb": record["start_rss_mb"],
+                "peak_rss_mb": rss_peak,
+                "end_rss_mb": current_rss_mb(),
+                "peak_traced_mb": traced_peak / 1e6,
+                "top_allocations": top_allocations(tracemalloc.take_snapshot(), self.top_n),
+                "checkpoints": record["checkpoints"],
+            }
+            self.stages.append(entry)
+            if self._stack:
+                self._merge_peaks(self._stack[-1], traced_peak, rss_peak)
+            self.write_report()
+            print(
+                f"[memory] {name}: peak RSS {entry['peak_rss_mb']:.1f} MB, "
+                f"peak traced {entry['peak_traced_mb']:.1f} MB, {entry['files']} files"
+            )
+
+    @staticmethod
+    def _merge_peaks(record, traced_peak, rss_peak):
+        record["traced_peak"] = max(record["traced_peak"], traced_peak)
+        record["rss_peak"] = max(record["rss_peak"], rss_peak)
+
+    def tick(self, n=1):
+        """Counts processed files in the current stage and checkpoints every `every_n_files`."""
+        if not self.enabled or not self._stack:
+            return
+        record = self._stack[-1]
+        before = record["files"]
+        record["files"] += n
+        if record["files"] // self.every_n_files == before // self.every_n_files:
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        rss_peak = peak_rss_mb()
+        self._merge_peaks(record, peak, rss_peak)
+        record["checkpoints"].append({
+            "files": record["files"],
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": rss_peak,
+            "traced_mb": current / 1e6,
+            "peak_traced_mb": peak / 1e6,
+            "top_allocations": top_allocations(tracemalloc.take_snapshot(), self.top_n),
+        })
+        # Each checkpoint's peaks cover only the files since the previous one
+        tracemalloc.reset_peak()
+        reset_peak_rss()
+
+    def write_report(self):
+        directory = os.path.dirname(self.report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "stages": self.stages}, f, indent=2)
+
+
+_PROFILER = None
+
+
+def get_profiler():
+    """
+    Returns the process-wide profiler, enabled only when the MEMORY_PROFILE environment variable is set.
+    """
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = MemoryProfiler(
+            report_path=os.environ.get(REPORT_ENV) or None,
+            every_n_files=int(os.environ.get(EVERY_ENV, "100")),
+        )
+    return _PROFILER
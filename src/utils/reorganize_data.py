@@ -12,16 +12,19 @@ from collections import defaultdict
 import soundfile as sf
 import numpy as np
 import librosa
+from src.utils.resampling import CANONICAL_SAMPLE_RATE, DEFAULT_QUALITY, resample
 
 NEW_PATH = "src//data//dataset"
+DATASET_BASE = "src//data//dataset_base"
 
 
 def transform_stereo_to_mono(y):
     """
     Converts stereo audio signal to mono by averaging channels.
+    Expects librosa's (channels, samples) layout.
     """
     if y.ndim == 2:
-        y = librosa.to_mono(y.T)
+        y = librosa.to_mono(y)
     return y
 
 
@@ -42,15 +45,19 @@ def load_as_mono(path):
     return y.astype(np.float32), sr
 
 
-def rename_and_relocate_data(audio_path, language, gender, emotion, id):
+def rename_and_relocate_data(
+    audio_path, language, gender, emotion, id, output_root=NEW_PATH, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY
+):
     """
     Moves, renames, and converts audio files to mono format with standardized naming.
+    The audio is resampled to `sr` here, once, so later stages never resample it.
     """
     audio_path = Path(audio_path)
 
-    y, sr = load_as_mono(audio_path)
+    y, native_sr = load_as_mono(audio_path)
+    y = resample(y, native_sr, sr, quality)
 
-    emotion_dir = Path(NEW_PATH) / emotion
+    emotion_dir = Path(output_root) / emotion
     emotion_dir.mkdir(parents=True, exist_ok=True)
 
     base_name = f"{language}_{gender}_{emotion}_{id}.wav"
@@ -71,7 +78,9 @@ def rename_and_relocate_data(audio_path, language, gender, emotion, id):
     return str(new_path)
 
 
-def select_portuguese_labels():
+def select_portuguese_labels(
+    dataset_base=DATASET_BASE, output_root=NEW_PATH, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY
+):
     """
     Processes Portuguese audio dataset (VERBO-Dataset).
     Organizes files by language, gender, and emotion according to predefined mapping.
@@ -86,7 +95,7 @@ def select_portuguese_labels():
         "med": "fear",
     }
 
-    base = Path("src//data//dataset_base//VERBO-Dataset//Audios")
+    base = Path(dataset_base).joinpath("VERBO-Dataset", "Audios")
 
     if not base.exists():
         return
@@ -110,10 +119,12 @@ def select_portuguese_labels():
         lang, gender, emotion = key
         files = sorted(groups[key], key=lambda p: p.name)
         for idx, wav in enumerate(files, start=1):
-            rename_and_relocate_data(str(wav), lang, gender, emotion, idx)
+            rename_and_relocate_data(str(wav), lang, gender, emotion, idx, output_root, sr, quality)
 
 
-def select_french_labels():
+def select_french_labels(
+    dataset_base=DATASET_BASE, output_root=NEW_PATH, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY
+):
     """
     Processes French audio dataset (CaFE).
     Organizes files by language, gender, and emotion according to predefined mapping.
@@ -128,7 +139,7 @@ def select_french_labels():
         "T": "sadness",
     }
 
-    base = Path("src//data//dataset_base//CaFE")
+    base = Path(dataset_base).joinpath("CaFE")
 
     if not base.exists():
         return
@@ -162,10 +173,12 @@ def select_french_labels():
         lang, gender, emotion = key
         files = sorted(groups[key], key=lambda p: p.name)
         for idx, wav in enumerate(files, start=1):
-            rename_and_relocate_data(str(wav), lang, gender, emotion, idx)
+            rename_and_relocate_data(str(wav), lang, gender, emotion, idx, output_root, sr, quality)
 
 
-def select_english_labels():
+def select_english_labels(
+    dataset_base=DATASET_BASE, output_root=NEW_PATH, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY
+):
     """
     Processes English audio dataset (REVDESS).
     Organizes files by language, gender, and emotion according to predefined mapping.
@@ -182,7 +195,7 @@ def select_english_labels():
         "08": "surprise",
     }
 
-    base = Path("src//data//dataset_base//REVDESS//Speech")
+    base = Path(dataset_base).joinpath("REVDESS", "Speech")
 
     if not base.exists():
         return
@@ -213,10 +226,18 @@ def select_english_labels():
         lang, gender, emotion = key
         files = sorted(groups[key], key=lambda p: p.name)
         for idx, wav in enumerate(files, start=1):
-            rename_and_relocate_data(str(wav), lang, gender, emotion, idx)
+            rename_and_relocate_data(str(wav), lang, gender, emotion, idx, output_root, sr, quality)
+
+
+def reorganize_all(dataset_base=DATASET_BASE, output_root=NEW_PATH, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY):
+    """
+    Processes the Portuguese, French and English datasets into the standardized dataset tree,
+    resampling every clip to `sr` with the given quality tier (see src.utils.resampling).
+    """
+    select_portuguese_labels(dataset_base, output_root, sr, quality)
+    select_french_labels(dataset_base, output_root, sr, quality)
+    select_english_labels(dataset_base, output_root, sr, quality)
 
 
 if __name__ == "__main__":
-    select_portuguese_labels()
-    select_french_labels()
-    select_english_labels()
+    reorganize_all()
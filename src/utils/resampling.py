@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+CANONICAL_SAMPLE_RATE = 16000
+AUDIO_EXTENSIONS = (".wav", ".flac")
+
+# soxr quality recipes. "fast" keeps a proper anti-aliasing filter (unlike soxr's
+# quick cubic "QQ"), "high" is soxr's very high quality recipe.
+QUALITY_TIERS = {"fast": "LQ", "standard": "HQ", "high": "VHQ"}
+DEFAULT_QUALITY = "high"
+
+
+def soxr_quality(quality):
+    """Maps a quality tier name to its soxr recipe. Raises ValueError on unknown tiers."""
+    if quality not in QUALITY_TIERS:
+        raise ValueError(f"Unknown resampling quality '{quality}'. Choose one of {sorted(QUALITY_TIERS)}.")
+    return QUALITY_TIERS[quality]
+
+
+def resample(signal, sr, target_sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY):
+    """
+    Resamples `signal` (samples first, optional channel axis) from `sr` to `target_sr`
+    with soxr. A signal already at `target_sr` is returned as is.
+    """
+    recipe = soxr_quality(quality)
+    if sr == target_sr:
+        return signal
+    import soxr  # type: ignore
+
+    return soxr.resample(signal, sr, target_sr, quality=recipe)
+
+
+def normalize_file(path, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY):
+    """
+    Rewrites one audio file at `sr` in place, keeping its format, subtype and channels.
+    Files already at `sr` are only probed (header read), never decoded. Executed inside a worker process.
+
+    Returns:
+        (path, native sample rate, whether it was resampled), or (path, None, False) on failure.
+    """
+    import soundfile as sf  # type: ignore
+
+    try:
+        info = sf.info(path)
+        if info.samplerate == sr:
+            return path, info.samplerate, False
+
+        signal, native_sr = sf.read(path, dtype="float32", always_2d=True)
+        signal = resample(signal, native_sr, sr, quality)
+        if info.subtype.startswith("PCM"):
+            # soxr's filters can overshoot slightly; integer formats would wrap around
+            signal = np.clip(signal, -1.0, 1.0)
+
+        # Written next to the original and swapped in, so an interruption never leaves a truncated file
+        root, ext = os.path.splitext(path)
+        tmp_path = f"{root}.resampling{ext}"
+        sf.write(tmp_path, signal, sr, subtype=info.subtype, format=info.format)
+        os.replace(tmp_path, path)
+        return path, native_sr, True
+    except Exception as e:
+        print(f"Error resampling {path}: {e}")
+        return path, None, False
+
+
+def normalize_sample_rate(directory, sr=CANONICAL_SAMPLE_RATE, quality=DEFAULT_QUALITY, workers=None):
+    """
+    Brings every WAV/FLAC file under `directory` to the canonical sample rate, in place.
+
+    This is the one resampling step of the pipeline: augmentation, extraction and packing
+    read the files at their stored rate afterwards. It is idempotent; files already at `sr`
+    are skipped from their header, so re-running it on a normalized tree is cheap.
+
+    Args:
+        directory (str): Folder searched recursively.
+        sr (int): Target sample rate.
+        quality (str): "fast", "standard" or "high" (see QUALITY_TIERS).
+        workers (int): Resampling processes (default: all cores); 1 works in this process.
+
+    Returns:
+        A dict with the number of files resampled, skipped (already at `sr`) and failed.
+    """
+    soxr_quality(quality)
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(AUDIO_EXTENSIONS))
+    paths.sort()
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Normalizing {len(paths)} files in {directory} to {sr} Hz ({quality} quality) with {workers} workers...")
+
+    counts = {"resampled": 0, "skipped": 0, "failed": 0}
+    native_rates = set()
+    if workers == 1:
+        results = (normalize_file(path, sr, quality) for path in paths)
+        executor = None
+    else:
+        # librosa/soxr state is not fork-safe once initialised, so workers are spawned
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        n = len(paths)
+        results = executor.map(normalize_file, paths, [sr] * n, [quality] * n, chunksize=8)
+    try:
+        for _, native_sr, resampled in results:
+            if native_sr is None:
+                counts["failed"] += 1
+            elif resampled:
+                counts["resampled"] += 1
+                native_rates.add(native_sr)
+            else:
+                counts["skipped"] += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    rates = ", ".join(f"{rate} Hz" for rate in sorted(native_rates))
+    print(
+        f"Resampled {counts['resampled']} files{f' (from {rates})' if rates else ''}, "
+        f"{counts['skipped']} already at {sr} Hz, {counts['failed']} failed."
+    )
+    return counts
@@ -0,0 +1,165 @@
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MANIFEST_FILE = "trim_manifest.csv"
+MANIFEST_FIELDS = ["path", "sample_rate", "original_samples", "start", "end"]
+AUDIO_EXTENSIONS = (".wav", ".flac")
+# Suffix of the file a trim is written to before it replaces the clip. It is not an audio
+# extension, so a file left behind by an interrupted run is never taken for a clip.
+TMP_SUFFIX = ".tmp"
+
+# Frames more than TOP_DB below the loudest frame of the clip count as silence
+DEFAULT_TOP_DB = 40.0
+# Seconds kept on each side of the detected speech, so soft onsets and releases survive
+DEFAULT_MARGIN = 0.05
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+
+def speech_bounds(signal, sr, top_db=DEFAULT_TOP_DB, margin=DEFAULT_MARGIN):
+    """
+    Finds the non-silent region of a mono signal from its frame RMS.
+
+    Returns:
+        (start, end) sample indices, widened by `margin` seconds on each side.
+        A clip with no frame above the threshold is kept whole.
+    """
+    import librosa  # type: ignore
+
+    _, (start, end) = librosa.effects.trim(signal, top_db=top_db, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+    if end <= start:
+        return 0, len(signal)
+    pad = int(round(margin * sr))
+    start, end = int(start) - pad, int(end) + pad
+    # Edges are only cut by more than one frame, which is the detection's granularity;
+    # this keeps a second pass over an already trimmed clip from shaving it further.
+    start = start if start > HOP_LENGTH else 0
+    end = end if len(signal) - end > HOP_LENGTH else len(signal)
+    return start, end
+
+
+def trim_file(path, top_db=DEFAULT_TOP_DB, margin=DEFAULT_MARGIN):
+    """
+    Cuts the leading and trailing silence of one file in place, keeping its format and subtype.
+    Executed inside a worker process.
+
+    Returns:
+        (path, sample rate, original length, start, end) in samples, or (path, None, ...) on failure.
+    """
+    import soundfile as sf  # type: ignore
+
+    tmp_path = path + TMP_SUFFIX
+    try:
+        info = sf.info(path)
+        signal, sr = sf.read(path, dtype="float32", always_2d=True)
+        start, end = speech_bounds(signal.mean(axis=1), sr, top_db, margin)
+        if (start, end) != (0, len(signal)):
+            # Written next to the original and swapped in, so an interruption never leaves a truncated file
+            sf.write(tmp_path, signal[start:end], sr, subtype=info.subtype, format=info.format)
+            os.replace(tmp_path, path)
+        return path, sr, len(signal), start, end
+    except Exception as e:
+        print(f"Error trimming {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return path, None, 0, 0, 0
+
+
+def load_trim_manifest(directory):
+    """
+    Reads the boundaries recorded by trim_directory.
+
+    Returns:
+        A dict mapping each file's path relative to `directory` to a dict with sample_rate,
+        original_samples, start and end (samples of the original clip that were kept).
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", newline="", encoding="utf-8") as f:
+        return {row["path"]: {k: int(v) for k, v in row.items() if k != "path"} for row in csv.DictReader(f)}
+
+
+def _write_manifest(directory, manifest):
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path + ".tmp", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+        writer.writerows({"path": path, **manifest[path]} for path in sorted(manifest))
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def trim_directory(directory, top_db=DEFAULT_TOP_DB, margin=DEFAULT_MARGIN, workers=None):
+    """
+    Trims leading and trailing silence from every WAV/FLAC file under `directory`, in place.
+
+    Meant to run at ingest, before balancing, augmentation and extraction, so none of them
+    spend work on silence and fixed-length feature windows start at the speech. The original
+    length and the kept [start, end) samples of each clip are recorded in MANIFEST_FILE at
+    the root of `directory`. Files already in the manifest are not trimmed twice, so the
+    stage can be re-run on a growing tree, and temporary files an interrupted run left
+    behind are deleted.
+
+    Args:
+        directory (str): Folder searched recursively.
+        top_db (float): Silence threshold in dB below the clip's loudest RMS frame.
+        margin (float): Seconds of context kept around the detected speech.
+        workers (int): Processes (default: all cores); 1 works in this process.
+
+    Returns:
+        A dict with the number of files trimmed, skipped and failed, and the seconds of
+        audio before and after trimming.
+    """
+    import soundfile as sf  # type: ignore
+
+    manifest = load_trim_manifest(directory)
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith(TMP_SUFFIX) and name[:-len(TMP_SUFFIX)].lower().endswith(AUDIO_EXTENSIONS):
+                os.remove(path)
+                continue
+            if not name.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            entry = manifest.get(os.path.relpath(path, directory))
+            if entry is None or sf.info(path).frames != entry["end"] - entry["start"]:
+                paths.append(path)
+    paths.sort()
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Trimming silence from {len(paths)} files in {directory} (top_db={top_db}, margin={margin}s)...")
+
+    summary = {"trimmed": 0, "skipped": 0, "failed": 0, "seconds_before": 0.0, "seconds_after": 0.0}
+    if workers == 1:
+        results = (trim_file(path, top_db, margin) for path in paths)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        n = len(paths)
+        results = executor.map(trim_file, paths, [top_db] * n, [margin] * n, chunksize=8)
+    try:
+        for path, sr, original, start, end in results:
+            if sr is None:
+                summary["failed"] += 1
+                continue
+            summary["trimmed" if end - start < original else "skipped"] += 1
+            summary["seconds_before"] += original / sr
+            summary["seconds_after"] += (end - start) / sr
+            manifest[os.path.relpath(path, directory)] = {
+                "sample_rate": sr, "original_samples": original, "start": start, "end": end
+            }
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    _write_manifest(directory, manifest)
+    removed = summary["seconds_before"] - summary["seconds_after"]
+    share = removed / summary["seconds_before"] if summary["seconds_before"] else 0.0
+    print(
+        f"Trimmed {summary['trimmed']} files ({summary['skipped']} had no silence to cut, {summary['failed']} failed): "
+        f"{removed:.1f} s of {summary['seconds_before']:.1f} s removed ({share:.1%})."
+    )
+    return summary
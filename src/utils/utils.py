@@ -15,3 +15,14 @@ def load_config():
     with open(config_path, "r", encoding="utf-8") as f:
         config = json.load(f)
     return config
+
+
+def init_worker_threads(threads):
+    """
+    Caps the TensorFlow thread pools of a worker process, so several workers can share
+    the cores. Used as the ProcessPoolExecutor initializer of cross-validation and tuning.
+    """
+    import tensorflow as tf  # type: ignore
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
@@ -0,0 +1,204 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.utils.audio_metadado import get_audio_metadado
+from src.utils.resampling import DEFAULT_QUALITY, resample
+
+SAMPLES_FILE = "samples.bin"
+INDEX_FILE = "index.csv"
+META_FILE = "meta.json"
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac")
+INT16_SCALE = 32768.0
+
+
+def load_waveform(path, sr, dtype, quality=DEFAULT_QUALITY):
+    """
+    Decodes one clip at its stored rate and resamples it to `sr` only if it differs
+    (clips normalized by src.utils.resampling never are). Executed inside a worker process.
+
+    Returns:
+        (path, samples as `dtype`), or (path, None) on failure.
+    """
+    import librosa  # type: ignore
+
+    try:
+        signal, native_sr = librosa.load(path, sr=None, mono=True)
+        signal = resample(signal, native_sr, sr, quality)
+    except Exception as e:
+        print(f"Error loading {path}: {e}")
+        return path, None
+
+    if dtype == "int16":
+        signal = np.clip(np.round(signal * INT16_SCALE), -INT16_SCALE, INT16_SCALE - 1)
+    return path, signal.astype(dtype)
+
+
+def _clip_labels(path):
+    try:
+        meta = get_audio_metadado(os.path.basename(path))
+    except ValueError:
+        meta = None
+    if meta is None:
+        return {"language": "unknown", "gender": "unknown", "emotion": "unknown"}
+    return {"language": meta.language, "gender": meta.gender, "emotion": meta.emotion}
+
+
+def pack_waveforms(source_root, store_dir, sr=16000, dtype="int16", workers=None, quality=DEFAULT_QUALITY):
+    """
+    Decodes every audio file under source_root once, resamples it to `sr` if it is not
+    stored at that rate already, and appends it to a single flat sample file, so training
+    never decodes or resamples again.
+
+    The store holds samples.bin (all clips back to back), index.csv (path, offset and
+    length in samples, language, gender, emotion) and meta.json (sample rate, dtype).
+    The index is written last, so an interrupted build is never mistaken for a valid store.
+
+    Args:
+        source_root (str): Folder searched recursively for audio files.
+        store_dir (str): Destination folder.
+        sr (int): Sample rate every clip is resampled to.
+        dtype (str): "int16" (half the size) or "float32".
+        workers (int): Decoding processes (default: all cores); 1 decodes in this process.
+        quality (str): Resampling quality tier for clips not already at `sr`.
+
+    Returns:
+        The index as a DataFrame.
+    """
+    if dtype not in ("int16", "float32"):
+        raise ValueError(f"Unsupported dtype '{dtype}'. Choose 'int16' or 'float32'.")
+
+    paths = []
+    for root, _, files in os.walk(source_root):
+        paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(AUDIO_EXTENSIONS))
+    paths.sort()
+
+    os.makedirs(store_dir, exist_ok=True)
+    index_path = os.path.join(store_dir, INDEX_FILE)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Packing {len(paths)} clips at {sr} Hz ({dtype}) into {store_dir} with {workers} workers...")
+
+    rows, offset = [], 0
+    with open(os.path.join(store_dir, SAMPLES_FILE), "wb") as samples_file:
+        if workers == 1:
+            results = (load_waveform(path, sr, dtype, quality) for path in paths)
+            executor = None
+        else:
+            # TensorFlow and librosa are not fork-safe once initialised, so workers are spawned
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            n = len(paths)
+            results = executor.map(load_waveform, paths, [sr] * n, [dtype] * n, [quality] * n, chunksize=8)
+        try:
+            for path, signal in results:
+                if signal is None or len(signal) == 0:
+                    continue
+                samples_file.write(signal.tobytes())
+                rows.append({"path": path, "offset": offset, "length": len(signal), **_clip_labels(path)})
+                offset += len(signal)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    with open(os.path.join(store_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"sample_rate": sr, "dtype": dtype, "total_samples": offset}, f, indent=2)
+    index = pd.DataFrame(rows, columns=["path", "offset", "length", "language", "gender", "emotion"])
+    index.to_csv(index_path, index=False)
+
+    print(f"Packed {len(index)} clips, {offset / sr / 3600:.2f} h of audio.")
+    return index
+
+
+class WaveformStore:
+    """
+    Read-only view of a store written by pack_waveforms.
+    The samples are memory-mapped, so clips and windows are read straight from the page cache.
+    """
+
+    def __init__(self, store_dir):
+        index_path = os.path.join(store_dir, INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No complete waveform store at '{store_dir}'. Run pack_waveforms first.")
+
+        with open(os.path.join(store_dir, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.sample_rate = meta["sample_rate"]
+        self.dtype = meta["dtype"]
+        self.index = pd.read_csv(index_path)
+        self.offsets = self.index["offset"].to_numpy(np.int64)
+        self.lengths = self.index["length"].to_numpy(np.int64)
+        self.samples = np.memmap(
+            os.path.join(store_dir, SAMPLES_FILE), dtype=self.dtype, mode="r", shape=(meta["total_samples"],)
+        )
+
+    def __len__(self):
+        return len(self.index)
+
+    def clip(self, i):
+        """Returns clip `i` as a view into the memory map (no copy)."""
+        return self.samples[self.offsets[i]:self.offsets[i] + self.lengths[i]]
+
+    def sample_windows(self, clip_ids, window, rng):
+        """
+        Gathers one random `window`-sample crop from each clip in clip_ids with a single
+        fancy-indexing read. Clips shorter than the window are zero-padded at the end.
+
+        Returns:
+            A (len(clip_ids), window) array in the store's dtype.
+        """
+        lengths = self.lengths[clip_ids]
+        starts = (rng.random(len(clip_ids)) * np.maximum(lengths - window + 1, 1)).astype(np.int64)
+        positions = starts[:, None] + np.arange(window)
+        valid = positions < lengths[:, None]
+        windows = self.samples[self.offsets[clip_ids, None] + np.minimum(positions, lengths[:, None] - 1)]
+        return np.where(valid, windows, 0).astype(self.dtype, copy=False)
+
+
+def window_dataset(store, clip_ids, labels, window=16000, batch_size=32, seed=42):
+    """
+    Builds an endless tf.data pipeline of random fixed-length windows from a WaveformStore.
+
+    Each step draws `batch_size` of the given clips uniformly and crops a random window from
+    each with sample_windows: one fancy-indexed read out of the memory map, so the page cache
+    is copied once per window and nothing is decoded. Batches are gathered by parallel
+    tf.data map calls, each with its own generator seeded from (seed, batch number), so the
+    stream is reproducible however many run at once. int16 samples are scaled to [-1, 1]
+    in the graph.
+
+    Args:
+        store (WaveformStore): The packed waveforms.
+        clip_ids (np.ndarray): Store clips to draw from.
+        labels (np.ndarray): Integer class of each clip in clip_ids.
+        window (int): Window length in samples.
+        batch_size (int): Windows per batch.
+        seed (int): Seed for clip and offset sampling.
+
+    Returns:
+        A tf.data.Dataset of (waveforms of shape (batch, window, 1), labels) batches.
+    """
+    import tensorflow as tf  # type: ignore
+
+    clip_ids = np.asarray(clip_ids, dtype=np.int64)
+    labels = np.asarray(labels, dtype=np.int32)
+    if len(clip_ids) != len(labels):
+        raise ValueError(f"Got {len(clip_ids)} clip ids but {len(labels)} labels.")
+    tf_dtype = tf.int16 if store.dtype == "int16" else tf.float32
+
+    def _gather(batch_number):
+        rng = np.random.default_rng([seed, int(batch_number)])
+        picks = rng.integers(0, len(clip_ids), batch_size)
+        return store.sample_windows(clip_ids[picks], window, rng), labels[picks]
+
+    def _read(batch_number):
+        waveforms, batch_labels = tf.numpy_function(_gather, [batch_number], (tf_dtype, tf.int32))
+        waveforms = tf.cast(tf.ensure_shape(waveforms, (batch_size, window)), tf.float32)
+        if store.dtype == "int16":
+            waveforms = waveforms / INT16_SCALE
+        return waveforms[..., tf.newaxis], tf.ensure_shape(batch_labels, (batch_size,))
+
+    dataset = tf.data.Dataset.counter().map(_read, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,35 @@
+import pytest
+from src.PoCs.MultiModalTraining.benchmark import diagnose_bottleneck, select_fastest_setting
+
+
+def _result(name, accuracy, step_s):
+    return {"name": name, "test_accuracy": accuracy, "median_step_s": step_s}
+
+
+@pytest.mark.parametrize("results, tolerance, expected", [
+    # The fastest setting is picked when it holds accuracy
+    ([_result("fp32", 0.80, 1.0), _result("xla", 0.80, 0.6), _result("bf16", 0.795, 0.4)], 0.01, "bf16"),
+    # Losing more than the tolerance disqualifies it, however fast
+    ([_result("fp32", 0.80, 1.0), _result("xla", 0.80, 0.6), _result("bf16", 0.70, 0.4)], 0.01, "xla"),
+    # Exactly at the tolerance still counts
+    ([_result("fp32", 0.80, 1.0), _result("bf16", 0.75, 0.5)], 0.05, "bf16"),
+    # A more accurate setting is always eligible
+    ([_result("fp32", 0.80, 1.0), _result("xla", 0.90, 0.9)], 0.0, "xla"),
+    # The baseline wins when nothing else qualifies
+    ([_result("fp32", 0.80, 1.0), _result("bf16", 0.60, 0.2)], 0.01, "fp32"),
+])
+def test_select_fastest_setting(results, tolerance, expected):
+    assert select_fastest_setting(results, tolerance)["name"] == expected
+
+
+@pytest.mark.parametrize("input_rate, compute_rate, full_rate, bound, efficiency", [
+    (5.0, 20.0, 4.0, "input-bound", 0.8),
+    (50.0, 10.0, 9.0, "compute-bound", 0.9),
+    (10.0, 10.0, 10.0, "compute-bound", 1.0),
+    (0.0, 10.0, 0.0, "input-bound", 0.0),
+])
+def test_diagnose_bottleneck(input_rate, compute_rate, full_rate, bound, efficiency):
+    verdict = diagnose_bottleneck(input_rate, compute_rate, full_rate)
+    assert verdict["bound"] == bound
+    assert verdict["overlap_efficiency"] == pytest.approx(efficiency)
+    assert verdict["input_batches_per_s"] == input_rate and verdict["train_steps_per_s"] == compute_rate
@@ -0,0 +1,42 @@
+import numpy as np
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.cascade import CascadeClassifier, cascade_curve
+
+
+class _FixedModel:
+    """Returns preset probabilities for the rows it is given, and records the batch sizes."""
+
+    def __init__(self, probabilities, key=None):
+        self.probabilities = np.asarray(probabilities, dtype=np.float32)
+        self.key = key
+        self.calls = []
+
+    def __call__(self, inputs, training=False):
+        rows = np.asarray(inputs[self.key] if self.key else inputs)[:, 0].astype(int)
+        self.calls.append(len(rows))
+        return tf.constant(self.probabilities[rows])
+
+
+def test_cascade_curve_interpolates_between_both_stages():
+    numerical = np.array([[0.95, 0.05], [0.6, 0.4], [0.3, 0.7], [0.55, 0.45]])
+    full = np.array([[0.9, 0.1], [0.1, 0.9], [0.2, 0.8], [0.4, 0.6]])
+    labels = np.array([0, 1, 1, 1])
+
+    curve = cascade_curve(numerical, full, labels, numerical_ms=1.0, full_ms=10.0, thresholds=(0.0, 0.65, 1.01))
+
+    assert [point["escalated"] for point in curve] == [0.0, 0.5, 1.0]
+    assert [point["accuracy"] for point in curve] == [0.5, 1.0, 1.0]
+    assert [point["latency_ms"] for point in curve] == [1.0, 6.0, 11.0]
+
+
+def test_cascade_classifier_escalates_only_low_confidence_samples():
+    row_ids = np.arange(4, dtype=np.float32)[:, None]
+    numerical = _FixedModel([[0.95, 0.05], [0.6, 0.4], [0.1, 0.9], [0.5, 0.5]])
+    full = _FixedModel([[0.0, 1.0]] * 4, key="numerical_input")
+    cascade = CascadeClassifier(numerical, full, threshold=0.8)
+
+    probabilities = cascade.predict({"numerical_input": row_ids, "mfcc_input": row_ids})
+
+    assert full.calls == [2]
+    np.testing.assert_allclose(probabilities[:, 1], [0.05, 1.0, 0.9, 1.0])
+    assert (cascade.samples, cascade.escalated) == (4, 2)
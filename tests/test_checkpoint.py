@@ -0,0 +1,58 @@
+import json
+import os
+import numpy as np
+import tensorflow as tf  # type: ignore
+from sklearn.preprocessing import LabelEncoder, StandardScaler  # type: ignore
+from src.PoCs.MultiModalTraining.checkpoint import (
+    LeanCheckpoint,
+    STATE_FILE,
+    WEIGHTS_FILE,
+    checkpoint_variables,
+    scaler_from_state,
+    scaler_state,
+)
+
+
+def _tiny_model():
+    inputs = tf.keras.layers.Input(shape=(4,))
+    backbone = tf.keras.layers.Dense(8, name="backbone")
+    backbone.trainable = False
+    x = backbone(inputs)
+    x = tf.keras.layers.BatchNormalization()(x)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    return tf.keras.Model(inputs, outputs), backbone
+
+
+def test_checkpoint_variables_skip_frozen_layers_but_keep_batchnorm_statistics():
+    model, backbone = _tiny_model()
+    saved = {id(v) for v in checkpoint_variables(model)}
+
+    assert not saved & {id(v) for v in backbone.weights}
+    # gamma, beta, moving mean and moving variance, then the head's kernel and bias
+    assert len(saved) == 6
+
+
+def test_scaler_state_round_trips():
+    scaler = StandardScaler().fit(np.random.default_rng(0).standard_normal((20, 3)))
+    restored = scaler_from_state(json.loads(json.dumps(scaler_state(scaler))))
+
+    x = np.ones((2, 3))
+    assert np.allclose(restored.transform(x), scaler.transform(x))
+
+
+def test_lean_checkpoint_writes_only_on_improvement(tmp_path):
+    model, _ = _tiny_model()
+    label_encoder = LabelEncoder().fit(["Anger", "Joy"])
+    callback = LeanCheckpoint(str(tmp_path), {"builder": "zoo"}, {}, label_encoder)
+    callback.set_model(model)
+    callback.on_train_begin()
+    for epoch, loss in enumerate([1.0, 0.5, 0.7]):
+        callback.on_epoch_end(epoch, {"val_loss": loss})
+    callback.on_train_end()
+
+    with open(os.path.join(tmp_path, STATE_FILE), encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["epoch"] == 2 and state["classes"] == ["Anger", "Joy"]
+    assert len(callback.stalls) == 2
+    with np.load(os.path.join(tmp_path, WEIGHTS_FILE)) as weights:
+        assert len(weights.files) == len(checkpoint_variables(model))
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import pytest
+from src.cli import build_parser, main
+
+HEAVY_MODULES = ["tensorflow", "librosa", "matplotlib", "pandas", "sklearn"]
+
+
+def test_help_does_not_import_heavy_libraries():
+    code = (
+        "import sys\n"
+        "from src.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_parser_lists_every_subcommand():
+    parser = build_parser()
+    subcommands = parser._subparsers._group_actions[0].choices
+    assert set(subcommands) == {
+        "reorganize", "resample", "trim", "balance", "augment", "extract", "pack", "train", "tune", "infer", "export", "stats",
+        "pipeline",
+    }
+
+
+def test_stats_requires_a_features_dir(monkeypatch):
+    monkeypatch.setattr("src.cli._config_value", lambda key, fallback=None: fallback)
+    with pytest.raises(SystemExit):
+        main(["stats"])
@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import pandas as pd
+from src.PoCs.MultiModalTraining.data_loader import get_kfold_splits
+from src.PoCs.MultiModalTraining import cross_validation
+from src.PoCs.MultiModalTraining.cross_validation import prepare_shared_features, summarize_folds
+
+
+def test_kfold_splits_are_stratified_by_emotion_and_language():
+    df = pd.DataFrame({
+        "emotion": ["Joy", "Anger"] * 30,
+        "language": ["eng"] * 20 + ["fra"] * 20 + ["por"] * 20,
+    })
+    splits = get_kfold_splits(df, n_splits=5)
+
+    assert len(splits) == 5
+    all_test = np.concatenate([test_idx for _, test_idx in splits])
+    assert sorted(all_test) == list(range(len(df)))
+    for train_idx, test_idx in splits:
+        assert not set(train_idx) & set(test_idx)
+        strata = (df["emotion"] + "_" + df["language"]).iloc[test_idx]
+        assert strata.value_counts().tolist() == [2] * 6
+
+
+def test_summarize_folds_reports_mean_and_std():
+    folds = [
+        {"accuracy": 0.5, "precision": 0.4, "recall": 0.6, "f1": 0.5},
+        {"accuracy": 0.7, "precision": 0.6, "recall": 0.8, "f1": 0.7},
+    ]
+    summary = summarize_folds(folds)
+
+    assert np.isclose(summary["f1"]["mean"], 0.6)
+    assert np.isclose(summary["accuracy"]["std"], 0.1)
+
+
+def test_shared_feature_cache_is_rebuilt_when_its_settings_change(tmp_path, monkeypatch):
+    rows = []
+    for i in range(3):
+        paths = {"zcr_path": str(tmp_path / f"zcr_{i}.npy"), "rms_path": str(tmp_path / f"rms_{i}.npy")}
+        np.save(paths["zcr_path"], np.arange(10, dtype=np.float32))
+        np.save(paths["rms_path"], np.ones(10, dtype=np.float32))
+        rows.append({**paths, "mfcc_path": f"mfcc_{i}.png", "chromagram_path": f"chroma_{i}.png"})
+    df = pd.DataFrame(rows)
+    # The ResNet50 pass is replaced by a counter; only the cache decision is under test
+    builds = []
+    monkeypatch.setattr(
+        cross_validation, "compute_embeddings",
+        lambda paths, name, config: builds.append(name) or np.zeros((len(paths), 4), np.float32),
+    )
+    config = {"IMG_HEIGHT": 224, "IMG_WIDTH": 224, "NUM_CHANNELS": 3, "FIXED_1D_LENGTH": 8}
+    cache_dir = str(tmp_path / "cache")
+
+    prepare_shared_features(df, config, cache_dir)
+    prepare_shared_features(df, config, cache_dir)
+    assert len(builds) == 2
+
+    paths = prepare_shared_features(df, {**config, "FIXED_1D_LENGTH": 12}, cache_dir)
+    assert len(builds) == 4 and np.load(paths["zcr"]).shape == (3, 12)
+    prepare_shared_features(df, {**config, "FIXED_1D_LENGTH": 12, "IMG_HEIGHT": 128}, cache_dir)
+    assert len(builds) == 6
+
+    # Features re-extracted to the same paths invalidate the cache
+    config = {**config, "FIXED_1D_LENGTH": 12, "IMG_HEIGHT": 128}
+    np.save(rows[1]["zcr_path"], np.full(10, 7.0, dtype=np.float32))
+    paths = prepare_shared_features(df, config, cache_dir)
+    assert len(builds) == 8 and np.load(paths["zcr"])[1, 0] == 7.0
+    prepare_shared_features(df, config, cache_dir)
+    assert len(builds) == 8
+    os.utime(rows[2]["rms_path"], ns=(1, 1))
+    prepare_shared_features(df, config, cache_dir)
+    assert len(builds) == 10
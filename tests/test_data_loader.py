@@ -0,0 +1,84 @@
+import numpy as np
+import soundfile as sf
+from sklearn.preprocessing import LabelEncoder  # type: ignore
+from src.PoCs.MultiModalTraining.data_loader import (
+    compute_bucket_boundaries,
+    create_audio_dataset,
+    create_sharded_eval_dataset,
+    load_audio_dataframe,
+    load_labeled_dataframe,
+    load_sequence,
+    padding_report,
+    read_sequence_lengths,
+    validate_audio_features,
+)
+from src.PoCs.MultiModalTraining.benchmark import generate_synthetic_features
+from src.PoCs.MultiModalTraining.tf_features import TFFeatureExtractor
+from src.utils.waveform_store import WaveformStore, pack_waveforms
+
+
+def test_load_sequence_keeps_natural_length(tmp_path):
+    np.save(tmp_path / "zcr.npy", np.arange(7, dtype=np.float32))
+    np.save(tmp_path / "rms.npy", np.arange(7, dtype=np.float32) * 2)
+
+    sequence = load_sequence(str(tmp_path / "zcr.npy"), str(tmp_path / "rms.npy"))
+    assert sequence.shape == (7, 2) and sequence.dtype == np.float32
+    np.testing.assert_array_equal(sequence[:, 1], sequence[:, 0] * 2)
+    assert load_sequence(str(tmp_path / "zcr.npy"), str(tmp_path / "rms.npy"), max_length=4).shape == (4, 2)
+    assert list(read_sequence_lengths([str(tmp_path / "zcr.npy")], max_length=5)) == [5]
+
+
+def test_bucketing_reduces_padding_on_mixed_lengths():
+    lengths = np.random.default_rng(0).integers(50, 1000, size=2000)
+    boundaries = compute_bucket_boundaries(lengths, num_buckets=8)
+
+    assert boundaries == sorted(boundaries) and len(boundaries) == 7
+    report = padding_report(lengths, boundaries, batch_size=32, fixed_length=512)
+    assert report["bucketed_padding"] < report["fixed_padding"] / 2
+    assert report["fixed_truncated_frames"] > 0
+
+
+def test_audio_dataset_computes_features_from_the_store(tmp_path):
+    source = tmp_path / "audio"
+    source.mkdir()
+    rng = np.random.default_rng(0)
+    for i, emotion in enumerate(["Angry", "Joy", "Joy", "unknown"]):
+        sf.write(source / f"pt_m_{emotion}_{i}.wav", 0.1 * rng.standard_normal(8000 + 2000 * i), 16000)
+    pack_waveforms(str(source), str(tmp_path / "store"), sr=16000, workers=1)
+    store = WaveformStore(str(tmp_path / "store"))
+
+    df = load_audio_dataframe(store)
+    assert sorted(df["emotion"]) == ["Anger", "Joy", "Joy"]
+
+    extractor = TFFeatureExtractor(store.sample_rate)
+    errors = validate_audio_features(store, df, extractor, num_clips=3)
+    assert errors["dd_mfcc"] < 1e-2 and errors["zcr"] < 1e-6 and errors["rms"] < 1e-6
+    # FEATURE_N_FFT / FEATURE_HOP_LENGTH reach the librosa reference as well
+    errors = validate_audio_features(store, df, TFFeatureExtractor(store.sample_rate, 1024, 256), num_clips=3)
+    assert errors["dd_mfcc"] < 1e-2 and errors["zcr"] < 1e-6 and errors["rms"] < 1e-6
+
+    label_encoder = LabelEncoder().fit(df["emotion"])
+    config = {"IMG_HEIGHT": 32, "IMG_WIDTH": 32, "FIXED_1D_LENGTH": 64}
+    dataset = create_audio_dataset(store, df, label_encoder, extractor, config, batch_size=2, shuffle=False)
+    inputs, labels = next(iter(dataset))
+    assert inputs["mfcc_input"].shape == (2, 32, 32, 3)
+    assert inputs["numerical_input"].shape == (2, 128)
+    assert labels.shape == (2, 2)
+
+
+def test_sharded_eval_dataset_scores_every_row_once(tmp_path):
+    generate_synthetic_features(str(tmp_path), 5)
+    df = load_labeled_dataframe(str(tmp_path))
+    label_encoder = LabelEncoder().fit(df["emotion"])
+
+    scored = []
+    for shard in range(2):
+        dataset, steps = create_sharded_eval_dataset(df, label_encoder, 2, 2, shard)
+        batches = list(dataset)
+        # 5 rows padded to two global batches of 4, so both workers run the same 2 steps
+        assert steps == 2 and len(batches) == 2
+        for inputs, _, weights in batches:
+            first_zcr = inputs["numerical_input"].numpy()[:, 0]
+            scored.extend(first_zcr[weights.numpy() == 1])
+    expected = [np.load(path)[0] for path in df["zcr_path"]]
+    np.testing.assert_allclose(sorted(scored), sorted(expected))
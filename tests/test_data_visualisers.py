@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from src.utils.data_visualisers import audio_stats, find_npy_shapes, read_npy_shape
+
+
+def test_read_npy_shape_matches_array(tmp_path):
+    path = tmp_path / "a.npy"
+    np.save(path, np.zeros((3, 7, 2), dtype=np.float32))
+    assert read_npy_shape(str(path)) == (3, 7, 2)
+
+
+def test_read_npy_shape_reads_every_header_version(tmp_path):
+    for version in [(1, 0), (2, 0), (3, 0)]:
+        path = tmp_path / f"v{version[0]}.npy"
+        with open(path, "wb") as f:
+            np.lib.format.write_array(f, np.zeros((4, 5), dtype=np.int16), version=version)
+        assert read_npy_shape(str(path)) == (4, 5)
+
+    path = tmp_path / "v9.npy"
+    path.write_bytes(np.lib.format.magic(9, 0) + b"\x00" * 16)
+    with pytest.raises(ValueError):
+        read_npy_shape(str(path))
+
+
+def test_find_npy_shapes_walks_subdirectories(tmp_path):
+    for i, sub in enumerate(["x", "y/z", "."]):
+        (tmp_path / sub).mkdir(parents=True, exist_ok=True)
+        np.save(tmp_path / sub / f"f{i}.npy", np.zeros((i + 1, 4)))
+    (tmp_path / "x" / "notes.txt").write_text("ignored")
+    assert sorted(find_npy_shapes(str(tmp_path), workers=2)) == [(1, 4), (2, 4), (3, 4)]
+
+
+def test_audio_stats_from_headers(tmp_path):
+    sf.write(tmp_path / "pt_m_happy_1.wav", np.zeros(16000), 16000)
+    sf.write(tmp_path / "fr_f_sad_2.wav", np.zeros(8000), 16000)
+    sf.write(tmp_path / "unnamed.wav", np.zeros(22050), 22050)
+
+    stats = audio_stats(str(tmp_path), workers=2)
+
+    assert stats["files"] == 3
+    assert stats["samplerates"] == {16000: 2, 22050: 1}
+    assert stats["by_emotion"]["happy"]["total"] == 1.0
+    assert stats["by_emotion"]["sad"]["total"] == 0.5
+    assert stats["by_emotion"]["unknown"]["count"] == 1
+    assert set(stats["by_language"]) == {"pt", "fr", "unknown"}
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.distill import (
+    NUM_FRAME_FEATURES,
+    distillation_loss,
+    frame_features,
+    match_store_clips,
+    soften,
+)
+from src.PoCs.MultiModalTraining.tf_features import TFFeatureExtractor
+
+
+def test_soften_keeps_the_ranking_and_flattens_with_temperature():
+    probabilities = np.array([[0.7, 0.2, 0.1]])
+
+    np.testing.assert_allclose(soften(probabilities, 1.0), probabilities, rtol=1e-6)
+    softened = soften(probabilities, 4.0)
+    assert np.argsort(softened[0]).tolist() == [2, 1, 0]
+    assert softened.max() < 0.7 and np.isclose(softened.sum(), 1.0)
+
+
+def test_distillation_loss_reduces_to_cross_entropy_with_alpha_one():
+    logits = tf.constant([[2.0, 0.5, -1.0]])
+    y_true = tf.constant([[1.0, 0.0, 0.0, 0.2, 0.3, 0.5]])
+
+    loss = distillation_loss(3, temperature=4.0, alpha=1.0)(y_true, logits)
+    expected = tf.keras.losses.categorical_crossentropy(y_true[:, :3], logits, from_logits=True)
+    np.testing.assert_allclose(loss.numpy(), expected.numpy(), rtol=1e-6)
+
+    # The soft term vanishes when the student matches the softened teacher
+    soft = tf.nn.softmax(logits / 4.0)
+    matched = distillation_loss(3, temperature=4.0, alpha=0.0)(tf.concat([y_true[:, :3], soft], axis=1), logits)
+    assert abs(float(matched[0])) < 1e-6
+
+
+def test_frame_features_are_padded_to_a_fixed_number_of_frames():
+    waveform = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 0.1
+    frames = frame_features(TFFeatureExtractor(16000), waveform, 64)
+
+    assert frames.shape == (64, NUM_FRAME_FEATURES)
+    # 16000 samples at hop 512 give 32 frames; the rest is padding
+    assert np.all(frames.numpy()[32:] == 0) and np.any(frames.numpy()[31] != 0)
+
+
+def test_feature_split_rows_are_matched_to_store_clips_by_name():
+    split_df = pd.DataFrame({
+        "mfcc_path": ["feats/eng_M_Joy_3/dd_mfcc.jpeg", "feats/fr_F_Anger_1/dd_mfcc.jpeg", "feats/por_M_Fear_2/dd_mfcc.jpeg"],
+        "emotion": ["Joy", "Anger", "Fear"],
+    })
+    store_df = pd.DataFrame({
+        "path": ["dataset/Anger/fr_F_Anger_1.wav", "dataset/Joy/eng_M_Joy_3.wav", "dataset/Joy/eng_M_Joy_4.wav"],
+        "clip_id": [0, 1, 2],
+    })
+
+    matched = match_store_clips(split_df, store_df)
+
+    # Clips outside the split are never pulled in, and split rows missing from the store are dropped
+    assert dict(zip(matched["emotion"], matched["clip_id"])) == {"Joy": 1, "Anger": 0}
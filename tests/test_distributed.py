@@ -0,0 +1,35 @@
+import json
+import pytest
+from src.PoCs.MultiModalTraining.distributed import PlateauMonitor, build_tf_config, evaluate, scaled_hyperparameters
+
+
+def test_tf_config_describes_a_localhost_cluster():
+    tf_config = json.loads(build_tf_config([1234, 1235], 1))
+    assert tf_config["cluster"]["worker"] == ["localhost:1234", "localhost:1235"]
+    assert tf_config["task"] == {"type": "worker", "index": 1}
+
+
+def test_batch_and_learning_rate_scaling():
+    config = {"BATCH_SIZE": 32, "LEARNING_RATE": 0.001}
+    # Default: same global batch and learning rate as single-process training
+    assert scaled_hyperparameters(config, 4) == (32, 0.001)
+    # Scaled: per-worker batch kept, global batch and learning rate grow together
+    assert scaled_hyperparameters({**config, "DISTRIBUTED_SCALE_BATCH": True}, 4) == (128, 0.004)
+    with pytest.raises(ValueError):
+        scaled_hyperparameters(config, 3)
+
+
+def test_plateau_monitor_follows_train_callbacks():
+    monitor = PlateauMonitor(stop_patience=3, lr_patience=2)
+    assert monitor.update(1.0, 0.1) == (True, None, False)
+    assert monitor.update(1.1, 0.1) == (False, None, False)
+    improved, new_lr, stop = monitor.update(1.2, 0.1)
+    assert not improved and new_lr == pytest.approx(0.02) and not stop
+    assert monitor.update(1.3, 0.02) == (False, None, True)
+
+
+def test_evaluate_averages_over_unpadded_rows_only():
+    # Two global batches of 4 holding 5 real rows: (summed loss, correct, weight) per step
+    steps = iter([(2.0, 3.0, 4.0), (0.5, 0.0, 1.0)])
+    loss, accuracy = evaluate(lambda iterator: next(iterator), steps, 2)
+    assert loss == pytest.approx(0.5) and accuracy == pytest.approx(0.6)
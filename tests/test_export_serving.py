@@ -0,0 +1,40 @@
+import numpy as np
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.export_serving import export_serving_model
+from src.PoCs.MultiModalTraining.tf_features import TFFeatureExtractor
+
+CONFIG = {"IMG_HEIGHT": 16, "IMG_WIDTH": 16, "FIXED_1D_LENGTH": 32}
+CLASSES = ["Anger", "Joy", "Sadness"]
+
+
+def _tiny_model():
+    tf.keras.utils.set_random_seed(0)
+    mfcc = tf.keras.Input(shape=(16, 16, 3), name="mfcc_input")
+    chroma = tf.keras.Input(shape=(16, 16, 3), name="chroma_input")
+    numerical = tf.keras.Input(shape=(64,), name="numerical_input")
+    pooled = [tf.keras.layers.GlobalAveragePooling2D()(image) for image in (mfcc, chroma)]
+    x = tf.keras.layers.Concatenate()([*pooled, numerical])
+    outputs = tf.keras.layers.Dense(len(CLASSES), activation="softmax")(x)
+    return tf.keras.Model([mfcc, chroma, numerical], outputs)
+
+
+def test_saved_model_maps_raw_pcm_to_label_and_probabilities(tmp_path):
+    model = _tiny_model()
+    export_serving_model(model, CLASSES, CONFIG, str(tmp_path / "serving"), sr=16000)
+
+    # Reloaded without any project code, like a serving runtime would
+    serve = tf.saved_model.load(str(tmp_path / "serving")).signatures["serving_default"]
+    t = np.arange(16000) / 16000
+    waveform = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    result = serve(waveform=tf.constant(waveform))
+
+    assert set(result) == {"label", "probabilities", "classes"}
+    probabilities = result["probabilities"].numpy()
+    assert probabilities.shape == (len(CLASSES),) and np.isclose(probabilities.sum(), 1.0, atol=1e-5)
+    assert [c.decode() for c in result["classes"].numpy()] == CLASSES
+    assert result["label"].numpy().decode() == CLASSES[int(np.argmax(probabilities))]
+
+    # Same prediction as the model fed the in-graph features directly
+    inputs = TFFeatureExtractor(16000).model_inputs(waveform, 16, 16, 32)
+    expected = model({name: tensor[tf.newaxis] for name, tensor in inputs.items()}, training=False)[0]
+    np.testing.assert_allclose(probabilities, expected.numpy(), atol=1e-5)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.export_tflite import (
+    TFLiteRunner,
+    convert_to_tflite,
+    export_tflite_models,
+    representative_dataset,
+)
+
+
+def _tiny_model():
+    tf.keras.utils.set_random_seed(0)
+    image = tf.keras.Input(shape=(8, 8, 3), name="mfcc_input")
+    numerical = tf.keras.Input(shape=(16,), name="numerical_input")
+    x = tf.keras.layers.Concatenate()([tf.keras.layers.Flatten()(image), numerical])
+    x = tf.keras.layers.Dense(8, activation="relu")(x)
+    return tf.keras.Model([image, numerical], tf.keras.layers.Dense(3, activation="softmax")(x))
+
+
+def _inputs(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return {
+        "mfcc_input": rng.standard_normal((n, 8, 8, 3)).astype(np.float32),
+        "numerical_input": rng.standard_normal((n, 16)).astype(np.float32),
+    }
+
+
+@pytest.mark.parametrize("mode, atol", [("float32", 1e-5), ("dynamic", 0.05)])
+def test_tflite_runner_matches_keras(tmp_path, mode, atol):
+    model = _tiny_model()
+    path = tmp_path / f"model_{mode}.tflite"
+    path.write_bytes(convert_to_tflite(model, mode))
+
+    runner = TFLiteRunner(str(path))
+    for sample in range(3):
+        inputs = {name: value[sample:sample + 1] for name, value in _inputs(3).items()}
+        expected = model(inputs, training=False).numpy()
+        np.testing.assert_allclose(runner.predict(inputs), expected, atol=atol)
+
+
+def test_int8_needs_a_representative_dataset():
+    with pytest.raises(ValueError):
+        convert_to_tflite(_tiny_model(), "int8")
+    with pytest.raises(ValueError):
+        convert_to_tflite(_tiny_model(), "float16")
+
+
+def test_export_writes_one_build_per_mode(tmp_path):
+    train_ds = tf.data.Dataset.from_tensor_slices((_inputs(16), np.zeros((16, 3), np.float32))).batch(4)
+    calibration = list(representative_dataset(train_ds, num_samples=5)())
+    assert len(calibration) == 5 and calibration[0]["numerical_input"].shape == (1, 16)
+
+    paths = export_tflite_models(_tiny_model(), train_ds, {"TFLITE_DIR": str(tmp_path), "TFLITE_CALIBRATION_SAMPLES": 8})
+    assert sorted(paths) == ["dynamic", "float32", "int8"]
+    inputs = {name: value[:1] for name, value in _inputs(1).items()}
+    probabilities = TFLiteRunner(paths["int8"]).predict(inputs)
+    assert probabilities.shape == (1, 3) and np.isclose(probabilities.sum(), 1.0, atol=0.05)
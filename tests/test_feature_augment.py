@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.feature_augment import (
+    DEFAULT_SETTINGS,
+    augment_batch,
+    band_mask,
+    feature_augmenter,
+    time_warp_positions,
+)
+
+OFF = {**DEFAULT_SETTINGS, "FREQ_MASKS": 0, "TIME_MASKS": 0, "TIME_WARP": 0.0, "GAIN_DB": 0.0}
+
+
+def _batch(batch_size=8, height=16, width=24, length=20):
+    rng = np.random.default_rng(0)
+    return {
+        "mfcc_input": tf.constant(rng.standard_normal((batch_size, height, width, 3)), tf.float32),
+        "chroma_input": tf.constant(rng.standard_normal((batch_size, height, width, 3)), tf.float32),
+        "numerical_input": tf.constant(rng.uniform(0.1, 1.0, (batch_size, 2 * length)), tf.float32),
+    }
+
+
+def test_band_mask_and_warp_stay_within_bounds():
+    mask = band_mask(64, 40, 1, 0.25).numpy()
+    assert mask.shape == (64, 40)
+    assert (40 - mask.sum(axis=1)).max() <= 10 and mask.min() == 0.0
+
+    positions = time_warp_positions(64, 40, 0.1).numpy()
+    assert np.all(np.diff(positions, axis=1) > 0)
+    np.testing.assert_allclose(positions[:, [0, -1]], [[0.0, 39.0]] * 64, atol=1e-4)
+    assert np.abs(positions - np.arange(40)).max() <= 0.1 * 39 + 1e-4
+
+
+def test_augment_batch_is_identity_when_disabled_and_jitters_rms_only():
+    inputs = _batch()
+    unchanged, labels = augment_batch(inputs, tf.zeros([8]), OFF)
+    for name in inputs:
+        np.testing.assert_allclose(unchanged[name].numpy(), inputs[name].numpy(), atol=1e-6)
+    assert labels.shape == (8,)
+
+    jittered, _ = augment_batch(inputs, tf.zeros([8]), {**OFF, "GAIN_DB": 6.0})
+    original, result = inputs["numerical_input"].numpy(), jittered["numerical_input"].numpy()
+    np.testing.assert_allclose(result[:, :20], original[:, :20], atol=1e-6)
+    ratio = result[:, 20:] / original[:, 20:]
+    # One gain per sample, within +/- 6 dB
+    np.testing.assert_allclose(ratio, ratio[:, :1] * np.ones((1, 20)), rtol=1e-5)
+    assert np.all((ratio > 10 ** (-6 / 20) - 1e-6) & (ratio < 10 ** (6 / 20) + 1e-6))
+
+
+def test_masks_and_warp_share_the_time_axis_between_images():
+    inputs = _batch()
+    inputs["chroma_input"] = inputs["mfcc_input"]
+    settings = {**OFF, "TIME_MASKS": 2, "TIME_WARP": 0.1}
+    augmented, _ = augment_batch(inputs, tf.zeros([8]), settings)
+
+    np.testing.assert_allclose(augmented["mfcc_input"].numpy(), augmented["chroma_input"].numpy())
+    assert augmented["mfcc_input"].shape == inputs["mfcc_input"].shape
+    assert augmented["numerical_input"].shape == inputs["numerical_input"].shape
+
+
+def test_feature_augmenter_is_off_by_default_and_checks_settings():
+    assert feature_augmenter({}) is None
+    assert feature_augmenter({"FEATURE_AUGMENT": True}) is not None
+    with pytest.raises(ValueError):
+        feature_augmenter({"FEATURE_AUGMENT": True, "FEATURE_AUGMENT_SETTINGS": {"FREQ_MASK": 1}})
+    with pytest.raises(ValueError):
+        feature_augmenter({"FEATURE_AUGMENT": True, "FEATURE_AUGMENT_SETTINGS": {"TIME_WARP": 0.25}})
@@ -0,0 +1,35 @@
+import os
+import numpy as np
+from PIL import Image
+from src.utils.image_codec import transcode_tree
+
+
+def _make_png(path, value):
+    Image.fromarray(np.full((8, 8, 4), value, dtype=np.uint8), "RGBA").save(path)
+
+
+def test_transcode_tree_converts_and_removes_sources(tmp_path):
+    (tmp_path / "a").mkdir()
+    _make_png(tmp_path / "a" / "dd_mfcc.png", 10)
+    _make_png(tmp_path / "chromagram.png", 200)
+
+    counts = transcode_tree(str(tmp_path), workers=2)
+
+    assert counts == {"converted": 2, "skipped": 0, "failed": 0}
+    assert sorted(os.listdir(tmp_path / "a")) == ["dd_mfcc.jpeg"]
+    with Image.open(tmp_path / "chromagram.jpeg") as img:
+        assert img.format == "JPEG" and img.mode == "RGB"
+
+
+def test_transcode_tree_resumes_after_interruption(tmp_path):
+    _make_png(tmp_path / "done.png", 10)
+    _make_png(tmp_path / "todo.png", 10)
+    # State left by an interrupted run: one finished target whose source was not yet
+    # removed, and a partial temporary file
+    Image.new("RGB", (8, 8)).save(tmp_path / "done.jpeg")
+    (tmp_path / "todo.jpeg.tmp").write_bytes(b"partial")
+
+    counts = transcode_tree(str(tmp_path), workers=2)
+
+    assert counts == {"converted": 1, "skipped": 1, "failed": 0}
+    assert sorted(os.listdir(tmp_path)) == ["done.jpeg", "todo.jpeg"]
@@ -0,0 +1,73 @@
+import csv
+import json
+import numpy as np
+import tensorflow as tf  # type: ignore
+from src.PoCs.MultiModalTraining.infer import ResultWriter, build_batch, collect_audio_paths, parity_report
+
+
+def test_parity_report_measures_the_prediction_gap():
+    reference = np.array([[0.7, 0.2, 0.1], [0.1, 0.6, 0.3]])
+    candidate = np.array([[0.6, 0.3, 0.1], [0.1, 0.3, 0.6]])
+
+    report = parity_report(reference, candidate, "candidate")
+
+    assert report["clips"] == 2
+    assert report["top1_agreement"] == 0.5
+    np.testing.assert_allclose([report["mean_abs_diff"], report["max_abs_diff"]], [0.8 / 6, 0.3])
+
+
+def test_collect_audio_paths_expands_directories_and_file_lists(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    for name in ("b.wav", "a.FLAC", "notes.txt", "sub/c.mp3", "sub/image.png"):
+        (corpus / name).write_bytes(b"")
+    listing = tmp_path / "list.txt"
+    listing.write_text("x/one.wav\n\n  x/two.ogg  \n", encoding="utf-8")
+
+    paths = collect_audio_paths([str(corpus), str(listing), "single.wav"])
+
+    # Directories are filtered by extension (case-insensitively); listed and explicit paths are kept as given
+    assert paths == [
+        str(corpus / "a.FLAC"), str(corpus / "b.wav"), str(corpus / "sub" / "c.mp3"),
+        "x/one.wav", "x/two.ogg", "single.wav",
+    ]
+
+
+def test_build_batch_stacks_decoded_images_and_padded_features():
+    config = {"IMG_HEIGHT": 8, "IMG_WIDTH": 6, "NUM_CHANNELS": 3, "FIXED_1D_LENGTH": 4}
+    jpeg = tf.io.encode_jpeg(tf.zeros((10, 10, 3), tf.uint8)).numpy()
+    prepared = [
+        {"mfcc_jpeg": jpeg, "chroma_jpeg": jpeg, "zcr": np.arange(6.0), "rms": np.ones(2)},
+        {"mfcc_jpeg": jpeg, "chroma_jpeg": jpeg, "zcr": np.arange(3.0), "rms": np.ones(5)},
+    ]
+
+    batch = build_batch(prepared, config)
+
+    assert batch["mfcc_input"].shape == batch["chroma_input"].shape == (2, 8, 6, 3)
+    assert batch["numerical_input"].dtype == np.float32
+    np.testing.assert_array_equal(batch["numerical_input"], [
+        [0, 1, 2, 3, 1, 1, 0, 0],
+        [0, 1, 2, 0, 1, 1, 1, 1],
+    ])
+
+
+def test_result_writer_rows(tmp_path):
+    classes = ["Anger", "Joy"]
+    probabilities = np.array([[0.25, 0.75], [0.9, 0.1]])
+
+    for name in ("out.csv", "out.jsonl"):
+        writer = ResultWriter(str(tmp_path / name), classes)
+        writer.write(["a.wav", "b.wav"], probabilities)
+        writer.close()
+
+    with open(tmp_path / "out.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [
+            ["path", "label", "prob_Anger", "prob_Joy"],
+            ["a.wav", "Joy", "0.250000", "0.750000"],
+            ["b.wav", "Anger", "0.900000", "0.100000"],
+        ]
+    rows = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert rows == [
+        {"path": "a.wav", "label": "Joy", "probabilities": {"Anger": 0.25, "Joy": 0.75}},
+        {"path": "b.wav", "label": "Anger", "probabilities": {"Anger": 0.9, "Joy": 0.1}},
+    ]
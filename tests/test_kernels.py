@@ -0,0 +1,34 @@
+import librosa  # type: ignore
+import numpy as np
+from src.utils.kernels import add_awgn, frame_zcr_rms
+
+
+def test_frame_zcr_rms_matches_librosa():
+    rng = np.random.default_rng(0)
+    for length in (100, 2048, 48001):
+        signal = (0.1 * rng.standard_normal(length)).astype(np.float32)
+        # Exact zeros (and negative zeros) count as positive, as in librosa
+        signal[::7] = 0.0
+        signal[::11] = -0.0
+
+        zcr, rms = frame_zcr_rms(signal)
+
+        expected_zcr = librosa.feature.zero_crossing_rate(y=signal)[0]
+        expected_rms = librosa.feature.rms(y=signal)[0]
+        assert zcr.shape == expected_zcr.shape and rms.dtype == expected_rms.dtype
+        np.testing.assert_array_equal(zcr, expected_zcr)
+        np.testing.assert_allclose(rms, expected_rms, rtol=1e-6)
+
+
+def test_add_awgn_is_in_place_and_hits_the_snr():
+    t = np.arange(48000) / 16000
+    clean = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    audio = clean.copy()
+
+    result = add_awgn(audio, 20.0, rng=np.random.default_rng(1))
+
+    assert result is audio and audio.dtype == np.float32
+    noise = audio.astype(np.float64) - clean
+    snr = 10 * np.log10(np.mean(clean.astype(np.float64) ** 2) / np.mean(noise ** 2))
+    assert abs(snr - 20.0) < 0.1
+    np.testing.assert_array_equal(add_awgn(clean.copy(), 20.0, rng=np.random.default_rng(1)), audio)
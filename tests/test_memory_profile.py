@@ -0,0 +1,47 @@
+import builtins
+import json
+from src.utils import memory_profile
+from src.utils.memory_profile import MemoryProfiler
+
+
+def test_disabled_profiler_is_a_no_op(tmp_path):
+    profiler = MemoryProfiler(report_path=None)
+    with profiler.stage("noop"):
+        profiler.tick()
+    assert profiler.stages == []
+
+
+def test_stage_records_peaks_checkpoints_and_report(tmp_path):
+    report = tmp_path / "memory.json"
+    profiler = MemoryProfiler(report_path=str(report), every_n_files=2)
+
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            for _ in range(5):
+                buffers = [bytearray(1_000_000)]
+                profiler.tick()
+        del buffers
+
+    inner, outer = profiler.stages
+    assert inner["stage"] == "inner" and outer["stage"] == "outer"
+    assert inner["files"] == 5
+    assert [c["files"] for c in inner["checkpoints"]] == [2, 4]
+    assert inner["peak_traced_mb"] >= 1.0
+    # The outer stage must not lose the peak reached inside the nested one
+    assert outer["peak_traced_mb"] >= inner["peak_traced_mb"]
+    assert [s["stage"] for s in json.loads(report.read_text())["stages"]] == ["inner", "outer"]
+
+
+def test_rss_readings_fall_back_without_proc_or_resource(monkeypatch):
+    # Neither /proc nor the POSIX resource module exists on Windows
+    real_import = builtins.__import__
+
+    def _import(name, *args, **kwargs):
+        if name == "resource":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(memory_profile, "_read_status_mb", lambda field: None)
+    monkeypatch.setattr(builtins, "__import__", _import)
+    assert memory_profile.peak_rss_mb() == 0.0
+    assert memory_profile.current_rss_mb() == 0.0
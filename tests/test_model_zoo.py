@@ -0,0 +1,32 @@
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from src.PoCs.MultiModalTraining.model_zoo import MODEL_ZOO, build_model, random_inputs, recurrent_flops
+
+
+def test_registry_lists_the_hybrids():
+    assert {"resnet50", "cnn_rnn", "cnn_lstm", "cnn_gru"} <= set(MODEL_ZOO)
+
+
+def test_hybrid_builds_over_loader_inputs():
+    scaler = StandardScaler().fit(np.random.default_rng(0).random((4, 16)))
+    model = build_model("cnn_gru", (32, 32, 3), (32,), 5, scaler, scaler)
+
+    assert sorted(t.name.split(":")[0] for t in model.inputs) == ["chroma_input", "mfcc_input", "numerical_input"]
+    assert model.predict_on_batch(random_inputs(model, 2)).shape == (2, 5)
+    # Image branches: 4 time steps of 4 * 128 features into 128 units;
+    # numerical branch: 4 time steps of 32 features into 64 units (3 gates, 2 FLOPs per multiply-add)
+    expected = 2 * (2 * 3 * 4 * (512 * 128 + 128 * 128 + 128)) + 2 * 3 * 4 * (32 * 64 + 64 * 64 + 64)
+    assert recurrent_flops(model) == expected
+
+
+def test_hybrid_reloads_from_a_keras_file(tmp_path):
+    import tensorflow as tf  # type: ignore
+
+    scaler = StandardScaler().fit(np.random.default_rng(0).random((4, 16)))
+    model = build_model("cnn_lstm", (32, 32, 3), (32,), 5, scaler, scaler)
+    path = str(tmp_path / "best_model.keras")
+    model.save(path)
+
+    reloaded = tf.keras.models.load_model(path)
+    inputs = random_inputs(model, 2)
+    np.testing.assert_allclose(reloaded.predict_on_batch(inputs), model.predict_on_batch(inputs), rtol=1e-5, atol=1e-6)
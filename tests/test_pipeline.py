@@ -0,0 +1,92 @@
+import os
+import pytest
+from src.pipeline import Pipeline, Stage, default_stages, topological_order
+
+
+def append_suffix(source, destination, suffix):
+    with open(source, "r", encoding="utf-8") as f:
+        content = f.read()
+    with open(destination, "w", encoding="utf-8") as f:
+        f.write(content + suffix)
+
+
+def _stages(tmp_path, suffix_b="b"):
+    source, out_a, out_b = (str(tmp_path / name) for name in ("source.txt", "a.txt", "b.txt"))
+    return [
+        Stage(
+            "a", "tests.test_pipeline:append_suffix",
+            params={"source": source, "destination": out_a, "suffix": "a"},
+            inputs=[source], outputs=[out_a],
+        ),
+        Stage(
+            "b", "tests.test_pipeline:append_suffix",
+            params={"source": out_a, "destination": out_b, "suffix": suffix_b},
+            inputs=[out_a], outputs=[out_b], deps=["a"],
+        ),
+    ]
+
+
+def test_only_stages_with_changed_inputs_or_params_rerun(tmp_path):
+    (tmp_path / "source.txt").write_text("x")
+    state = str(tmp_path / "state.json")
+
+    assert Pipeline(_stages(tmp_path), state).run() == {"a": "ran", "b": "ran"}
+    assert (tmp_path / "b.txt").read_text() == "xab"
+    assert Pipeline(_stages(tmp_path), state).run() == {"a": "skipped", "b": "skipped"}
+
+    # A parameter change rebuilds only the stage it belongs to
+    assert Pipeline(_stages(tmp_path, suffix_b="B"), state).run() == {"a": "skipped", "b": "ran"}
+    assert (tmp_path / "b.txt").read_text() == "xaB"
+
+    # An input change propagates downstream through the files the stages share
+    (tmp_path / "source.txt").write_text("y")
+    os.utime(tmp_path / "source.txt", ns=(1, 1))
+    assert Pipeline(_stages(tmp_path, suffix_b="B"), state).run() == {"a": "ran", "b": "ran"}
+    assert (tmp_path / "b.txt").read_text() == "yaB"
+
+
+def append_in_place(path, suffix):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(suffix)
+
+
+def test_stages_editing_a_shared_tree_in_place_settle_after_one_run(tmp_path):
+    (tmp_path / "source.txt").write_text("x")
+    source, out_a = str(tmp_path / "source.txt"), str(tmp_path / "a.txt")
+    stages = [
+        Stage(
+            "a", "tests.test_pipeline:append_suffix",
+            params={"source": source, "destination": out_a, "suffix": "a"},
+            inputs=[source], outputs=[out_a],
+        ),
+        # Edits the input of stage a in place, like balance does to the dataset tree
+        Stage(
+            "b", "tests.test_pipeline:append_in_place",
+            params={"path": source, "suffix": "b"},
+            inputs=[source], outputs=[source], deps=["a"],
+        ),
+    ]
+    state = str(tmp_path / "state.json")
+
+    assert Pipeline(stages, state).run() == {"a": "ran", "b": "ran"}
+    assert Pipeline(stages, state).run() == {"a": "skipped", "b": "skipped"}
+    assert (tmp_path / "source.txt").read_text() == "xb"
+
+
+def test_failed_stage_blocks_its_dependents(tmp_path):
+    stages = _stages(tmp_path)  # source.txt is missing, so stage a fails
+    assert Pipeline(stages, str(tmp_path / "state.json")).run() == {"a": "failed", "b": "blocked"}
+
+
+def test_cycles_are_rejected():
+    stages = [Stage("a", "m:f", deps=["b"]), Stage("b", "m:f", deps=["a"])]
+    with pytest.raises(ValueError):
+        topological_order(stages)
+
+
+def test_module_settings_reach_only_their_stage():
+    config = {"AUGMENTATION_SETTINGS": {"SNR_LOW": [20, 25]}, "EXTRACTION_SETTINGS": {"KERNEL_BACKEND": "librosa"}}
+    stages = {stage.name: stage for stage in default_stages(config)}
+    assert stages["augment"].overrides == {"SNR_LOW": [20, 25]}
+    assert stages["extract"].overrides == {"KERNEL_BACKEND": "librosa"}
+    assert not stages["rename"].overrides
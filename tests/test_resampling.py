@@ -0,0 +1,55 @@
+import os
+import numpy as np
+import pytest
+import soundfile as sf
+from src.utils.resampling import normalize_sample_rate, resample
+
+
+def _tone(sr, seconds=1.0, freq=440.0):
+    t = np.arange(int(seconds * sr)) / sr
+    return 0.5 * np.sin(2 * np.pi * freq * t)
+
+
+def test_normalize_sample_rate_resamples_only_off_rate_files(tmp_path):
+    sf.write(tmp_path / "pt_m_happy_1.wav", _tone(48000), 48000, subtype="PCM_24")
+    sf.write(tmp_path / "fr_f_sad_2.wav", _tone(16000), 16000)
+    os.utime(tmp_path / "fr_f_sad_2.wav", ns=(0, 0))
+
+    counts = normalize_sample_rate(str(tmp_path), sr=16000, quality="fast", workers=1)
+
+    assert counts == {"resampled": 1, "skipped": 1, "failed": 0}
+    info = sf.info(str(tmp_path / "pt_m_happy_1.wav"))
+    assert (info.samplerate, info.frames, info.subtype) == (16000, 16000, "PCM_24")
+    # The already-canonical file is not rewritten
+    assert os.stat(tmp_path / "fr_f_sad_2.wav").st_mtime_ns == 0
+    assert not [name for name in os.listdir(tmp_path) if ".resampling" in name]
+
+    # The tone survives the conversion, and a second pass has nothing to do
+    signal, _ = sf.read(str(tmp_path / "pt_m_happy_1.wav"))
+    assert np.argmax(np.abs(np.fft.rfft(signal))) == 440
+    assert normalize_sample_rate(str(tmp_path), sr=16000, workers=1)["resampled"] == 0
+
+
+def test_resample_quality_tiers():
+    signal = _tone(44100).astype(np.float32)
+
+    assert resample(signal, 16000, 16000) is signal
+    fast, high = resample(signal, 44100, 16000, "fast"), resample(signal, 44100, 16000, "high")
+    assert fast.shape == high.shape == (16000,)
+    np.testing.assert_allclose(fast[1000:-1000], high[1000:-1000], atol=1e-2)
+    with pytest.raises(ValueError):
+        resample(signal, 44100, 16000, "best")
+
+
+def test_inference_features_are_computed_at_the_canonical_rate(tmp_path):
+    from src.utils.extract_lib import encode_clip_features
+
+    sf.write(tmp_path / "native.wav", _tone(48000), 48000)
+    sf.write(tmp_path / "canonical.wav", _tone(16000), 16000)
+
+    _, native = encode_clip_features(str(tmp_path / "native.wav"))
+    _, canonical = encode_clip_features(str(tmp_path / "canonical.wav"))
+
+    # Same frame grid as the training features, whatever the file's own rate
+    assert native["zcr"].shape == native["rms"].shape == canonical["zcr"].shape
+    np.testing.assert_allclose(native["rms"][2:-2], canonical["rms"][2:-2], rtol=1e-2)
@@ -0,0 +1,110 @@
+import numpy as np
+import librosa
+from src.PoCs.MultiModalTraining.streaming import IncrementalFeatureExtractor, RingBuffer, StreamingEmotionRecognizer
+
+
+def _signal(sr=16000, seconds=2.0):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sr * seconds)) / sr
+    return (0.5 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def test_ring_buffer_keeps_newest_columns_in_order():
+    buffer = RingBuffer(4)
+    buffer.extend(np.arange(3, dtype=np.float32))
+    buffer.extend(np.arange(3, 6, dtype=np.float32))
+
+    assert len(buffer) == 4
+    assert buffer.latest().tolist() == [2, 3, 4, 5]
+    assert buffer.latest(2).tolist() == [4, 5]
+
+
+def test_incremental_features_match_librosa_away_from_edges():
+    sr = 16000
+    y = _signal(sr)
+    extractor = IncrementalFeatureExtractor(sr, window_frames=1000)
+    for start in range(0, len(y), 1600):
+        extractor.push(y[start:start + 1600])
+    features = extractor.features()
+
+    n = features["zcr"].shape[0]
+    inner = slice(8, n - 8)
+    ref_rms = librosa.feature.rms(y=y)[0][:n]
+    ref_zcr = librosa.feature.zero_crossing_rate(y=y)[0][:n]
+    # Tuning is estimated over the window, as chroma_stft estimates it over the clip
+    ref_chroma = librosa.feature.chroma_stft(y=y, sr=sr)[:, :n]
+
+    np.testing.assert_allclose(features["rms"][inner], ref_rms[inner], rtol=1e-4)
+    np.testing.assert_allclose(features["zcr"][inner], ref_zcr[inner], atol=1e-6)
+    np.testing.assert_allclose(features["chroma"][:, inner], ref_chroma[:, inner], atol=1e-3)
+    assert features["dd_mfcc"].shape == (13, n)
+
+    ref_mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)[:, :n]
+    ref_dd_mfcc = librosa.feature.delta(ref_mfcc, order=2)
+    np.testing.assert_allclose(features["dd_mfcc"][:, inner], ref_dd_mfcc[:, inner], atol=1e-2)
+
+
+def test_chroma_uses_the_tuning_estimated_over_the_window():
+    sr = 16000
+    t = np.arange(2 * sr) / sr
+    # About a third of a semitone sharp of A3, so the estimated tuning is far from 0
+    y = (0.5 * np.sin(2 * np.pi * 224.5 * t)).astype(np.float32)
+    extractor = IncrementalFeatureExtractor(sr, window_frames=1000)
+    extractor.push(y)
+    chroma = extractor.features()["chroma"]
+
+    n = chroma.shape[1]
+    inner = slice(8, n - 8)
+    assert abs(librosa.estimate_tuning(y=y, sr=sr)) > 0.2
+    np.testing.assert_allclose(chroma[:, inner], librosa.feature.chroma_stft(y=y, sr=sr)[:, :n][:, inner], atol=1e-3)
+
+
+def test_window_tuning_matches_librosa_after_the_buffers_wrap():
+    sr = 16000
+    t = np.arange(3 * sr) / sr
+    # The pitch drifts, so the tuning over the last window differs from the whole clip's
+    y = (0.5 * np.sin(2 * np.pi * 220 * (1 + 0.01 * t) * t)).astype(np.float32)
+    extractor = IncrementalFeatureExtractor(sr, window_frames=20)
+    for start in range(0, len(y), 1000):
+        extractor.push(y[start:start + 1000])
+        expected = librosa.estimate_tuning(S=extractor.power.latest(), sr=sr, bins_per_octave=12)
+        assert np.isclose(extractor.tuning(), expected)
+    assert extractor.frames > 20
+
+
+def test_recognizer_emits_on_its_hop_over_the_latest_window():
+    sr, window_frames, hop_frames = 16000, 16, 4
+    calls = []
+
+    def _predict(inputs):
+        calls.append(inputs)
+        return np.array([[0.2, 0.8]])
+
+    config = {"IMG_HEIGHT": 8, "IMG_WIDTH": 8, "FIXED_1D_LENGTH": 16}
+    recognizer = StreamingEmotionRecognizer(
+        _predict, ["Anger", "Joy"], config, sr, window_seconds=window_frames * 512 / sr, hop_seconds=hop_frames * 512 / sr
+    )
+    y = _signal(sr, 1.5)
+    emitted, frames_at_emit = [], []
+    for start in range(0, len(y), 1600):
+        for prediction in recognizer.push(y[start:start + 1600]):
+            emitted.append(prediction)
+            frames_at_emit.append(recognizer.extractor.frames)
+
+    assert len(emitted) == len(calls) > 5
+    assert all(p["label"] == "Joy" and p["probabilities"] == {"Anger": 0.2, "Joy": 0.8} for p in emitted)
+    # Nothing before the delta-delta filter has a full window, then one prediction per hop
+    # (a 1600-sample chunk completes 3 or 4 frames, so a hop may overshoot by up to 3)
+    assert frames_at_emit[0] >= 9
+    gaps = np.diff(frames_at_emit)
+    assert gaps.min() >= hop_frames and gaps.max() < hop_frames + 4
+    assert [p["time"] for p in emitted] == [f * 512 / sr for f in frames_at_emit]
+    assert calls[-1]["numerical_input"].shape == (1, 32)
+
+    # Once wrapped, the buffers hold exactly the newest window of frames
+    reference = IncrementalFeatureExtractor(sr, window_frames=1000)
+    reference.push(y)
+    features = recognizer.extractor.features()
+    assert recognizer.extractor.frames > window_frames
+    np.testing.assert_array_equal(features["zcr"], reference.zcr.latest()[-window_frames:])
+    np.testing.assert_array_equal(features["rms"], reference.rms.latest()[-window_frames:])
@@ -0,0 +1,51 @@
+import numpy as np
+import librosa  # type: ignore
+import pytest
+from src.PoCs.MultiModalTraining.tf_features import TUNING_BINS, TFFeatureExtractor
+from src.utils import extract_lib
+from src.utils.extract_lib import compute_features
+
+SR = 16000
+
+
+def _test_signal(seconds=2.0):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SR)) / SR
+    # A slightly sharp chord plus noise, so the tuning estimate is not zero
+    tones = sum(np.sin(2 * np.pi * f * 1.01 * t) for f in (220.0, 277.2, 329.6, 440.0))
+    return (0.1 * tones + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+@pytest.mark.parametrize("n_fft, hop_length", [(2048, 512), (1024, 256), (2048, 256)])
+@pytest.mark.parametrize("backend", ["numba", "librosa"])
+def test_features_match_librosa(n_fft, hop_length, backend, monkeypatch):
+    monkeypatch.setattr(extract_lib, "KERNEL_BACKEND", backend)
+    signal = _test_signal()
+    expected = compute_features(signal, SR, n_fft, hop_length)
+    actual = TFFeatureExtractor(SR, n_fft, hop_length).features(signal)
+
+    for name in ("dd_mfcc", "chromagram", "zcr", "rms"):
+        assert actual[name].shape == expected[name].shape
+    np.testing.assert_allclose(actual["dd_mfcc"].numpy(), expected["dd_mfcc"], atol=1e-3)
+    np.testing.assert_allclose(actual["chromagram"].numpy(), expected["chromagram"], atol=1e-4)
+    np.testing.assert_allclose(actual["zcr"].numpy(), expected["zcr"], atol=1e-6)
+    np.testing.assert_allclose(actual["rms"].numpy(), expected["rms"], atol=1e-6)
+
+
+def test_tuning_estimate_matches_librosa():
+    signal = _test_signal()
+    extractor = TFFeatureExtractor(SR)
+    power = np.abs(librosa.stft(signal)) ** 2
+    expected = librosa.estimate_tuning(S=power, sr=SR, bins_per_octave=12)
+
+    index = int(extractor.estimate_tuning(extractor.power_spectrogram(signal)))
+    assert expected != 0.0
+    assert np.isclose(TUNING_BINS[index], expected)
+
+
+def test_model_inputs_have_the_model_shapes():
+    inputs = TFFeatureExtractor(SR).model_inputs(_test_signal(0.1), 64, 32, 512)
+
+    assert inputs["mfcc_input"].shape == (64, 32, 3)
+    assert inputs["chroma_input"].shape == (64, 32, 3)
+    assert inputs["numerical_input"].shape == (1024,)
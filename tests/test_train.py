@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import tensorflow as tf  # type: ignore
+from sklearn.preprocessing import StandardScaler  # type: ignore
+from src.PoCs.MultiModalTraining.model import build_numerical_model
+from src.PoCs.MultiModalTraining.train import compile_model, configure_precision
+
+LENGTH = 16
+
+
+@pytest.fixture(autouse=True)
+def restore_policy():
+    policy = tf.keras.mixed_precision.global_policy()
+    yield
+    tf.keras.mixed_precision.set_global_policy(policy)
+
+
+def _model():
+    rows = np.random.default_rng(0).random((8, LENGTH))
+    scaler = StandardScaler().fit(rows)
+    return build_numerical_model((2 * LENGTH,), 3, scaler, scaler)
+
+
+def test_mixed_precision_keeps_a_float32_softmax():
+    assert configure_precision({"MIXED_PRECISION": True}) == "mixed_bfloat16"
+    assert tf.keras.mixed_precision.global_policy().name == "mixed_bfloat16"
+
+    model = _model()
+    assert any(layer.compute_dtype == "bfloat16" for layer in model.layers)
+    outputs = model(np.zeros((2, 2 * LENGTH), np.float32), training=False)
+    assert outputs.dtype == tf.float32
+    np.testing.assert_allclose(outputs.numpy().sum(axis=1), 1.0, atol=1e-5)
+
+    assert configure_precision({}) == "float32"
+    assert tf.keras.mixed_precision.global_policy().name == "float32"
+
+
+@pytest.mark.parametrize("config, scaled", [
+    ({"MIXED_PRECISION": True}, True),
+    ({"MIXED_PRECISION": True, "LOSS_SCALING": False}, False),
+    ({"MIXED_PRECISION": False, "LOSS_SCALING": True}, False),
+])
+def test_loss_scaling_wraps_the_optimizer(config, scaled):
+    config = {"LEARNING_RATE": 1e-3, **config}
+    configure_precision(config)
+    model = compile_model(_model(), {**config, "JIT_COMPILE": True})
+
+    assert isinstance(model.optimizer, tf.keras.mixed_precision.LossScaleOptimizer) == scaled
+    assert model.jit_compile
@@ -0,0 +1,49 @@
+import numpy as np
+import soundfile as sf
+from src.utils.trimming import MANIFEST_FILE, TMP_SUFFIX, load_trim_manifest, trim_directory
+
+SR = 16000
+
+
+def _speech(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return 0.3 * np.sin(2 * np.pi * 220 * t) * np.hanning(len(t))
+
+
+def test_trim_directory_cuts_silence_and_records_boundaries(tmp_path):
+    rng = np.random.default_rng(0)
+    (tmp_path / "happy").mkdir()
+    padded = np.concatenate([1e-4 * rng.standard_normal(SR), _speech(0.8), 1e-4 * rng.standard_normal(SR // 2)])
+    sf.write(tmp_path / "happy" / "pt_m_happy_1.wav", padded, SR)
+    sf.write(tmp_path / "happy" / "pt_f_happy_2.wav", _speech(0.8), SR)
+
+    summary = trim_directory(str(tmp_path), top_db=40, margin=0.05, workers=1)
+
+    assert (summary["trimmed"], summary["skipped"], summary["failed"]) == (1, 1, 0)
+    manifest = load_trim_manifest(str(tmp_path))
+    entry = manifest["happy/pt_m_happy_1.wav"]
+    assert entry["original_samples"] == len(padded) and entry["sample_rate"] == SR
+    # Roughly one second of leading and half a second of trailing silence is gone, the tone is kept
+    assert SR - 0.1 * SR < entry["start"] < SR
+    assert SR + 0.8 * SR < entry["end"] < SR + 0.9 * SR
+    trimmed, _ = sf.read(str(tmp_path / "happy" / "pt_m_happy_1.wav"))
+    np.testing.assert_allclose(trimmed, padded[entry["start"]:entry["end"]], atol=1e-4)
+    assert manifest["happy/pt_f_happy_2.wav"]["end"] == int(0.8 * SR)
+
+    # Re-running leaves recorded files alone and keeps the original boundaries
+    assert trim_directory(str(tmp_path), workers=1)["trimmed"] == 0
+    assert load_trim_manifest(str(tmp_path)) == manifest
+    assert (tmp_path / MANIFEST_FILE).exists()
+
+
+def test_leftovers_of_an_interrupted_trim_are_removed_not_trimmed(tmp_path):
+    sf.write(tmp_path / "pt_m_happy_1.wav", _speech(0.8), SR)
+    # A trim interrupted before its swap leaves a partial file next to the clip
+    leftover = tmp_path / ("pt_m_happy_1.wav" + TMP_SUFFIX)
+    sf.write(leftover, _speech(0.3), SR, format="WAV")
+
+    summary = trim_directory(str(tmp_path), workers=1)
+
+    assert summary["trimmed"] + summary["skipped"] == 1
+    assert not leftover.exists()
+    assert list(load_trim_manifest(str(tmp_path))) == ["pt_m_happy_1.wav"]
@@ -0,0 +1,36 @@
+import numpy as np
+from src.PoCs.MultiModalTraining.tuning import SEARCH_SPACE, ASHAScheduler, sample_params
+
+
+def test_sample_params_stays_inside_the_search_space():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        params = sample_params(SEARCH_SPACE, rng)
+        assert set(params) == set(SEARCH_SPACE)
+        assert 1e-4 <= params["learning_rate"] <= 1e-2
+        assert params["batch_size"] in SEARCH_SPACE["batch_size"]
+        assert params["numerical_units"] in SEARCH_SPACE["numerical_units"]
+
+
+def test_asha_rungs_grow_geometrically_up_to_max_epochs():
+    assert ASHAScheduler(1, 27, 3).rungs == [1, 3, 9, 27]
+    assert ASHAScheduler(1, 10, 3).rungs == [1, 3, 9, 10]
+
+
+def test_asha_promotes_only_the_top_fraction_once():
+    scheduler = ASHAScheduler(1, 9, 3)
+    assert scheduler.next_promotion() is None
+
+    for trial, loss in enumerate([0.9, 0.5, 0.7, 0.3, 0.8, 0.6]):
+        scheduler.record(trial, 0, loss)
+    # Top third of six results: trials 3 and 1
+    assert scheduler.next_promotion() == (3, 1)
+    assert scheduler.next_promotion() == (1, 1)
+    assert scheduler.next_promotion() is None
+
+    # Higher rungs are promoted first
+    scheduler.record(3, 1, 0.2)
+    scheduler.record(1, 1, 0.4)
+    scheduler.record(0, 0, 0.1)
+    scheduler.record(7, 1, 0.5)
+    assert scheduler.next_promotion() == (3, 2)
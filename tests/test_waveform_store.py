@@ -0,0 +1,52 @@
+import numpy as np
+import soundfile as sf
+from src.utils.waveform_store import WaveformStore, pack_waveforms
+
+
+def test_pack_and_sample_windows(tmp_path):
+    source = tmp_path / "audio"
+    source.mkdir()
+    # A ramp makes every sample identify its position in the clip
+    sf.write(source / "pt_m_happy_1.wav", np.linspace(-0.5, 0.5, 8000), 8000)
+    sf.write(source / "fr_f_sad_2.wav", np.full(2000, 0.25), 8000)
+
+    index = pack_waveforms(str(source), str(tmp_path / "store"), sr=8000, dtype="int16", workers=1)
+    store = WaveformStore(str(tmp_path / "store"))
+
+    assert list(index["emotion"]) == ["sad", "happy"]
+    assert list(store.lengths) == [2000, 8000]
+    assert store.clip(1)[0] == -16384 and store.clip(1)[-1] == 16384
+
+    windows = store.sample_windows(np.array([0, 1, 1]), 4000, np.random.default_rng(0))
+    assert windows.shape == (3, 4000) and windows.dtype == np.int16
+    # The short clip is zero-padded past its end
+    assert np.all(windows[0, :2000] == 8192) and np.all(windows[0, 2000:] == 0)
+    # Long-clip windows are contiguous crops of the ramp
+    ramp = np.asarray(store.clip(1))
+    for w in windows[1:]:
+        start = int(np.argmin(np.abs(ramp - w[0])))
+        np.testing.assert_array_equal(w, ramp[start:start + 4000])
+
+
+def test_window_dataset_draws_only_the_given_clips(tmp_path):
+    from src.utils.waveform_store import window_dataset
+
+    source = tmp_path / "audio"
+    source.mkdir()
+    sf.write(source / "pt_m_happy_1.wav", np.full(8000, 0.5), 8000)
+    sf.write(source / "fr_f_sad_2.wav", np.full(8000, -0.25), 8000)
+    sf.write(source / "noise.wav", np.full(8000, 0.75), 8000)
+    pack_waveforms(str(source), str(tmp_path / "store"), sr=8000, dtype="int16", workers=1)
+    store = WaveformStore(str(tmp_path / "store"))
+    labeled = np.flatnonzero(store.index["emotion"] != "unknown")
+
+    dataset = window_dataset(store, labeled, labeled, window=1000, batch_size=16)
+    batches = list(dataset.take(3))
+
+    for waveforms, labels in batches:
+        assert waveforms.shape == (16, 1000, 1)
+        # Every window comes from a listed clip and carries that clip's label
+        expected = {i: store.clip(i)[0] / 32768.0 for i in labeled}
+        np.testing.assert_allclose(waveforms.numpy()[:, 0, 0], [expected[i] for i in labels.numpy()])
+    first, _ = next(iter(window_dataset(store, labeled, labeled, window=1000, batch_size=16)))
+    np.testing.assert_array_equal(first.numpy(), batches[0][0].numpy())